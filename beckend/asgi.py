@@ -3,6 +3,10 @@ ASGI config for beckend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production (uvicorn workers under gunicorn, other settings from gunicorn.conf.py):
+
+    gunicorn beckend.asgi:application -k uvicorn_worker.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -1,19 +1,46 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = 'django-insecure-0umegca*)@-jud%z(f&_e4fgitppj(&ly0gc+gwvk6)knrm56-'
+# .env fayli bo'lsa, o'qiladi (python-dotenv)
+try:
+    from dotenv import load_dotenv
+    load_dotenv(BASE_DIR / '.env')
+except ImportError:
+    pass
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default):
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-0umegca*)@-jud%z(f&_e4fgitppj(&ly0gc+gwvk6)knrm56-',
+)
 
-# Mahalliy ishlash uchun DEBUG=True, production uchun False
-DEBUG = True  # Mahalliy test uchun True qiling
+# Mahalliy ishlash uchun DEBUG=True (standart), production uchun DJANGO_DEBUG=0
+DEBUG = env_bool('DJANGO_DEBUG', True)
 
-ALLOWED_HOSTS = [
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', [
     "sklatuz.onrender.com",
     "localhost",
     "127.0.0.1",
     "*",  # Barcha hostlar uchun ruxsat (test uchun)
-]
+])
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -23,6 +50,10 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
+    'rest_framework',
+    'rest_framework.authtoken',
+    'corsheaders',
+
     'frontend',  # sening apping
 ]
 
@@ -32,12 +63,20 @@ MIDDLEWARE = [
     # WhiteNoise middleware (STATIC_ROOT bo'lsagina ishlaydi)
     'whitenoise.middleware.WhiteNoiseMiddleware',
     
+    # JSON/HTML javoblarini siqish; ETag'siz javoblar uchun tarkib bo'yicha ETag va 304
+    'frontend.middleware.CompressionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    
+    # So'rov profili: staff uchun ?_profile=1 / X-Profile: 1, boshqalar - PROFILING_SAMPLE_RATE
+    'frontend.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'beckend.urls'
@@ -49,18 +88,30 @@ TEMPLATES = [
         'DIRS': [
             BASE_DIR / 'templates',  # Global templates papka
         ],
-        'APP_DIRS': True,  # App ichidagi templates papkasini qidirish
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',  # MUHIM: request qo'shing
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'frontend.context_processors.cache_versions',
+                'frontend.context_processors.assets',
+            ],
+            # App ichidagi templates papkasini ham qidirish
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
             ],
         },
     },
 ]
 
+# Production: shablonlar bir marta kompilyatsiya qilinib xotirada saqlanadi
+if not DEBUG:
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', TEMPLATES[0]['OPTIONS']['loaders']),
+    ]
+
 WSGI_APPLICATION = 'beckend.wsgi.application'
 
 # =============== DATABASE ===============
@@ -71,6 +122,62 @@ DATABASES = {
     }
 }
 
+# =============== CACHE ===============
+# Ma'lumot versiyalari (frontend/caching.py) barcha worker'lar va cron buyruqlari uchun umumiy
+# bo'lishi kerak: lokal xotira keshi jarayon ichida qoladi, boshqa jarayondagi oshirish ko'rinmaydi.
+# Shuning uchun production'da (DEBUG=False) REDIS_URL majburiy. LOCAL_CACHE=1 - faqat bitta
+# jarayonli sinov uchun (benchmark); bunda ETag'lar o'chadi.
+SHARED_CACHE = bool(os.environ.get('REDIS_URL'))
+if SHARED_CACHE:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    if not DEBUG and not env_bool('LOCAL_CACHE'):
+        raise ImproperlyConfigured(
+            "DEBUG=False uchun REDIS_URL kerak: keshdagi ma'lumot versiyalari barcha jarayonlar uchun umumiy bo'lishi shart"
+        )
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'sklat',
+        }
+    }
+
+# Shablon fragmentlari keshi (soniya). Kalit tenant va ma'lumot versiyasiga bog'liq,
+# shuning uchun ma'lumot o'zgarganda eski fragment o'z-o'zidan ishlatilmay qoladi.
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 60 * 60))
+
+# =============== PROFILING ===============
+# So'rov profillari (cProfile + SQL vaqt chizig'i), ko'rish: /profiles/ (faqat staff).
+# Tanlov ulushi: 0 - faqat staff so'raganda, 0.01 - har yuzinchi so'rov.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_DIR = Path(os.environ.get('PROFILING_DIR', BASE_DIR / 'profiles'))
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 200))
+PROFILING_MAX_AGE_DAYS = int(os.environ.get('PROFILING_MAX_AGE_DAYS', 7))
+# Bitta profilda saqlanadigan SQL so'rovlar soni (umumiy soni va vaqti baribir hisoblanadi)
+PROFILING_SQL_LIMIT = int(os.environ.get('PROFILING_SQL_LIMIT', 500))
+
+# =============== REST API ===============
+REST_FRAMEWORK = {
+    # Brauzerdagi sahifalar sessiya bilan, tashqi integratsiyalar token bilan (Authorization: Token ...)
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.TokenAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer']
+    + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'COERCE_DECIMAL_TO_STRING': True,
+}
+
+# CORS faqat API uchun va faqat ruxsat berilgan manbalarga
+CORS_ALLOWED_ORIGINS = env_list('CORS_ALLOWED_ORIGINS', [])
+CORS_URLS_REGEX = r'^/api/v1/.*$'
+
 # =============== PASSWORD VALIDATION ===============
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -96,13 +203,30 @@ STATICFILES_DIRS = [
 # Production uchun collectstatic papkasi
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise storage (DEBUG=False bo'lganda ishlaydi)
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise storage: hash nomli fayllar (uzoq muddatli kesh) va gzip/brotli variantlari.
+# Django 5.1+ da STATICFILES_STORAGE o'rniga STORAGES ishlatiladi.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Tailwind va vendor fayllar `manage.py build_assets` bilan yig'ilgan bo'lsa, CDN o'rniga ular ishlatiladi
+SELF_HOSTED_ASSETS = env_bool('SELF_HOSTED_ASSETS', (BASE_DIR / 'static' / 'css' / 'app.css').exists())
 
 # =============== MEDIA FILES ===============
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Rasm variantlari (thumbnail) yaratadigan fon oqimlari soni (har bir worker jarayonida)
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+
+# Kassa katalogi: o'chirilganlar belgisi shuncha kun saqlanadi, undan eski versiyaga to'liq snapshot beriladi
+CATALOG_TOMBSTONE_DAYS = int(os.environ.get('CATALOG_TOMBSTONE_DAYS', 30))
+
 # =============== DEFAULT AUTO FIELD ===============
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
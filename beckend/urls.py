@@ -1,10 +1,15 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from frontend import views as frontend_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Rasm variantlari production'da ham (kesh sarlavhalari bilan) beriladi
+    re_path(r'^%s(?P<path>products/thumbs/[^/]+\.webp)$' % settings.MEDIA_URL.lstrip('/'),
+            frontend_views.product_thumbnail, name='product_thumbnail'),
     path('', include('frontend.urls')),
 ]
 
@@ -0,0 +1,57 @@
+# warmup.py
+"""
+Worker ishga tushishidan oldin keshlarni isitish (gunicorn.conf.py dan chaqiriladi).
+
+preload_app bilan master jarayonda bir marta bajariladi va worker'lar natijani
+copy-on-write orqali bo'lishadi: URL resolver (reverse lug'ati), kompilyatsiya
+qilingan shablonlar (cached.Loader) va view/serializer modullari. Birinchi
+so'rovlar sovuq keshga tushmaydi.
+"""
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def template_names():
+    """Barcha shablon papkalaridagi .html fayllar (loader nomlari bilan)"""
+    from django.template import engines
+    from django.template.utils import get_app_template_dirs
+
+    names = set()
+    # loaders aniq berilgan (APP_DIRS yo'q) - app_directories papkalari alohida qo'shiladi
+    directories = [*get_app_template_dirs('templates')]
+    for engine in engines.all():
+        directories += engine.template_dirs
+    for directory in directories:
+        root = Path(directory)
+        if root.is_dir():
+            names.update(str(path.relative_to(root)) for path in root.rglob('*.html'))
+    return sorted(names)
+
+
+def warm_up():
+    """URL'lar va shablonlarni yuklash. Bazaga ulanmaydi (ulanish fork'dan keyin ochiladi)."""
+    from django.db import connections
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    started = time.perf_counter()
+    resolver = get_resolver()
+    # reverse() uchun lug'atlar - barcha view modullari ham shu yerda import qilinadi
+    resolver.reverse_dict
+
+    loaded, failed = 0, 0
+    for name in template_names():
+        try:
+            get_template(name)
+            loaded += 1
+        except Exception as e:
+            failed += 1
+            logger.warning("Shablon yuklanmadi: %s (%s)", name, e)
+
+    # Fork'dan oldin ochilgan ulanish worker'lar orasida bo'lishilmasligi kerak
+    connections.close_all()
+    logger.info("Warm-up: %d ta shablon, %d ta xato, %.0f ms", loaded, failed, (time.perf_counter() - started) * 1000)
+    return loaded
@@ -3,7 +3,8 @@ from django.contrib import admin
 from django.db.models import Sum, F
 from .models import (
     Category, Customer, Product, 
-    Sale, Purchase, Debt, DashboardStats
+    Sale, Purchase, Debt, DebtAging, DashboardStats, DailySalesRollup, ReorderPoint, DemandForecast,
+    StockMovement, StockSnapshot, GoodsReceipt
 )
 
 @admin.register(Category)
@@ -27,10 +28,11 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Customer)
 class CustomerAdmin(admin.ModelAdmin):
-    list_display = ['full_name', 'phone', 'customer_type', 'total_purchases', 'total_spent', 'is_active']
+    list_display = ['full_name', 'phone', 'customer_type', 'segment', 'total_purchases', 'total_spent', 'is_active']
     search_fields = ['first_name', 'last_name', 'phone', 'email']
-    list_filter = ['customer_type', 'is_active', 'created_at']
-    readonly_fields = ['created_at', 'updated_at', 'last_purchase']
+    list_filter = ['customer_type', 'segment', 'is_active', 'created_at']
+    readonly_fields = ['created_at', 'updated_at', 'last_purchase',
+                       'segment', 'rfm_recency', 'rfm_frequency', 'rfm_monetary', 'segmented_at']
     
     fieldsets = (
         ('Shaxsiy ma\'lumotlar', {
@@ -48,6 +50,9 @@ class CustomerAdmin(admin.ModelAdmin):
         ('Statistika', {
             'fields': ('total_purchases', 'total_spent', 'last_purchase')
         }),
+        ('RFM segment', {
+            'fields': ('segment', 'rfm_recency', 'rfm_frequency', 'rfm_monetary', 'segmented_at')
+        }),
     )
     
     def full_name(self, obj):
@@ -56,17 +61,18 @@ class CustomerAdmin(admin.ModelAdmin):
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ['name', 'sku', 'category', 'quantity', 'unit', 'sale_price', 'status', 'is_low_stock']
-    list_filter = ['category', 'unit', 'status', 'created_at']
+    list_display = ['name', 'sku', 'category', 'quantity', 'unit', 'sale_price', 'status', 'abc_class', 'xyz_class', 'is_low_stock']
+    list_filter = ['category', 'unit', 'status', 'abc_class', 'xyz_class', 'created_at']
     search_fields = ['name', 'sku', 'barcode']
-    readonly_fields = ['created_at', 'updated_at', 'total_sold', 'total_revenue']
+    readonly_fields = ['created_at', 'updated_at', 'total_sold', 'total_revenue', 'avg_cost',
+                       'abc_class', 'xyz_class', 'classified_at']
     
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
             'fields': ('name', 'sku', 'barcode', 'category', 'brand')
         }),
         ('Narx va miqdor', {
-            'fields': ('purchase_price', 'sale_price', 'quantity', 'unit', 'min_quantity')
+            'fields': ('purchase_price', 'sale_price', 'avg_cost', 'quantity', 'unit', 'min_quantity')
         }),
         ('Tavsif va rasm', {
             'fields': ('description', 'image')
@@ -74,6 +80,9 @@ class ProductAdmin(admin.ModelAdmin):
         ('Statistika', {
             'fields': ('total_sold', 'total_revenue')
         }),
+        ('ABC/XYZ tasnifi', {
+            'fields': ('abc_class', 'xyz_class', 'classified_at')
+        }),
     )
     
     def is_low_stock(self, obj):
@@ -81,17 +90,46 @@ class ProductAdmin(admin.ModelAdmin):
     is_low_stock.boolean = True
     is_low_stock.short_description = "Kam qolgan"
 
+@admin.register(ReorderPoint)
+class ReorderPointAdmin(admin.ModelAdmin):
+    list_display = ['product', 'avg_daily_sales', 'days_until_stockout', 'reorder_point', 'suggested_quantity', 'computed_at']
+    list_select_related = ['product']
+    search_fields = ['product__name', 'product__sku']
+    readonly_fields = ['product', 'user', 'avg_daily_sales', 'days_until_stockout', 'reorder_point',
+                       'suggested_quantity', 'window_days', 'computed_at']
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(DemandForecast)
+class DemandForecastAdmin(admin.ModelAdmin):
+    list_display = ['product', 'method', 'horizon_total', 'mae', 'computed_at']
+    list_filter = ['method']
+    list_select_related = ['product']
+    search_fields = ['product__name', 'product__sku']
+    readonly_fields = ['product', 'user', 'method', 'daily', 'horizon_total', 'mae', 'history_days', 'computed_at']
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(Sale)
 class SaleAdmin(admin.ModelAdmin):
     list_display = ['invoice_number', 'customer', 'product', 'quantity', 'price', 'total', 'payment_method', 'status', 'sale_date']
     list_filter = ['payment_method', 'status', 'sale_date']
     search_fields = ['customer__first_name', 'customer__last_name', 'product__name', 'invoice_number']
-    readonly_fields = ['sale_date', 'updated_at']
+    readonly_fields = ['sale_date', 'updated_at', 'cost', 'profit']
     date_hierarchy = 'sale_date'
     
+    def get_readonly_fields(self, request, obj=None):
+        # Qoldiq sotuv yaratilganda bir marta yoziladi - keyin miqdor/narx/holat o'zgartirilmaydi
+        # (qaytarish - API'dagi refund amali orqali)
+        if obj is not None:
+            return self.readonly_fields + ['product', 'quantity', 'price', 'discount', 'tax', 'status']
+        return self.readonly_fields
+    
     fieldsets = (
         ('Sotuv ma\'lumotlari', {
-            'fields': ('customer', 'product', 'quantity', 'price', 'discount', 'tax')
+            'fields': ('customer', 'product', 'quantity', 'price', 'discount', 'tax', 'cost', 'profit')
         }),
         ('To\'lov', {
             'fields': ('payment_method', 'paid_amount')
@@ -121,10 +159,60 @@ class PurchaseAdmin(admin.ModelAdmin):
         }),
     )
 
+class PurchaseInline(admin.TabularInline):
+    model = Purchase
+    extra = 0
+    fields = ['product', 'quantity', 'price', 'total', 'expiry_date']
+    readonly_fields = fields
+    can_delete = False
+
+@admin.register(GoodsReceipt)
+class GoodsReceiptAdmin(admin.ModelAdmin):
+    list_display = ['invoice_number', 'supplier', 'line_count', 'total', 'received_at']
+    list_select_related = ['supplier']
+    search_fields = ['invoice_number', 'supplier__first_name']
+    date_hierarchy = 'received_at'
+    readonly_fields = ['invoice_number', 'supplier', 'delivery_date', 'total', 'line_count', 'received_at', 'user']
+    inlines = [PurchaseInline]
+
+    # Yuk xatlari faqat API orqali qabul qilinadi
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ['product', 'kind', 'quantity', 'balance_after', 'created_at']
+    list_filter = ['kind', 'created_at']
+    list_select_related = ['product']
+    search_fields = ['product__name', 'product__sku']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['product', 'kind', 'quantity', 'balance_after', 'sale', 'purchase', 'note', 'created_at', 'user']
+
+    # Jurnal faqat qo'shiladi
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['product', 'quantity', 'taken_at']
+    list_select_related = ['product']
+    search_fields = ['product__name', 'product__sku']
+    readonly_fields = ['product', 'quantity', 'taken_at', 'user']
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(Debt)
 class DebtAdmin(admin.ModelAdmin):
     list_display = ['customer', 'sale', 'amount', 'paid_amount', 'remaining_amount', 'due_date', 'status', 'is_overdue']
     list_filter = ['status', 'due_date']
+    list_select_related = ['customer', 'sale']
     search_fields = ['customer__first_name', 'customer__last_name']
     readonly_fields = ['created_at', 'updated_at']
     
@@ -142,10 +230,23 @@ class DebtAdmin(admin.ModelAdmin):
     remaining_amount.short_description = "Qolgan summa"
     
     def is_overdue(self, obj):
+        # Muddat bo'yicha - update_debt_statuses hali ishlamagan kunlarda ham to'g'ri
         return obj.is_overdue
     is_overdue.boolean = True
     is_overdue.short_description = "Muddati o'tgan"
 
+@admin.register(DebtAging)
+class DebtAgingAdmin(admin.ModelAdmin):
+    list_display = ['customer', 'user', 'as_of', 'current', 'days_0_30', 'days_31_60', 'days_61_90', 'days_90_plus', 'total']
+    list_filter = ['as_of']
+    list_select_related = ['customer', 'user']
+    search_fields = ['customer__first_name', 'customer__last_name', 'customer__phone']
+    readonly_fields = ['customer', 'user', 'as_of', 'current', 'days_0_30', 'days_31_60', 'days_61_90',
+                       'days_90_plus', 'total', 'debt_count', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(DashboardStats)
 class DashboardStatsAdmin(admin.ModelAdmin):
     list_display = ['date', 'total_sales', 'total_purchases', 'total_profit', 'total_customers', 'total_products', 'total_debt']
@@ -170,4 +271,15 @@ class DashboardStatsAdmin(admin.ModelAdmin):
         ('Qarzlar', {
             'fields': ('total_debt',)
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(DailySalesRollup)
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'user', 'revenue', 'profit', 'sales_count', 'new_customers', 'updated_at']
+    list_filter = ['user']
+    date_hierarchy = 'date'
+    readonly_fields = ['user', 'date', 'revenue', 'profit', 'sales_count', 'new_customers', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
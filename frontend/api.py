@@ -0,0 +1,218 @@
+# api.py
+"""
+REST API v1 (Django REST Framework): /api/v1/
+
+Barcha ro'yxatlar tenant (so'rov egasi) bo'yicha filtrlanadi va keyset (cursor)
+sahifalanadi - OFFSET va COUNT(*) yo'q, chuqur sahifalar ham bir xil tez.
+Bog'liq obyektlar viewset'dagi `select_related`/`prefetch_related` bilan bir
+so'rovda olinadi; so'rovlar soni frontend/tests.py da cheklangan.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.routers import DefaultRouter
+
+from .models import Customer, Debt, Product, Purchase, Sale
+from .serializers import (
+    CustomerSerializer, DebtSerializer, OfflineSaleSerializer, ProductSerializer,
+    PurchaseSerializer, SaleSerializer,
+)
+from .signals import publish_sales_batch
+
+BULK_LIMIT = 500
+
+
+class KeysetPagination(CursorPagination):
+    """`?limit=` (ko'pi bilan 500); tartib viewset'ning `keyset_ordering` atributidan"""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        return view.keyset_ordering
+
+
+class TenantViewSetMixin:
+    """So'rov egasining obyektlari, kerakli JOIN/prefetch bilan"""
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    select_related = ()
+    prefetch_related = ()
+    filters = {}
+
+    def get_queryset(self):
+        queryset = self.queryset.filter(user=self.request.user)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.action == 'list':
+            queryset = self.filter_queryset_params(queryset)
+        return queryset
+
+    def filter_queryset_params(self, queryset):
+        """`filters` = {query param: lookup}; sanalar uchun parse_date"""
+        for param, lookup in self.filters.items():
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            if lookup.endswith(('__date__gte', '__date__lte')):
+                value = parse_date(value)
+                if value is None:
+                    raise ValidationError({param: "Sana formati: YYYY-MM-DD"})
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (DjangoValidationError, ValueError):
+                raise ValidationError({param: "Noto'g'ri qiymat"})
+        return queryset
+
+
+class BulkMixin:
+    """POST/PATCH {prefix}/bulk/ - ro'yxat bitta bulk_create/bulk_update bilan yoziladi"""
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({'detail': "Bo'sh bo'lmagan ro'yxat kerak"})
+        if len(rows) > BULK_LIMIT:
+            raise ValidationError({'detail': f"Bir so'rovda ko'pi bilan {BULK_LIMIT} ta qator"})
+
+        context = {**self.get_serializer_context(), 'bulk': True}
+        instances = None
+        if request.method == 'PATCH':
+            ids = [row.get('id') for row in rows if isinstance(row, dict)]
+            try:
+                context['instances'] = {str(obj.pk): obj for obj in self.get_queryset().filter(pk__in=ids)}
+            except DjangoValidationError:
+                raise ValidationError({'id': "Noto'g'ri id"})
+            context['bulk_update'] = True
+            instances = list(context['instances'].values())
+
+        serializer = self.get_serializer_class()(
+            instance=instances, data=rows, many=True, partial=instances is not None, context=context)
+        serializer.is_valid(raise_exception=True)
+        objects = serializer.save()
+
+        # Javob ro'yxat endpointi bilan bir xil ko'rinishda (annotatsiyalar bilan) qayta o'qiladi
+        saved = self.get_queryset().filter(pk__in=[obj.pk for obj in objects])
+        data = self.get_serializer(saved, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED if instances is None else status.HTTP_200_OK)
+
+
+class ProductViewSet(TenantViewSetMixin, BulkMixin, viewsets.ModelViewSet):
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    select_related = ('category',)
+    keyset_ordering = ('-created_at', '-id')
+    filters = {
+        'category': 'category_id',
+        'status': 'status',
+        'abc_class': 'abc_class',
+        'xyz_class': 'xyz_class',
+        'search': 'name__icontains',
+        'sku': 'sku',
+        'barcode': 'barcode',
+    }
+
+
+class CustomerViewSet(TenantViewSetMixin, BulkMixin, viewsets.ModelViewSet):
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    keyset_ordering = ('-created_at', '-id')
+    filters = {
+        'customer_type': 'customer_type',
+        'segment': 'segment',
+        'phone': 'phone',
+        'search': 'first_name__icontains',
+    }
+
+    def get_queryset(self):
+        # Ochiq qarz qoldig'i har bir mijoz uchun alohida so'rov emas, subquery bilan
+        open_debt = Debt.objects.filter(
+            customer=OuterRef('pk'), status__in=Debt.OPEN_STATUSES,
+        ).values('customer').annotate(total=Sum(F('amount') - F('paid_amount'))).values('total')
+        return super().get_queryset().annotate(
+            open_debt=Coalesce(Subquery(open_debt), Value(0), output_field=DecimalField()))
+
+
+class SaleViewSet(TenantViewSetMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                  mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Sotuvlar o'zgartirilmaydi - faqat qaytariladi (refund)"""
+    queryset = Sale.objects.all()
+    serializer_class = SaleSerializer
+    select_related = ('product', 'customer')
+    keyset_ordering = ('-sale_date', '-id')
+    filters = {
+        'customer': 'customer_id',
+        'product': 'product_id',
+        'payment_method': 'payment_method',
+        'status': 'status',
+        'date_from': 'sale_date__date__gte',
+        'date_to': 'sale_date__date__lte',
+    }
+
+    @action(detail=True, methods=['post'])
+    def refund(self, request, pk=None):
+        sale = self.get_object()
+        if not sale.refund(note=request.data.get('note')):
+            raise ValidationError({'detail': "Sotuv allaqachon qaytarilgan"})
+        return Response(self.get_serializer(sale).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Paket sotuvlar: Sale.ingest_offline (id bo'yicha idempotent, qoldiq yetmasa - conflicts)"""
+        rows = request.data
+        if not isinstance(rows, list) or not rows or len(rows) > BULK_LIMIT:
+            raise ValidationError({'detail': f"1 dan {BULK_LIMIT} tagacha qatorli ro'yxat kerak"})
+        serializer = OfflineSaleSerializer(data=rows, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        results, conflicts = Sale.ingest_offline(request.user, serializer.validated_data)
+        created = [result['id'] for result in results if result['status'] == 'created']
+        if created:
+            publish_sales_batch(request.user.id, created)
+        return Response({'results': results, 'conflicts': conflicts},
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class PurchaseViewSet(TenantViewSetMixin, mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                      mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = Purchase.objects.all()
+    serializer_class = PurchaseSerializer
+    select_related = ('product', 'supplier')
+    keyset_ordering = ('-purchase_date', '-id')
+    filters = {
+        'supplier': 'supplier_id',
+        'product': 'product_id',
+        'receipt': 'receipt_id',
+        'status': 'status',
+        'date_from': 'purchase_date__date__gte',
+        'date_to': 'purchase_date__date__lte',
+    }
+
+
+class DebtViewSet(TenantViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """Qarzlar sotuvdan yaratiladi, to'lovlar Debt.allocate_payment orqali"""
+    queryset = Debt.objects.all()
+    serializer_class = DebtSerializer
+    select_related = ('customer', 'sale')
+    keyset_ordering = ('-created_at', '-id')
+    filters = {
+        'customer': 'customer_id',
+        'status': 'status',
+    }
+
+
+router = DefaultRouter()
+router.register('products', ProductViewSet, basename='api-product')
+router.register('customers', CustomerViewSet, basename='api-customer')
+router.register('sales', SaleViewSet, basename='api-sale')
+router.register('purchases', PurchaseViewSet, basename='api-purchase')
+router.register('debts', DebtViewSet, basename='api-debt')
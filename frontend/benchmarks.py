@@ -0,0 +1,517 @@
+# benchmarks.py
+"""
+Benchmark ssenariylari.
+
+Har bir ssenariy `@scenario(nom)` bilan ro'yxatdan o'tadi va `BenchmarkContext`
+qabul qiladi. `run_benchmarks` buyrug'i ularni ishga tushirib natijani JSON
+ko'rinishida yozadi, shuning uchun commitlar orasida solishtirish mumkin.
+"""
+import functools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from unittest import mock
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, URLPattern, URLResolver, reverse
+from django.utils import timezone
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Ssenariyni ro'yxatga qo'shish uchun dekorator"""
+    def decorator(func):
+        SCENARIOS[name] = func
+        return func
+    return decorator
+
+
+class BenchmarkContext:
+    """Ssenariylar uchun umumiy holat: tenant, test klient va namunaviy obyektlar"""
+
+    def __init__(self, user):
+        from .models import Category, Customer, Debt, Product
+
+        self.user = user
+        self.client = Client()
+        self.client.force_login(user)
+        self.captured = {}
+        self.samples = {
+            'product_id': Product.objects.filter(user=user).values_list('id', flat=True).first(),
+            'customer_id': Customer.objects.filter(user=user).values_list('id', flat=True).first(),
+            'category_id': Category.objects.filter(user=user).values_list('id', flat=True).first(),
+            'debt_id': Debt.objects.filter(user=user).values_list('id', flat=True).first(),
+        }
+
+    def get(self, path, **params):
+        # Production profilida (SECURE_SSL_REDIRECT) ham 301 emas, sahifaning o'zi o'lchanadi
+        return self.client.get(path, params, secure=True)
+
+
+def measure(func, repeat, warmup=1):
+    """Funksiyani `repeat` marta o'lchash (so'rovlar soni bilan)"""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    status = None
+    queries = 0
+    metrics = {}
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = len(captured)
+        status = getattr(result, 'status_code', status)
+        # Ssenariy qo'shimcha o'lchovlar qaytarishi mumkin (masalan xotira) - oxirgi ishga tushirishdagi
+        if isinstance(result, dict) and 'metrics' in result:
+            metrics = result['metrics']
+
+    return {
+        **metrics,
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': queries,
+        'status': status,
+    }
+
+
+def iter_url_patterns(patterns, prefix=''):
+    """urls.py dagi barcha (ichma-ich) path'lar"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            namespace = f"{pattern.namespace}:" if pattern.namespace else prefix
+            yield from iter_url_patterns(pattern.url_patterns, namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield prefix + pattern.name, pattern
+
+
+# =============== VIEW SCENARIOS ===============
+# Eksport va chiqish (logout) alohida ssenariylarda o'lchanadi
+SKIPPED_VIEWS = {'logout', 'export_report'}
+
+
+def register_view_scenarios():
+    """frontend/urls.py dagi har bir view uchun GET ssenariysi"""
+    from . import urls
+
+    for name, pattern in iter_url_patterns(urls.urlpatterns):
+        if name in SKIPPED_VIEWS:
+            continue
+        SCENARIOS.setdefault(f"view:{name}", _view_scenario(name, pattern))
+
+
+def _view_scenario(name, pattern):
+    def run(ctx):
+        kwargs = {key: ctx.samples.get(key) for key in pattern.pattern.converters}
+        try:
+            path = reverse(name, kwargs=kwargs)
+        except NoReverseMatch:
+            return {'skipped': f"URL qurilmadi: {pattern.pattern} {kwargs}"}
+        return ctx.get(path)
+    return run
+
+
+PERIODS = ['day', 'week', 'month', 'year']
+
+for _period in PERIODS:
+    scenario(f"view:analitika?period={_period}")(
+        lambda ctx, period=_period: ctx.get(reverse('analitika'), period=period)
+    )
+
+# =============== EXPORT SCENARIOS ===============
+for _period in PERIODS:
+    for _format in ['pdf', 'excel']:
+        scenario(f"export:{_format}:{_period}")(
+            lambda ctx, fmt=_format, period=_period: ctx.get(
+                reverse('export_report'), format=fmt, type='sales', period=period)
+        )
+
+
+# =============== REPORT SCENARIOS ===============
+# Katta hajmda o'lchash uchun: seed_benchmark_data --sales 1000000
+PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30, 'year': 365}
+
+
+def _profit_report(ctx, period, joined):
+    """Davr bo'yicha foyda: sotuvda saqlangan tannarx yoki mahsulot jadvali orqali (eski usul)"""
+    from django.db.models import F, Sum
+    from .models import Sale
+
+    since = timezone.now() - timedelta(days=PERIOD_DAYS[period])
+    profit = Sum((F('price') - F('product__purchase_price')) * F('quantity')) if joined else Sum('profit')
+    return Sale.objects.filter(user=ctx.user, sale_date__gte=since).aggregate(profit=profit)
+
+
+for _period in PERIODS:
+    scenario(f"report:profit:{_period}")(
+        lambda ctx, period=_period: _profit_report(ctx, period, joined=False)
+    )
+    scenario(f"report:profit-join:{_period}")(
+        lambda ctx, period=_period: _profit_report(ctx, period, joined=True)
+    )
+
+
+# =============== SEGMENTATION SCENARIOS ===============
+# segment:rfm - butun tenant uchun (GROUP BY + NumPy + guruhlangan UPDATE).
+# 1M mijoz uchun: seed_benchmark_data --customers 1000000 bilan to'ldirilgan bazada.
+# segment:rfm-numpy:1m - faqat ball/segment hisobi, sintetik 1M qatorda (bazasiz).
+SYNTHETIC_CUSTOMERS = 1_000_000
+
+
+@scenario("segment:rfm")
+def _segment_rfm(ctx):
+    from .models import Customer
+
+    return {'metrics': {'customers': Customer.compute_segments(ctx.user)}}
+
+
+@functools.lru_cache(maxsize=1)
+def _synthetic_rfm(size):
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    recency_days = rng.exponential(60, size)
+    frequency = rng.geometric(0.3, size)
+    monetary = frequency * rng.lognormal(11, 1, size)
+    return recency_days, frequency, monetary
+
+
+@scenario("segment:rfm-numpy:1m")
+def _segment_rfm_numpy(ctx):
+    from .segmentation import rfm_segments
+
+    segments = rfm_segments(*_synthetic_rfm(SYNTHETIC_CUSTOMERS))[3]
+    return {'metrics': {'customers': len(segments)}}
+
+
+# =============== CLASSIFICATION SCENARIOS ===============
+# classify:abc-xyz - butun tenant uchun (GROUP BY + NumPy matritsa + guruhlangan UPDATE).
+# classify:abc-xyz-numpy:100k - faqat matritsa va sinflar, 100k mahsulot x 104 hafta
+# (sintetik, har bir mahsulot haftalarning ~30% ida sotiladi).
+SYNTHETIC_PRODUCTS = 100_000
+SYNTHETIC_WEEKS = 104
+
+
+@scenario("classify:abc-xyz")
+def _classify_abc_xyz(ctx):
+    from .models import Product
+
+    return {'metrics': {'products': Product.classify_abc_xyz(ctx.user)}}
+
+
+@functools.lru_cache(maxsize=1)
+def _synthetic_weekly_sales(products, weeks):
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    sold = rng.random((products, weeks)) < 0.3
+    product_index, week_index = np.nonzero(sold)
+    demand = rng.poisson(5, len(product_index)) + 1.0
+    return product_index, week_index, demand, demand * rng.lognormal(9, 1, products)[product_index]
+
+
+@scenario("classify:abc-xyz-numpy:100k")
+def _classify_abc_xyz_numpy(ctx):
+    import numpy as np
+    from .classification import abc_classes, weekly_matrix, xyz_classes
+
+    product_index, week_index, demand, revenue = _synthetic_weekly_sales(SYNTHETIC_PRODUCTS, SYNTHETIC_WEEKS)
+    matrix = weekly_matrix(product_index, week_index, demand, (SYNTHETIC_PRODUCTS, SYNTHETIC_WEEKS))
+    abc = abc_classes(np.bincount(product_index, weights=revenue, minlength=SYNTHETIC_PRODUCTS))
+    xyz, _ = xyz_classes(matrix)
+    return {'metrics': {'products': len(abc), 'rows': len(product_index), 'a_share': round(float((abc == 'A').mean()), 3)}}
+
+
+# =============== FORECAST SCENARIOS ===============
+# forecast:demand - butun tenant uchun (GROUP BY kunlar + NumPy prognoz + upsert).
+# forecast:numpy:100k - faqat model tanlash va prognoz, 100k mahsulot x 84 kun (sintetik).
+SYNTHETIC_HISTORY_DAYS = 84
+
+
+@scenario("forecast:demand")
+def _forecast_demand(ctx):
+    from .models import DemandForecast
+
+    return {'metrics': {'products': DemandForecast.rebuild(ctx.user)}}
+
+
+@functools.lru_cache(maxsize=1)
+def _synthetic_daily_sales(products, days):
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    weekday = 1 + 0.5 * np.sin(np.arange(days) * 2 * np.pi / 7)
+    rate = rng.gamma(1.5, 2, (products, 1)) * weekday
+    return rng.poisson(rate).astype(float)
+
+
+@scenario("forecast:numpy:100k")
+def _forecast_numpy(ctx):
+    from .forecasting import forecast
+
+    _, methods, _ = forecast(_synthetic_daily_sales(SYNTHETIC_PRODUCTS, SYNTHETIC_HISTORY_DAYS), 28)
+    return {'metrics': {'products': len(methods), 'seasonal_share': round(float((methods == 'seasonal_naive').mean()), 3)}}
+
+
+# =============== KPI COMPARISON SCENARIOS ===============
+# kpi:compare-year - yil boshidan bugungacha, o'tgan yil bilan (kunlik yakunlardan, 2 so'rov).
+# kpi:compare-year-raw - xuddi shu daromad/foyda/soni to'g'ridan-to'g'ri sotuvlar jadvalidan.
+# kpi:rollup-rebuild - tenantning butun tarixi bo'yicha kunlik yakunlarni qayta yozish.
+@scenario("kpi:compare-year")
+def _kpi_compare_year(ctx):
+    from .models import DailySalesRollup
+
+    (start, end), previous = DailySalesRollup.period_ranges('year', timezone.localdate())
+    result = DailySalesRollup.compare(ctx.user, start, end, previous)
+    return {'metrics': {'sales': result['current']['sales_count']}}
+
+
+@scenario("kpi:compare-year-raw")
+def _kpi_compare_year_raw(ctx):
+    from django.db.models import Count, Sum
+    from .models import DailySalesRollup, Sale
+
+    (start, end), previous = DailySalesRollup.period_ranges('year', timezone.localdate())
+    totals = []
+    for first, last in [(start, end), previous]:
+        totals.append(Sale.objects.filter(
+            user=ctx.user, status='completed',
+            sale_date__gte=DailySalesRollup.day_bounds(first)[0], sale_date__lt=DailySalesRollup.day_bounds(last)[1],
+        ).aggregate(revenue=Sum('total'), profit=Sum('profit'), sales_count=Count('id')))
+    return {'metrics': {'sales': totals[0]['sales_count']}}
+
+
+@scenario("kpi:rollup-rebuild")
+def _kpi_rollup_rebuild(ctx):
+    from .models import DailySalesRollup
+
+    return {'metrics': {'days': DailySalesRollup.rebuild(ctx.user)}}
+
+
+# =============== POLL SCENARIOS ===============
+# Dashboard so'rovlari: bytes - tarmoqdan o'tgan tana hajmi, cpu_ms - server jarayoni CPU vaqti.
+# plain - siqishsiz, gzip - Accept-Encoding: gzip, 304 - oldingi ETag bilan qayta so'rov.
+# ETag'lar faqat umumiy kesh bilan beriladi - 304 ssenariylari uchun REDIS_URL kerak.
+POLLED_VIEWS = {
+    'home': {},
+    'analitika': {'period': 'week'},
+    'api_sales_data': {'period': 'week'},
+    'api_sales_chart': {'period': 'day'},
+    'api_get_products': {},
+    'api_get_customers': {},
+}
+
+
+def _poll_scenario(view_name, params, mode):
+    def run(ctx):
+        headers = {} if mode == 'plain' else {'HTTP_ACCEPT_ENCODING': 'gzip'}
+        if mode == '304':
+            # ETag bir marta olinadi - o'lchovga faqat qayta tekshirish so'rovi kiradi
+            key = ('etag', view_name)
+            if key not in ctx.captured:
+                ctx.captured[key] = ctx.client.get(reverse(view_name), params, secure=True, **headers).get('ETag', '')
+            headers['HTTP_IF_NONE_MATCH'] = ctx.captured[key]
+        started = time.process_time()
+        response = ctx.client.get(reverse(view_name), params, secure=True, **headers)
+        return {'metrics': {
+            'bytes': len(response.content),
+            'cpu_ms': round((time.process_time() - started) * 1000, 3),
+            'http_status': response.status_code,
+        }}
+    return run
+
+
+for _view, _params in POLLED_VIEWS.items():
+    for _mode in ['plain', 'gzip', '304']:
+        scenario(f"poll:{_view}:{_mode}")(_poll_scenario(_view, _params, _mode))
+
+
+# =============== RENDER SCENARIOS ===============
+# Faqat shablon chizish vaqti: kontekst view'dan bir marta olinadi.
+# cold - fragment keshi bo'sh, warm - fragmentlar keshdan.
+# Keshlangan template loader bilan solishtirish uchun DJANGO_DEBUG=0 LOCAL_CACHE=1 bilan ishga tushiring.
+RENDERED_TEMPLATES = {
+    'home.html': 'home',
+    'mahsulotlar.html': 'mahsulotlar',
+    'mijozlar.html': 'mijozlar',
+    'analitika.html': 'analitika',
+    'sozlamalar.html': 'sozlamalar',
+}
+
+
+def capture_render(ctx, view_name):
+    """View'ni ishga tushirib, render() ga berilgan so'rov va kontekstni ushlab qolish"""
+    if view_name not in ctx.captured:
+        captured = {}
+
+        def fake_render(request, template_name, context=None, *args, **kwargs):
+            captured.update(request=request, context=context or {})
+            return HttpResponse()
+
+        with mock.patch('frontend.views.render', fake_render):
+            ctx.get(reverse(view_name))
+        ctx.captured[view_name] = captured
+    return ctx.captured[view_name]
+
+
+def _render_scenario(template_name, view_name, cold):
+    def run(ctx):
+        captured = capture_render(ctx, view_name)
+        if not captured:
+            return {'skipped': f"{view_name} shablon chizmadi"}
+        if cold:
+            cache.clear()
+        return render_to_string(template_name, captured['context'], request=captured['request'])
+    return run
+
+
+for _template, _view in RENDERED_TEMPLATES.items():
+    scenario(f"render:{_template}:cold")(_render_scenario(_template, _view, cold=True))
+    scenario(f"render:{_template}:warm")(_render_scenario(_template, _view, cold=False))
+
+
+# =============== STARTUP SCENARIOS ===============
+# Yangi interpreterda worker ishga tushishi: django.setup() + barcha URL/view'lar.
+# `-X importtime` natijasidan eng qimmat modullar, shuningdek jarayon xotirasi (RSS) olinadi.
+# startup:reports - hisobot birinchi marta so'ralgandagi qo'shimcha narx.
+STARTUP_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+{extra}
+try:
+    # Linux: joriy RSS (ru_maxrss fork qilgan ota-jarayondan meros qoladi)
+    with open('/proc/self/status') as status:
+        rss_kb = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # macOS: baytlarda
+print(json.dumps({{
+    'boot_ms': round((time.perf_counter() - started) * 1000, 1),
+    'rss_mb': round(rss_kb / 1024, 1),
+    'modules': len(sys.modules),
+    'heavy_loaded': sorted(name for name in ('pandas', 'numpy', 'reportlab', 'openpyxl') if name in sys.modules),
+}}))
+"""
+STARTUP_EXTRA = {
+    'worker': '',
+    'reports': 'import frontend.reports',
+}
+
+
+def parse_importtime(stderr, top=5):
+    """`-X importtime` chiqishidan eng ko'p vaqt olgan yuqori darajadagi paketlar (cumulative, ms)"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Ichma-ich importlar qo'shimcha bo'sh joy bilan siljigan - faqat yuqori daraja olinadi
+        if name.startswith('  '):
+            continue
+        packages[name.strip()] = round(int(cumulative) / 1000, 1)
+    return dict(sorted(packages.items(), key=lambda item: -item[1])[:top])
+
+
+def _startup_scenario(extra):
+    def run(ctx):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'beckend.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT.format(extra=extra)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        metrics = json.loads(result.stdout.strip().splitlines()[-1])
+        metrics['top_imports_ms'] = parse_importtime(result.stderr)
+        return {'metrics': metrics}
+    return run
+
+
+for _name, _extra in STARTUP_EXTRA.items():
+    scenario(f"startup:{_name}")(_startup_scenario(_extra))
+
+
+# =============== RUNNER ===============
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(user, names=None, repeat=5):
+    """Tanlangan ssenariylarni ishga tushirish va natijani lug'at sifatida qaytarish"""
+    from .models import Customer, Debt, Product, Purchase, Sale
+
+    register_view_scenarios()
+    ctx = BenchmarkContext(user)
+
+    results = {}
+    for name in sorted(SCENARIOS):
+        if names and not any(name.startswith(prefix) for prefix in names):
+            continue
+        func = SCENARIOS[name]
+        try:
+            first = func(ctx)
+            if isinstance(first, dict) and 'skipped' in first:
+                results[name] = first
+                continue
+            results[name] = measure(lambda: func(ctx), repeat, warmup=0)
+        except Exception as exc:
+            results[name] = {'error': f"{type(exc).__name__}: {exc}"}
+
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'tenant': user.username,
+            'repeat': repeat,
+            'counts': {
+                'products': Product.objects.filter(user=user).count(),
+                'customers': Customer.objects.filter(user=user).count(),
+                'sales': Sale.objects.filter(user=user).count(),
+                'purchases': Purchase.objects.filter(user=user).count(),
+                'debts': Debt.objects.filter(user=user).count(),
+            },
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current):
+    """Ikki natija faylini median vaqt bo'yicha solishtirish"""
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name, {})
+        if 'median_ms' not in result or 'median_ms' not in before:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0
+        rows.append((name, before['median_ms'], result['median_ms'], change,
+                     before.get('queries'), result.get('queries')))
+    return rows
@@ -0,0 +1,114 @@
+# caching.py
+"""
+Tenant bo'yicha ma'lumot versiyalari.
+
+Shablon fragmentlari `{% cache %}` tegida tenant id va versiya bilan
+kalitlanadi. Ma'lumot o'zgarganda versiya oshiriladi - eski fragmentlar
+o'chirilmaydi, shunchaki boshqa kalit ishlatiladi va muddati o'tib ketadi.
+
+Xuddi shu versiyalardan view javoblari uchun ETag ham hisoblanadi
+(`conditional_on_data_version`): o'zgarmagan so'rovga view bajarilmasdan 304 qaytadi.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+# catalog: kategoriya va mahsulotlar, sales: sotuv, kirim, qarz va mijozlar
+SCOPES = ('catalog', 'sales')
+
+
+def _key(user_id, scope):
+    return f"data-version:{scope}:{user_id}"
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def data_version(user_id, scope):
+    """Joriy versiya (keshda bo'lmasa - vaqt belgisidan boshlanadi)"""
+    return cache.get_or_set(_key(user_id, scope), _initial_version, timeout=None)
+
+
+async def adata_version(user_id, scope):
+    return await cache.aget_or_set(_key(user_id, scope), _initial_version, timeout=None)
+
+
+def bump_data_version(user_id, *scopes):
+    """Versiyani oshirish - shu tenantning tegishli fragmentlari qayta chiziladi"""
+    for scope in scopes or SCOPES:
+        try:
+            cache.incr(_key(user_id, scope))
+        except ValueError:
+            # Kalit yo'q (o'chib ketgan) - oshirish yo'qolmasin: yangi vaqt belgisi
+            # ilgari berilgan har qanday versiyadan katta bo'ladi
+            cache.add(_key(user_id, scope), _initial_version(), timeout=None)
+
+
+def _etag(request, user, versions, daily, html):
+    parts = [str(user.pk), *map(str, versions), request.get_full_path()]
+    if daily:
+        # "Bugun"ga bog'liq javoblar yarim tunda eskiradi
+        parts.append(str(timezone.localdate()))
+    if html:
+        # Sahifadagi CSRF token cookie'ga bog'liq (login'dan keyin almashadi)
+        parts.append(request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''))
+    return '"%s"' % hashlib.md5(':'.join(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def _finish(request, response, etag):
+    if request.method in ('GET', 'HEAD') and etag:
+        response.headers.setdefault('ETag', etag)
+        # Brauzer javobni saqlaydi, lekin har safar If-None-Match bilan tekshiradi
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_on_data_version(*scopes, daily=False, html=False):
+    """
+    View uchun ETag: tenant, `scopes` versiyalari va so'rov manzilidan hisoblanadi -
+    agregatlar bajarilmaydi. If-None-Match mos kelsa view o'rniga 304 qaytadi.
+    `login_required` dan keyin (ichida) qo'yiladi; sync va async view'lar uchun.
+
+    daily - javob mahalliy sanaga bog'liq ("bugun", "shu oy"),
+    html - sahifa: CSRF cookie hisobga olinadi, ko'rsatilmagan xabarlar bo'lsa ETag ishlatilmaydi.
+
+    Faqat umumiy kesh (settings.SHARED_CACHE, Redis) bilan ishlaydi: lokal keshda boshqa
+    jarayondagi versiya oshirishi ko'rinmaydi va eski javob 304 bilan tasdiqlanib qolardi.
+    """
+    def enabled(request):
+        return settings.SHARED_CACHE and request.method in ('GET', 'HEAD')
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                if not enabled(request):
+                    return await view_func(request, *args, **kwargs)
+                user = await request.auser()
+                versions = [await adata_version(user.pk, scope) for scope in scopes]
+                etag = _etag(request, user, versions, daily, html)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _finish(request, response, etag)
+        else:
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                if not enabled(request) or (html and len(get_messages(request))):
+                    return view_func(request, *args, **kwargs)
+                versions = [data_version(request.user.pk, scope) for scope in scopes]
+                etag = _etag(request, request.user, versions, daily, html)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return _finish(request, response, etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+# catalog.py
+"""
+Kassalar uchun ixcham katalog (mahsulotlar va mijozlar).
+
+Javob ustunli (columnar) JSON: har bir maydon bitta massiv, kalitlar bir marta
+yoziladi. `since=<version>` berilsa faqat shu vaqtdan keyin o'zgargan qatorlar
+va o'chirilganlar (tombstone) qaytadi. Versiya - millisekunddagi server vaqti.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from .caching import data_version
+from .models import CatalogTombstone, Customer, Product
+
+# Versiya o'qilgan paytda hali commit bo'lmagan tranzaksiyalar keyingi deltada
+# tushib qolmasligi uchun oraliq biroz ustma-ust olinadi (qayta kelgan qator shunchaki yangilanadi)
+OVERLAP = timedelta(seconds=5)
+
+PRODUCT_COLUMNS = {
+    'id': 'id',
+    'sku': 'sku',
+    'barcode': 'barcode',
+    'name': 'name',
+    'price': 'sale_price',
+    'stock': 'quantity',
+    'unit': 'unit',
+}
+CUSTOMER_COLUMNS = {
+    'id': 'id',
+    'name': 'full_name',
+    'phone': 'phone',
+}
+
+
+def to_version(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def from_version(version):
+    return datetime.fromtimestamp(version / 1000, tz=dt_timezone.utc)
+
+
+def columns(queryset, mapping, numeric=()):
+    """Qatorlarni ustunlarga aylantirish: {'id': [...], 'name': [...]}"""
+    names = list(mapping)
+    data = {name: [] for name in names}
+    for row in queryset.values_list(*mapping.values()):
+        for name, value in zip(names, row):
+            data[name].append(float(value) if name in numeric else value)
+    return data
+
+
+def snapshot(user, since=None):
+    """
+    Katalog: since=None (yoki juda eski) bo'lsa to'liq, aks holda delta.
+    Delta'da nofaol bo'lib qolgan mahsulot/mijozlar ham `deleted` ga tushadi.
+    """
+    now = timezone.now()
+    horizon = now - timedelta(days=settings.CATALOG_TOMBSTONE_DAYS)
+    changed_after = from_version(since) - OVERLAP if since else None
+    if changed_after is not None and changed_after < horizon:
+        changed_after = None
+
+    if changed_after is None:
+        return full_snapshot(user, now)
+
+    products = Product.objects.filter(user=user, updated_at__gt=changed_after)
+    customers = Customer.objects.filter(user=user, updated_at__gt=changed_after)
+    tombstones = CatalogTombstone.objects.filter(user=user, deleted_at__gt=changed_after)
+
+    deleted = {'product': [], 'customer': []}
+    for kind, object_id in tombstones.values_list('kind', 'object_id'):
+        deleted[kind].append(object_id)
+    deleted['product'] += products.filter(status='inactive').values_list('id', flat=True)
+    deleted['customer'] += customers.filter(is_active=False).values_list('id', flat=True)
+
+    return build(user, now, False, products.exclude(status='inactive'), customers.filter(is_active=True), deleted)
+
+
+def full_snapshot(user, now):
+    """To'liq katalog ma'lumot versiyasi o'zgarmaguncha keshdan beriladi"""
+    key = f"catalog-snapshot:{user.pk}:{data_version(user.pk, 'catalog')}:{data_version(user.pk, 'sales')}"
+    return cache.get_or_set(key, lambda: build(
+        user, now, True,
+        Product.objects.filter(user=user).exclude(status='inactive'),
+        Customer.objects.filter(user=user, is_active=True),
+        {'product': [], 'customer': []},
+    ), timeout=settings.FRAGMENT_CACHE_TIMEOUT)
+
+
+def build(user, now, full, products, customers, deleted):
+    customers = customers.annotate(full_name=Concat(F('first_name'), Value(' '), F('last_name')))
+    return {
+        'version': to_version(now),
+        'full': full,
+        'products': columns(products.order_by(), PRODUCT_COLUMNS, numeric=('price', 'stock')),
+        'customers': columns(customers.order_by(), CUSTOMER_COLUMNS),
+        'deleted': {
+            'products': deleted['product'],
+            'customers': deleted['customer'],
+        },
+    }
@@ -0,0 +1,42 @@
+# classification.py
+"""
+ABC/XYZ tasnifi - NumPy massivlarida.
+
+ABC - daromad ulushi: mahsulotlar daromad bo'yicha kamayish tartibida, jami
+daromadning birinchi 80% i A, keyingi 15% i B, qolgani C.
+XYZ - talab barqarorligi: haftalik sotuv miqdorining variatsiya koeffitsienti
+(std / o'rtacha) 0.5 gacha X, 1.0 gacha Y, undan katta yoki sotuv yo'q - Z.
+"""
+import numpy as np
+
+ABC_THRESHOLDS = (0.80, 0.95)
+XYZ_THRESHOLDS = (0.5, 1.0)
+
+
+def weekly_matrix(product_index, week_index, values, shape):
+    """Siyrak (mahsulot, hafta, qiymat) qatorlaridan zich (mahsulotlar x haftalar) matritsa"""
+    flat = np.asarray(product_index, dtype=np.int64) * shape[1] + np.asarray(week_index, dtype=np.int64)
+    return np.bincount(flat, weights=values, minlength=shape[0] * shape[1]).reshape(shape)
+
+
+def abc_classes(revenue, thresholds=ABC_THRESHOLDS):
+    """Har bir mahsulot uchun 'A', 'B' yoki 'C'"""
+    revenue = np.asarray(revenue, dtype=float)
+    classes = np.full(len(revenue), 'C')
+    total = revenue.sum()
+    if total <= 0:
+        return classes
+    order = np.argsort(-revenue, kind='stable')
+    # Mahsulotdan oldingi jami ulush - chegarani kesib o'tgan mahsulot yuqori sinfda qoladi
+    before = (np.cumsum(revenue[order]) - revenue[order]) / total
+    classes[order] = np.where(before < thresholds[0], 'A', np.where(before < thresholds[1], 'B', 'C'))
+    classes[revenue <= 0] = 'C'
+    return classes
+
+
+def xyz_classes(demand, thresholds=XYZ_THRESHOLDS):
+    """Qaytaradi: ('X'/'Y'/'Z' massivi, variatsiya koeffitsienti; sotuvsiz mahsulotda inf)"""
+    mean = demand.mean(axis=1)
+    cv = np.full(len(mean), np.inf)
+    np.divide(demand.std(axis=1), mean, out=cv, where=mean > 0)
+    return np.where(cv <= thresholds[0], 'X', np.where(cv <= thresholds[1], 'Y', 'Z')), cv
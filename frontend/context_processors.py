@@ -0,0 +1,24 @@
+# context_processors.py
+from django.conf import settings
+
+from .caching import SCOPES, data_version
+
+
+def cache_versions(request):
+    """
+    Fragment keshi uchun o'zgaruvchilar. Versiyalar faqat shablonda
+    ishlatilganda o'qiladi (callable), shuning uchun boshqa sahifalarga ta'sir qilmaydi.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+
+    context = {'fragment_cache_timeout': settings.FRAGMENT_CACHE_TIMEOUT}
+    for scope in SCOPES:
+        context[f"{scope}_version"] = lambda scope=scope: data_version(user.pk, scope)
+    return context
+
+
+def assets(request):
+    """Shablonlar CDN yoki loyihaning o'z assetlaridan foydalanishi"""
+    return {'self_hosted_assets': settings.SELF_HOSTED_ASSETS}
@@ -0,0 +1,80 @@
+# forecasting.py
+"""
+Talab prognozi - barcha mahsulotlar bitta NumPy matritsasida (mahsulotlar x kunlar).
+
+Ikki yengil model, har biri butun matritsa ustida hisoblanadi (mahsulot boshiga sikl yo'q):
+- ses: oddiy eksponensial tekislash, alpha har bir mahsulot uchun ALPHAS ichidan
+  bir qadamli xato bo'yicha tanlanadi; prognoz - tekis daraja;
+- seasonal_naive: oxirgi SEASON_WEEKS haftadagi bir xil hafta kunlarining o'rtachasi.
+Mahsulot uchun oxirgi HOLDOUT_DAYS kunda xatosi (MAE) kichik model tanlanadi.
+"""
+import numpy as np
+
+ALPHAS = np.array([0.1, 0.2, 0.3, 0.5])
+SEASON = 7
+SEASON_WEEKS = 4
+HOLDOUT_DAYS = 14
+
+METHODS = np.array(['ses', 'seasonal_naive', 'none'])
+
+
+def daily_matrix(product_index, day_index, values, shape):
+    """Siyrak (mahsulot, kun, miqdor) qatorlaridan zich (mahsulotlar x kunlar) matritsa"""
+    flat = np.asarray(product_index, dtype=np.int64) * shape[1] + np.asarray(day_index, dtype=np.int64)
+    return np.bincount(flat, weights=values, minlength=shape[0] * shape[1]).reshape(shape)
+
+
+def ses(history):
+    """Qaytaradi: (oxirgi daraja, tanlangan alpha) - har bir mahsulot uchun"""
+    alphas = ALPHAS[:, None]
+    level = np.repeat(history[None, :, 0], len(ALPHAS), axis=0)
+    error = np.zeros_like(level)
+    # Sikl vaqt bo'yicha (kunlar soni), mahsulotlar va alphalar bo'yicha emas
+    for t in range(1, history.shape[1]):
+        residual = history[:, t] - level
+        error += np.abs(residual)
+        level += alphas * residual
+    best = error.argmin(axis=0)
+    columns = np.arange(history.shape[0])
+    return level[best, columns], ALPHAS[best]
+
+
+def seasonal_profile(history):
+    """Oxirgi to'liq haftalardagi hafta kunlari o'rtachasi: (mahsulotlar x 7)"""
+    weeks = min(SEASON_WEEKS, history.shape[1] // SEASON)
+    if not weeks:
+        return np.repeat(history.mean(axis=1, keepdims=True), SEASON, axis=1)
+    tail = history[:, history.shape[1] - weeks * SEASON:]
+    return tail.reshape(len(history), weeks, SEASON).mean(axis=1)
+
+
+def seasonal_forecast(history, horizon):
+    """Tarixning oxirgi kunidan keyingi `horizon` kun - hafta kuni mos keladigan o'rtacha"""
+    return seasonal_profile(history)[:, np.arange(horizon) % SEASON]
+
+
+def forecast(history, horizon, holdout=HOLDOUT_DAYS):
+    """
+    Qaytaradi: (prognoz (mahsulotlar x horizon), usul, MAE).
+    Model tarixning oxirgi `holdout` kunisiz o'qitilib shu kunlarda solishtiriladi,
+    so'ng tanlangan model butun tarix bo'yicha qayta hisoblanadi.
+    """
+    history = np.asarray(history, dtype=float)
+    holdout = min(holdout, history.shape[1] // 2)
+    if not holdout:
+        # 2 kundan kam tarix - solishtirish uchun kun yo'q: tekis daraja, MAE 0
+        level = ses(history)[0] if history.shape[1] else np.zeros(len(history))
+        method = np.where(history.any(axis=1), 0, 2)
+        return np.maximum(np.repeat(level[:, None], horizon, axis=1), 0), METHODS[method], np.zeros(len(history))
+    train, test = history[:, :-holdout], history[:, -holdout:]
+
+    ses_mae = np.abs(test - ses(train)[0][:, None]).mean(axis=1)
+    seasonal_mae = np.abs(test - seasonal_forecast(train, holdout)).mean(axis=1)
+    use_seasonal = seasonal_mae < ses_mae
+
+    level, _ = ses(history)
+    result = np.where(use_seasonal[:, None], seasonal_forecast(history, horizon), level[:, None])
+    method = np.where(use_seasonal, 1, 0)
+    # Tarixda sotuv bo'lmagan mahsulotlar
+    method[~history.any(axis=1)] = 2
+    return np.maximum(result, 0), METHODS[method], np.where(use_seasonal, seasonal_mae, ses_mae)
@@ -0,0 +1,110 @@
+# images.py
+"""
+Mahsulot rasmlari uchun WebP kichik nusxalar (thumbnail).
+
+Rasm yuklanganda original bir necha kenglikdagi WebP variantlarga aylantiriladi
+(metama'lumotlarsiz). Ish fon oqimlari hovuzida, tranzaksiya yakunlangandan
+keyin bajariladi. Variant nomlari original fayl nomidan (kengaytmasi bilan)
+olinadi, original almashtirilganda nom ham o'zgaradi - shuning uchun ularni
+muddatsiz keshlash mumkin.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Kartochkalar 40-80px; 2x/3x ekranlar va batafsil ko'rinish uchun kattaroqlari
+THUMBNAIL_WIDTHS = (80, 160, 320, 640)
+WEBP_QUALITY = 80
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def variant_name(name, width):
+    """
+    products/olma.jpg -> products/thumbs/olma.jpg-160.webp
+    Kengaytma nomda qoladi - olma.jpg va olma.png variantlari bir-birini almashtirmaydi.
+    """
+    path = PurePosixPath(name)
+    return str(path.parent / 'thumbs' / f"{path.name}-{width}.webp")
+
+
+def variant_url(name, width):
+    return default_storage.url(variant_name(name, width))
+
+
+def generate_variants(name, storage=None):
+    """
+    Original rasmdan WebP variantlarni yaratish. EXIF/GPS olib tashlanadi,
+    aylantirish (orientation) esa oldindan qo'llanadi.
+    Qaytaradi: yaratilgan kengliklar ro'yxati
+    """
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.mode in ('LA', 'PA') or 'transparency' in image.info else 'RGB')
+
+    # Originaldan katta variant yasalmaydi (eng kichigi har doim bo'ladi)
+    widths = [width for width in THUMBNAIL_WIDTHS if width <= image.width] or [THUMBNAIL_WIDTHS[0]]
+    for width in widths:
+        variant = image.copy()
+        variant.thumbnail((width, width * 4), Image.LANCZOS)
+        buffer = BytesIO()
+        variant.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+        target = variant_name(name, width)
+        if storage.exists(target):
+            storage.delete(target)
+        storage.save(target, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def delete_variants(name, storage=None):
+    storage = storage or default_storage
+    for width in THUMBNAIL_WIDTHS:
+        target = variant_name(name, width)
+        if storage.exists(target):
+            storage.delete(target)
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Pillow o'lchamni o'zgartirish va kodlashda GIL ni qo'yib yuboradi - oqimlar yetarli
+            _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix='thumbnails')
+        return _executor
+
+
+def _process_product_image(product_id, name, previous=None):
+    from .models import Product
+
+    try:
+        if previous:
+            delete_variants(previous)
+        widths = generate_variants(name)
+        # Rasm shu orada yana almashtirilgan bo'lsa, eski natija yozilmaydi
+        Product.objects.filter(pk=product_id, image=name).update(image_variants=widths)
+    except Exception:
+        logger.exception("Thumbnail yaratilmadi: %s", name)
+    finally:
+        connection.close()
+
+
+def schedule_product_image(product, previous=None):
+    """Tranzaksiya yakunlangach variantlarni fon hovuzida yaratish"""
+    name = product.image.name
+    transaction.on_commit(lambda: executor().submit(_process_product_image, product.pk, name, previous))
@@ -0,0 +1,121 @@
+# live.py
+"""
+Jonli dashboard uchun jarayon ichidagi pub/sub.
+
+Sotuv, kirim yoki qarz saqlanganda hodisa bir marta hisoblanadi va tenantning
+barcha ochiq SSE ulanishlariga bir xil matn sifatida tarqatiladi. Har bir
+tenant uchun bugungi yakunlar xotirada saqlanadi va faqat farqlar qo'shiladi.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum
+
+QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+
+
+def format_event(event, data):
+    """SSE formatidagi xabar"""
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class LiveBroker:
+    """Tenant bo'yicha obunachilar va bugungi KPI yakunlari"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._totals = {}
+
+    # =============== SUBSCRIPTIONS ===============
+    def subscribe(self, user_id):
+        """Joriy event loop uchun navbat yaratish"""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[user_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, set())
+            subscribers.difference_update({item for item in subscribers if item[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+                self._totals.pop(user_id, None)
+
+    def has_subscribers(self, user_id):
+        return bool(self._subscribers.get(user_id))
+
+    # =============== TOTALS ===============
+    def snapshot(self, user_id):
+        """Bugungi yakunlar (birinchi ulanishda bazadan, keyin xotiradan)"""
+        today = date.today()
+        with self._lock:
+            totals = self._totals.get(user_id)
+            if totals and totals['date'] == today:
+                return dict(totals)
+
+        totals = self.compute_totals(user_id, today)
+        with self._lock:
+            self._totals[user_id] = totals
+        return dict(totals)
+
+    @staticmethod
+    def compute_totals(user_id, today):
+        from .models import Purchase, Sale
+
+        sales = Sale.objects.filter(user_id=user_id, sale_date__date=today, status='completed').aggregate(
+            sales_total=Sum('total', default=0),
+            profit=Sum('profit', default=0),
+        )
+        purchases = Purchase.objects.filter(user_id=user_id, purchase_date__date=today, status='received').aggregate(
+            purchases_total=Sum('total', default=0),
+        )
+        return {
+            'date': today,
+            'sales_total': sales['sales_total'],
+            'profit': sales['profit'],
+            'purchases_total': purchases['purchases_total'],
+        }
+
+    def apply(self, user_id, **deltas):
+        """Xotiradagi yakunlarga farqni qo'shish, yangilangan yakunlarni qaytarish"""
+        with self._lock:
+            totals = self._totals.get(user_id)
+            if not totals or totals['date'] != date.today():
+                return None
+            for key, value in deltas.items():
+                totals[key] += value
+            return dict(totals)
+
+    # =============== PUBLISH ===============
+    def publish(self, user_id, event, data):
+        """Xabarni bir marta formatlab barcha obunachilarga yuborish (istalgan oqimdan)"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        if not subscribers:
+            return 0
+
+        message = format_event(event, data)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, message)
+            except RuntimeError:
+                # Event loop yopilgan - ulanish allaqachon uzilgan
+                self.unsubscribe(user_id, queue)
+        return len(subscribers)
+
+    @staticmethod
+    def _put(queue, message):
+        if queue.full():
+            # Sekin klient: eng eski xabar tashlab yuboriladi
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+broker = LiveBroker()
@@ -0,0 +1,115 @@
+# build_assets.py
+import platform
+import re
+import stat
+import subprocess
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TAILWIND_VERSION = '3.4.16'
+
+# CDN'dagi bilan bir xil versiyalar. CSS ichidagi url(...) fayllar (shriftlar) ham yuklanadi.
+VENDOR_FILES = {
+    'remixicon': 'https://cdn.jsdelivr.net/npm/remixicon@4.6.0/fonts/remixicon.css',
+    'fontawesome/css': 'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@7.0.1/css/all.min.css',
+    'echarts': 'https://cdn.jsdelivr.net/npm/echarts@5.5.0/dist/echarts.min.js',
+    'pacifico': 'https://cdn.jsdelivr.net/npm/@fontsource/pacifico@5/latin-400.css',
+}
+
+CSS_URL_RE = re.compile(r"""url\(\s*['"]?([^'")]+)['"]?\s*\)""")
+
+
+class Command(BaseCommand):
+    """
+    Frontend assetlarini loyihaning o'zida tayyorlash (CDN'siz):
+    Tailwind shablonlardan tozalangan va siqilgan holda, ikon shriftlari va ECharts esa static/vendor/ ga.
+
+    Deploy paytida collectstatic'dan oldin:
+        python manage.py build_assets && python manage.py collectstatic --noinput
+    Shundan keyin WhiteNoise fayllarni hash nomlar, uzoq muddatli kesh va gzip/brotli bilan beradi.
+    """
+    help = "Tailwind CSS ni yig'ish va vendor assetlarni static/ ga yuklab olish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-vendor', action='store_true', help="Vendor fayllarni yuklamaslik")
+        parser.add_argument('--skip-css', action='store_true', help="Tailwind CSS ni yig'maslik")
+        parser.add_argument('--tailwind-bin', default=None, help="Tayyor tailwindcss standalone CLI yo'li")
+        parser.add_argument('--force', action='store_true', help="Mavjud vendor fayllarni qayta yuklash")
+
+    def handle(self, *args, **options):
+        self.static_dir = Path(settings.BASE_DIR) / 'static'
+        self.session = requests.Session()
+        try:
+            if not options['skip_vendor']:
+                self.download_vendor(options['force'])
+            if not options['skip_css']:
+                self.build_css(options['tailwind_bin'])
+        except requests.RequestException as e:
+            raise CommandError(f"Yuklab bo'lmadi: {e}")
+        finally:
+            self.session.close()
+        self.stdout.write(self.style.SUCCESS("Assetlar tayyor"))
+
+    # =============== VENDOR ===============
+    def download_vendor(self, force):
+        vendor_dir = self.static_dir / 'vendor'
+        for folder, url in VENDOR_FILES.items():
+            target = vendor_dir / folder / Path(urlsplit(url).path).name
+            self.fetch(url, target, force)
+            if target.suffix == '.css':
+                self.fetch_css_references(url, target, vendor_dir, force)
+
+    def fetch_css_references(self, css_url, css_path, root, force):
+        """CSS dagi nisbiy url(...) fayllarni xuddi shu tuzilmada yonma-yon saqlash"""
+        for reference in set(CSS_URL_RE.findall(css_path.read_text(encoding='utf-8'))):
+            if reference.startswith(('data:', 'http:', 'https:', '//', '#')):
+                continue
+            relative = urlsplit(reference).path
+            target = (css_path.parent / relative).resolve()
+            if root.resolve() not in target.parents:
+                raise CommandError(f"{css_url} ichidagi yo'l vendor papkasidan tashqarida: {reference}")
+            self.fetch(urljoin(css_url, relative), target, force)
+
+    def fetch(self, url, target, force):
+        if target.exists() and not force:
+            return
+        response = self.session.get(url, timeout=60)
+        response.raise_for_status()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(response.content)
+        self.stdout.write(f"  {target.relative_to(settings.BASE_DIR)} ({len(response.content) // 1024} KB)")
+
+    # =============== TAILWIND ===============
+    def build_css(self, binary):
+        base_dir = Path(settings.BASE_DIR)
+        binary = Path(binary) if binary else self.tailwind_binary(base_dir / 'assets' / 'bin')
+        output = self.static_dir / 'css' / 'app.css'
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        # Faqat shablonlarda ishlatilgan klasslar qoladi (purge) va natija siqiladi
+        result = subprocess.run([
+            str(binary), '-c', 'tailwind.config.js', '-i', 'assets/tailwind.css',
+            '-o', str(output.relative_to(base_dir)), '--minify',
+        ], cwd=base_dir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f"Tailwind xatosi:\n{result.stderr}")
+        self.stdout.write(f"  {output.relative_to(base_dir)} ({output.stat().st_size // 1024} KB)")
+
+    def tailwind_binary(self, bin_dir):
+        """Platformaga mos standalone CLI (Node.js talab qilinmaydi)"""
+        system = {'Linux': 'linux', 'Darwin': 'macos', 'Windows': 'windows'}.get(platform.system())
+        machine = {'x86_64': 'x64', 'amd64': 'x64', 'arm64': 'arm64', 'aarch64': 'arm64'}.get(platform.machine().lower())
+        if not system or not machine:
+            raise CommandError("Bu platforma uchun Tailwind CLI yo'q, --tailwind-bin bering")
+
+        name = f"tailwindcss-{system}-{machine}" + ('.exe' if system == 'windows' else '')
+        binary = bin_dir / f"{TAILWIND_VERSION}-{name}"
+        if not binary.exists():
+            url = f"https://github.com/tailwindlabs/tailwindcss/releases/download/v{TAILWIND_VERSION}/{name}"
+            self.fetch(url, binary, force=True)
+            binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+        return binary
@@ -0,0 +1,33 @@
+# classify_products.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from frontend.caching import bump_data_version
+from frontend.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Mahsulotlarni ABC (daromad ulushi) va XYZ (talab barqarorligi) bo'yicha tasniflash.
+
+    Har hafta ishga tushirish uchun (cron):
+        45 0 * * 1 cd /app && python manage.py classify_products
+    """
+    help = "Mahsulotlar uchun ABC/XYZ sinflarini qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=104, help="Tahlil qilinadigan to'liq haftalar soni")
+        parser.add_argument('--user', default=None, help="Faqat bitta tenant (username)")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Bitta UPDATE dagi mahsulotlar soni")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(products__isnull=False).distinct()
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        for user in users:
+            count = Product.classify_abc_xyz(user, weeks=options['weeks'], batch_size=options['batch_size'])
+            bump_data_version(user.id, 'catalog')
+            self.stdout.write(f"{user.username}: {count} ta mahsulot tasniflandi")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
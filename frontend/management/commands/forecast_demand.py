@@ -0,0 +1,64 @@
+# forecast_demand.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from frontend.caching import bump_data_version
+from frontend.models import DemandForecast
+
+
+def forecast_tenant(user_id, history_days, horizon_days):
+    """Bitta tenant prognozi (alohida jarayonda ishlaydi)"""
+    user = User.objects.get(pk=user_id)
+    try:
+        count = DemandForecast.rebuild(user, history_days=history_days, horizon_days=horizon_days)
+        bump_data_version(user.id, 'catalog')
+        return user.username, count
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """
+    Mahsulotlar talabini prognoz qilish. Har bir tenant alohida jarayonda hisoblanadi.
+    update_reorder_points shu prognozlardan tavsiya etilgan buyurtma miqdorini oladi,
+    shuning uchun undan oldin ishga tushiriladi (cron):
+        5 0 * * * cd /app && python manage.py forecast_demand
+    """
+    help = "Kunlik sotuv tarixi bo'yicha mahsulotlar talabi prognozini hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history', type=int, default=84, help="Tarix (kun)")
+        parser.add_argument('--horizon', type=int, default=28, help="Prognoz davri (kun)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Jarayonlar soni (standart: CPU soni; SQLite'da 1 - yozish qulflanadi)")
+        parser.add_argument('--user', default=None, help="Faqat bitta tenant (username)")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(products__isnull=False).distinct()
+        if options['user']:
+            users = users.filter(username=options['user'])
+        user_ids = list(users.values_list('id', flat=True))
+
+        workers = options['workers']
+        if workers is None:
+            workers = 1 if connection.vendor == 'sqlite' else os.cpu_count() or 1
+        arguments = (user_ids, repeat(options['history']), repeat(options['horizon']))
+
+        if workers > 1 and len(user_ids) > 1:
+            # Ochiq ulanish fork qilingan jarayonlarga meros qolmasin
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                results = list(pool.map(forecast_tenant, *arguments))
+        else:
+            results = map(forecast_tenant, *arguments)
+
+        for username, count in results:
+            self.stdout.write(f"{username}: {count} ta mahsulot uchun prognoz")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
@@ -0,0 +1,56 @@
+# generate_thumbnails.py
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from frontend.images import generate_variants
+from frontend.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Mavjud mahsulot rasmlari uchun WebP variantlarni parallel yaratish.
+
+    Yangi yuklangan rasmlar avtomatik ishlanadi; bu buyruq eski rasmlar yoki
+    THUMBNAIL_WIDTHS o'zgargandan keyin (--force) ishlatiladi.
+    """
+    help = "Mahsulot rasmlari uchun thumbnail variantlarni yaratish (backfill)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Parallel oqimlar soni")
+        parser.add_argument('--force', action='store_true', help="Varianti bor rasmlarni ham qayta ishlash")
+        parser.add_argument('--user', default=None, help="Faqat shu tenant (username)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Bazaga yozish paketi")
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(image='').exclude(image__isnull=True)
+        if not options['force']:
+            products = products.filter(image_variants=[])
+        if options['user']:
+            products = products.filter(user__username=options['user'])
+        rows = list(products.values_list('id', 'image'))
+        self.stdout.write(f"{len(rows)} ta rasm ishlanadi ({options['workers']} oqim)")
+
+        started = time.monotonic()
+        done, failed, pending = 0, 0, []
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='thumbnails') as pool:
+            futures = {pool.submit(generate_variants, name): (pk, name) for pk, name in rows}
+            for future in as_completed(futures):
+                pk, name = futures[future]
+                try:
+                    pending.append(Product(id=pk, image_variants=future.result()))
+                    done += 1
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"  {name}: {e}")
+                if len(pending) >= options['batch_size']:
+                    Product.objects.bulk_update(pending, ['image_variants'])
+                    pending = []
+        Product.objects.bulk_update(pending, ['image_variants'])
+        connection.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Tayyor: {done} ta, xato: {failed} ta, {time.monotonic() - started:.1f} s"
+        ))
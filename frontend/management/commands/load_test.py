@@ -0,0 +1,265 @@
+# load_test.py
+import json
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from frontend.benchmarks import git_revision
+from frontend.management.commands.seed_benchmark_data import BENCH_PASSWORD, BENCH_USER_PREFIX
+
+# /api/live/ sarlavhalarini kutish (soniya)
+LIVE_TIMEOUT = 5
+# Yuklama so'rovi javobini kutish - band qilingan server xato sifatida hisoblanadi, sinov osilib qolmaydi
+REQUEST_TIMEOUT = 10
+
+DEFAULT_PATHS = [
+    '/api/sales-data/?period=week',
+    '/api/sales-chart/?period=day',
+    '/api/sales-chart/?period=week',
+    '/api/get-products/?search=a',
+    '/api/get-customers/?search=a',
+]
+
+# Solishtiriladigan server profillari. Gunicorn ishchi papkadagi gunicorn.conf.py ni ham o'qiydi
+# (preload, recycling, warm-up), shuning uchun production profili o'lchanadi; bu yerda faqat
+# worker turi almashtiriladi.
+SERVER_PROFILES = {
+    'sync': ['beckend.wsgi:application', '--worker-class', 'sync', '--threads', '1'],
+    'gthread': ['beckend.wsgi:application', '--worker-class', 'gthread'],
+    'uvicorn': ['beckend.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+def process_tree_rss_mb(pid):
+    """Master va barcha worker'larning RSS yig'indisi (Linux /proc)"""
+    children = {}
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # "pid (nomi) holat ppid ..." - nomda bo'sh joy bo'lishi mumkin
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            status = Path(f"/proc/{current}/status").read_text()
+        except OSError:
+            continue
+        total_kb += next((int(line.split()[1]) for line in status.splitlines() if line.startswith('VmRSS:')), 0)
+    return round(total_kb / 1024, 1)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = "API endpointlarini parallel so'rovlar bilan yuklab, sync, gthread va uvicorn worker'larini solishtirish (so'rov/soniya, RSS)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', action='append', choices=sorted(SERVER_PROFILES), default=None,
+                            help="Ishga tushiriladigan server profili (bir necha marta berish mumkin)")
+        parser.add_argument('--url', default=None, help="Allaqachon ishlab turgan server manzili (masalan http://127.0.0.1:8000)")
+        parser.add_argument('--paths', nargs='*', default=DEFAULT_PATHS, help="Yuklanadigan yo'llar")
+        parser.add_argument('--workers', type=int, default=2, help="Gunicorn worker soni")
+        parser.add_argument('--threads', type=int, default=4, help="gthread profili uchun oqimlar soni")
+        parser.add_argument('--concurrency', type=int, default=16, help="Parallel klientlar soni")
+        parser.add_argument('--duration', type=float, default=10, help="Har bir server uchun sinov davomiyligi (soniya)")
+        parser.add_argument('--live-tabs', type=int, default=2,
+                            help="Sinov davomida ochiq turgan analitika vkladkalari (har biri /api/live/ ni ushlaydi)")
+        parser.add_argument('--username', default=f"{BENCH_USER_PREFIX}1")
+        parser.add_argument('--password', default=BENCH_PASSWORD)
+        parser.add_argument('--output', default=None, help="Natija fayli (standart: benchmarks/load-<revision>-<vaqt>.json)")
+
+    def handle(self, *args, **options):
+        servers = options['server'] or ([] if options['url'] else list(SERVER_PROFILES))
+        results = {}
+
+        if options['url']:
+            results['external'] = self.run_load(options['url'], options)
+
+        for name in servers:
+            port = free_port()
+            process = self.start_server(name, port, options)
+            try:
+                idle_rss = process_tree_rss_mb(process.pid) if os.path.isdir('/proc') else None
+                results[name] = self.run_load(f"http://127.0.0.1:{port}", options)
+                results[name]['server'] = ' '.join(SERVER_PROFILES[name])
+                if idle_rss is not None:
+                    results[name]['rss_idle_mb'] = idle_rss
+                    results[name]['rss_mb'] = process_tree_rss_mb(process.pid)
+            finally:
+                process.send_signal(signal.SIGTERM)
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    # Band qilingan worker master'dan keyin ham tirik qoladi - butun guruh o'chiriladi
+                    os.killpg(process.pid, signal.SIGKILL)
+                    process.wait()
+
+        for name, result in results.items():
+            rss = f"  RSS {result['rss_idle_mb']:>7.1f} -> {result['rss_mb']:>7.1f} MB" if 'rss_mb' in result else ''
+            self.stdout.write(
+                f"{name:<10} {result['rps']:>9.1f} so'rov/s  p50 {result['p50_ms']:>8.2f} ms  "
+                f"p95 {result['p95_ms']:>8.2f} ms  xatolar {result['errors']}{rss}  "
+                f"live: oqim {result['live_streaming']}, 204 {result['live_fallback']}, javobsiz {result['live_blocked']}"
+            )
+
+        data = {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'concurrency': options['concurrency'],
+                'duration': options['duration'],
+                'paths': options['paths'],
+                'live_tabs': options['live_tabs'],
+            },
+            'results': results,
+        }
+        output = Path(options['output']) if options['output'] else (
+            Path(settings.BASE_DIR) / 'benchmarks'
+            / f"load-{data['meta']['revision'] or 'local'}-{data['meta']['created_at'][:19].replace(':', '')}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+        self.stdout.write(self.style.SUCCESS(f"Natija yozildi: {output}"))
+
+    def start_server(self, name, port, options):
+        command = [
+            sys.executable, '-m', 'gunicorn', *SERVER_PROFILES[name],
+            '--bind', f"127.0.0.1:{port}", '--workers', str(options['workers']), '--log-level', 'warning',
+            '--access-logfile', '/dev/null',
+        ]
+        if name == 'gthread':
+            command += ['--threads', str(options['threads'])]
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'beckend.settings')}
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, start_new_session=True)
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                requests.get(f"http://127.0.0.1:{port}/login/", timeout=5)
+                return process
+            except requests.RequestException:
+                if process.poll() is not None:
+                    break
+                time.sleep(0.2)
+        process.kill()
+        raise CommandError(f"'{name}' serveri ishga tushmadi")
+
+    def login(self, base_url, options):
+        session = requests.Session()
+        page = session.get(f"{base_url}/login/")
+        token = session.cookies.get('csrftoken') or re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page.text).group(1)
+        session.post(f"{base_url}/login/", data={
+            'username': options['username'],
+            'password': options['password'],
+            'csrfmiddlewaretoken': token,
+        }, headers={'Referer': f"{base_url}/login/"})
+        if 'sessionid' not in session.cookies:
+            raise CommandError(f"'{options['username']}' bilan kirib bo'lmadi")
+        return session
+
+    def open_live_tabs(self, base_url, cookies, count):
+        """
+        Ochiq analitika vkladkalari: sahifa + /api/live/ (EventSource kabi, javob o'qilmaydi).
+        Sarlavhalar LIVE_TIMEOUT ichida kelmasa - oqim worker'ni band qilgan (blocked).
+        """
+        tabs = []
+        for _ in range(count):
+            session = requests.Session()
+            session.cookies.update(cookies)
+            try:
+                session.get(f"{base_url}/analitika/", timeout=REQUEST_TIMEOUT)
+                response = session.get(f"{base_url}/api/live/", stream=True, timeout=LIVE_TIMEOUT)
+            except requests.RequestException:
+                response = None
+            tabs.append((session, response))
+        return tabs
+
+    def close_live_tabs(self, tabs):
+        """Qaytaradi: ochiq SSE oqimlari, 204 (so'rovga o'tgan) va javobsiz qolganlar soni"""
+        result = {'live_tabs': len(tabs), 'live_streaming': 0, 'live_fallback': 0, 'live_blocked': 0}
+        for session, response in tabs:
+            if response is None:
+                result['live_blocked'] += 1
+            elif response.status_code == 204:
+                result['live_fallback'] += 1
+            elif response.status_code == 200:
+                result['live_streaming'] += 1
+                response.close()
+            session.close()
+        return result
+
+    def run_load(self, base_url, options):
+        """`concurrency` ta oqim `duration` soniya davomida so'rov yuboradi"""
+        cookies = self.login(base_url, options).cookies
+        tabs = self.open_live_tabs(base_url, cookies, options['live_tabs'])
+        paths = options['paths']
+        deadline = time.monotonic() + options['duration']
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+
+        def worker(offset):
+            session = requests.Session()
+            session.cookies.update(cookies)
+            local, failed = [], 0
+            index = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = session.get(base_url + paths[index % len(paths)], allow_redirects=False,
+                                           timeout=REQUEST_TIMEOUT)
+                    if response.status_code != 200:
+                        failed += 1
+                except requests.RequestException:
+                    failed += 1
+                local.append((time.perf_counter() - started) * 1000)
+                index += 1
+            session.close()
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        live = self.close_live_tabs(tabs)
+
+        latencies.sort()
+        return {
+            **live,
+            'requests': len(latencies),
+            'errors': errors[0],
+            'rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else 0,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else 0,
+        }
@@ -0,0 +1,23 @@
+# prune_catalog_tombstones.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from frontend.models import CatalogTombstone
+
+
+class Command(BaseCommand):
+    """
+    Kassa katalogi uchun eski o'chirish belgilarini tozalash.
+
+    Undan eski versiyadagi kassalar baribir to'liq snapshot oladi (frontend/catalog.py).
+    Har kecha (cron):
+        45 0 * * * cd /app && python manage.py prune_catalog_tombstones
+    """
+    help = "CATALOG_TOMBSTONE_DAYS dan eski o'chirish belgilarini o'chirish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=settings.CATALOG_TOMBSTONE_DAYS)
+
+    def handle(self, *args, **options):
+        deleted = CatalogTombstone.prune(options['keep_days'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta eski belgi o'chirildi"))
@@ -0,0 +1,47 @@
+# rollup_daily_sales.py
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from frontend.caching import bump_data_version
+from frontend.models import Customer, DailySalesRollup, Sale
+
+
+class Command(BaseCommand):
+    """
+    Kunlik sotuv yakunlarini (DailySalesRollup) sotuvlardan qayta yozish.
+    Kun davomida qatorlar signallar orqali yangilanadi; tungi ishga tushirish
+    signal chetlab o'tgan o'zgarishlarni (masalan, to'g'ridan-to'g'ri UPDATE) tuzatadi.
+
+    Butun tarixni qayta yozish (0016 migratsiyasi buni bir marta bajaradi):
+        python manage.py rollup_daily_sales
+    Har kecha (cron):
+        20 0 * * * cd /app && python manage.py rollup_daily_sales --days 2
+    """
+    help = "Kunlik sotuv yakunlarini qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help="Faqat oxirgi N kun (bo'lmasa - butun tarix)")
+        parser.add_argument('--user', default=None, help="Faqat bitta tenant (username)")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        # Faqat yangi mijozlari bor kunlar ham yakunga kiradi
+        users = User.objects.filter(
+            Q(pk__in=Sale.objects.values('user_id')) | Q(pk__in=Customer.objects.values('user_id'))
+        )
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        for user in users:
+            count = DailySalesRollup.rebuild(user, since=since)
+            bump_data_version(user.id, 'sales')
+            self.stdout.write(f"{user.username}: {count} kun yozildi")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
@@ -0,0 +1,67 @@
+# run_benchmarks.py
+import json
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from frontend import benchmarks
+from frontend.management.commands.seed_benchmark_data import BENCH_USER_PREFIX
+
+
+class Command(BaseCommand):
+    help = "View va eksportlarni o'lchab, natijani JSON faylga yozish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default=f"{BENCH_USER_PREFIX}1", help="Qaysi tenant nomidan o'lchash")
+        parser.add_argument('--repeat', type=int, default=5, help="Har bir ssenariy necha marta ishga tushiriladi")
+        parser.add_argument('--only', nargs='*', default=None, help="Ssenariy nomi prefikslari (masalan view: export:)")
+        parser.add_argument('--output', default=None, help="Natija fayli (standart: benchmarks/<revision>-<vaqt>.json)")
+        parser.add_argument('--compare', default=None, help="Solishtirish uchun avvalgi natija fayli")
+        parser.add_argument('--list', action='store_true', help="Ssenariylar ro'yxatini chiqarish")
+
+    def handle(self, *args, **options):
+        if options['list']:
+            benchmarks.register_view_scenarios()
+            for name in sorted(benchmarks.SCENARIOS):
+                self.stdout.write(name)
+            return
+
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"'{options['user']}' topilmadi. Avval seed_benchmark_data ni ishga tushiring.")
+
+        # Benchmark DEBUG rejimida ham ishlashi uchun test klient hostiga ruxsat
+        if 'testserver' not in settings.ALLOWED_HOSTS and '*' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS.append('testserver')
+
+        # Xato bergan view'lar natijada qayd etiladi, traceback'lar chiqarilmaydi
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+        data = benchmarks.run(user, names=options['only'], repeat=options['repeat'])
+
+        for name, result in data['results'].items():
+            if 'median_ms' in result:
+                self.stdout.write(f"{name:<45} {result['median_ms']:>10.2f} ms  {result['queries']:>5} so'rov  [{result['status']}]")
+            else:
+                self.stdout.write(self.style.WARNING(f"{name:<45} {result.get('error') or result.get('skipped')}"))
+
+        output = Path(options['output']) if options['output'] else (
+            Path(settings.BASE_DIR) / 'benchmarks'
+            / f"{data['meta']['revision'] or 'local'}-{data['meta']['created_at'][:19].replace(':', '')}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+        self.stdout.write(self.style.SUCCESS(f"Natija yozildi: {output}"))
+
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+            self.stdout.write(f"\nSolishtirish ({baseline['meta'].get('revision')} -> {data['meta']['revision']}):")
+            for name, before, after, change, q_before, q_after in benchmarks.compare(baseline, data):
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+                self.stdout.write(style(
+                    f"{name:<45} {before:>10.2f} -> {after:>10.2f} ms ({change:+.1f}%)  so'rovlar {q_before} -> {q_after}"
+                ))
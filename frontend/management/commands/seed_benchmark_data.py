@@ -0,0 +1,343 @@
+# seed_benchmark_data.py
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from frontend.models import Category, Customer, Debt, Product, Purchase, Sale
+
+
+BENCH_USER_PREFIX = 'bench'
+BENCH_PASSWORD = 'bench12345'
+
+# Ildiz kategoriyalar: (nom, ikonka, rang, subkategoriyalar)
+CATEGORY_TREE = [
+    ("Oziq-ovqat (food)", 'ri-restaurant-line', '#10B981', ["Non mahsulotlari", "Sut mahsulotlari", "Go'sht", "Shirinliklar"]),
+    ("Ichimliklar (drink)", 'ri-cup-line', '#3B82F6', ["Gazli suvlar", "Sharbatlar", "Choy va qahva"]),
+    ("Kiyim (clothing)", 'ri-t-shirt-line', '#8B5CF6', ["Erkaklar", "Ayollar", "Bolalar"]),
+    ("Elektronika (electronics)", 'ri-smartphone-line', '#F59E0B', ["Telefonlar", "Aksessuarlar", "Maishiy texnika"]),
+    ("Uy-ro'zg'or (furniture)", 'ri-sofa-line', '#F97316', ["Oshxona", "Tozalash vositalari"]),
+    ("Dori-darmon (medicine)", 'ri-medicine-bottle-line', '#EF4444', ["Vitaminlar", "Gigiyena"]),
+    ("Go'zallik (beauty)", 'ri-heart-line', '#8B5CF6', ["Kosmetika", "Parfyumeriya"]),
+    ("Sport (sport)", 'ri-basketball-line', '#10B981', ["Trenajyorlar", "Sport kiyimlari"]),
+]
+
+FIRST_NAMES = ['Aziz', 'Bobur', 'Dilshod', 'Jasur', 'Sardor', 'Otabek', 'Madina', 'Nilufar', 'Gulnora',
+               'Shahnoza', 'Dilnoza', 'Sevara', 'Javohir', 'Sherzod', 'Umid', 'Kamola', 'Malika', 'Rustam']
+LAST_NAMES = ['Karimov', 'Rahimov', 'Toshmatov', 'Aliyev', 'Yusupov', 'Qodirov', 'Ergashev', 'Nazarov',
+              'Saidov', 'Mirzayev', 'Xolmatov', 'Usmonov', 'Abdullayev', 'Sobirov']
+BRANDS = ['Nestle', 'Coca-Cola', 'Samsung', 'Artel', 'Lalaku', 'Nika', 'Bon Aqua', 'Xiaomi', 'Gloria', None]
+UNITS = ['pc', 'pc', 'pc', 'kg', 'l', 'pack', 'box', 'bottle']
+PAYMENT_METHODS = ['cash', 'card', 'transfer', 'credit', 'mixed']
+PAYMENT_WEIGHTS = [50, 30, 5, 10, 5]
+
+# Soatlar bo'yicha sotuv zichligi (06:00 - 23:00)
+HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 1, 2, 4, 6, 7, 8, 9, 8, 7, 7, 8, 9, 10, 9, 6, 4, 2, 1]
+
+
+@contextmanager
+def manual_timestamps(*fields):
+    """auto_now_add maydonlarini vaqtincha o'chirish (tarixiy sanalar uchun)"""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
+
+
+class Command(BaseCommand):
+    help = "Benchmark uchun sintetik ma'lumotlar yaratish (10k - 10M sotuv)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sales', type=int, default=10_000, help="Sotuvlar soni (jami, barcha tenantlar uchun)")
+        parser.add_argument('--tenants', type=int, default=2, help="Tenantlar (foydalanuvchilar) soni")
+        parser.add_argument('--products', type=int, default=None, help="Har bir tenant uchun mahsulotlar soni")
+        parser.add_argument('--customers', type=int, default=None, help="Har bir tenant uchun mijozlar soni")
+        parser.add_argument('--days', type=int, default=365, help="Sotuvlar tarqatiladigan kunlar soni")
+        parser.add_argument('--seed', type=int, default=42, help="Tasodifiy generator urug'i")
+        parser.add_argument('--batch-size', type=int, default=5000, help="bulk_create paket hajmi")
+        parser.add_argument('--clear', action='store_true', help="Avvalgi benchmark ma'lumotlarini o'chirish")
+
+    def handle(self, *args, **options):
+        total_sales = options['sales']
+        tenants = options['tenants']
+        if total_sales < 0 or tenants < 1:
+            raise CommandError("--sales manfiy bo'lmasligi, --tenants esa kamida 1 bo'lishi kerak")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.days = max(options['days'], 1)
+        self.now = timezone.now()
+
+        sales_per_tenant = total_sales // tenants
+        products_per_tenant = options['products'] or min(max(sales_per_tenant // 100, 50), 100_000)
+        customers_per_tenant = options['customers'] or min(max(sales_per_tenant // 20, 20), 1_000_000)
+
+        if options['clear']:
+            self.clear()
+
+        started = timezone.now()
+        for index in range(tenants):
+            user = self.create_tenant(index)
+            self.stdout.write(f"Tenant {user.username}: kategoriyalar, {products_per_tenant} mahsulot, "
+                              f"{customers_per_tenant} mijoz, {sales_per_tenant} sotuv")
+            categories = self.create_categories(user, index)
+            products = self.create_products(user, index, categories, products_per_tenant)
+            customers = self.create_customers(user, index, customers_per_tenant)
+            self.create_purchases(user, products, customers)
+            self.create_sales(user, products, customers, sales_per_tenant)
+            self.refresh_statistics(user)
+
+        elapsed = (timezone.now() - started).total_seconds()
+        self.stdout.write(self.style.SUCCESS(f"Benchmark ma'lumotlari yaratildi ({elapsed:.1f} s)"))
+
+    # =============== HELPERS ===============
+    def uuid(self):
+        """Qayta ishlab chiqariladigan UUID"""
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def random_datetime(self):
+        """Oxirgi `days` kun ichida, ish soatlariga yaqin vaqt"""
+        day = self.now - timedelta(days=self.rng.randrange(self.days))
+        hour = self.rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        return day.replace(hour=hour, minute=self.rng.randrange(60), second=self.rng.randrange(60), microsecond=0)
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    def clear(self):
+        """Benchmark tenantlari va ularning barcha ma'lumotlarini o'chirish"""
+        users = User.objects.filter(username__startswith=BENCH_USER_PREFIX)
+        for model in (Debt, Sale, Purchase, Product, Customer):
+            model.objects.filter(user__in=users).delete()
+        Category.objects.filter(user__in=users, parent__isnull=False).delete()
+        Category.objects.filter(user__in=users).delete()
+        deleted, _ = users.delete()
+        self.stdout.write(f"Avvalgi benchmark ma'lumotlari o'chirildi ({deleted} yozuv)")
+
+    # =============== GENERATORS ===============
+    def create_tenant(self, index):
+        username = f"{BENCH_USER_PREFIX}{index + 1}"
+        user, created = User.objects.get_or_create(username=username, defaults={
+            'email': f"{username}@sklat.uz",
+            'first_name': "Benchmark",
+            'last_name': f"Do'kon {index + 1}",
+        })
+        if created:
+            user.set_password(BENCH_PASSWORD)
+            user.save()
+        return user
+
+    def create_categories(self, user, tenant_index):
+        """Ota-bola daraxti: ildiz -> subkategoriya -> ichki subkategoriya"""
+        levels = [[], [], []]
+        for root_index, (name, icon, color, children) in enumerate(CATEGORY_TREE):
+            root = Category(id=self.uuid(), name=name, slug=f"bm{tenant_index}-{root_index}",
+                            icon=icon, color=color, user=user)
+            levels[0].append(root)
+            for child_index, child_name in enumerate(children):
+                child = Category(id=self.uuid(), name=child_name, slug=f"bm{tenant_index}-{root_index}-{child_index}",
+                                 icon=icon, color=color, user=user, parent=root)
+                levels[1].append(child)
+                for leaf_index, suffix in enumerate(['Premium', 'Ekonom']):
+                    levels[2].append(Category(
+                        id=self.uuid(), name=f"{child_name} {suffix}",
+                        slug=f"bm{tenant_index}-{root_index}-{child_index}-{leaf_index}",
+                        icon=icon, color=color, user=user, parent=child,
+                    ))
+
+        for level in levels:
+            self.bulk_create(Category, level)
+        Category.rebuild_paths(Category.objects.filter(user=user))
+        # Mahsulotlar faqat barg va o'rta darajadagi kategoriyalarga bog'lanadi
+        return levels[1] + levels[2]
+
+    def create_products(self, user, tenant_index, categories, count):
+        products = []
+        for i in range(count):
+            category = self.rng.choice(categories)
+            purchase_price = Decimal(self.rng.randrange(2, 2000) * 500)
+            sale_price = (purchase_price * Decimal(self.rng.uniform(1.05, 1.6))).quantize(Decimal('1'))
+            min_quantity = Decimal(self.rng.choice([2, 5, 10, 20]))
+            quantity = Decimal(self.rng.choice([0, 1, 3] + [self.rng.randrange(5, 500)] * 7))
+            product = Product(
+                id=self.uuid(),
+                name=f"{category.name} #{i + 1}",
+                sku=f"BM{tenant_index:02d}-{i + 1:07d}",
+                barcode=f"478{tenant_index:02d}{i + 1:08d}",
+                category=category,
+                brand=self.rng.choice(BRANDS),
+                purchase_price=purchase_price,
+                sale_price=sale_price,
+                avg_cost=purchase_price,
+                quantity=quantity,
+                unit=self.rng.choice(UNITS),
+                min_quantity=min_quantity,
+                user=user,
+            )
+            product.update_status()
+            products.append(product)
+
+        with manual_timestamps(Product._meta.get_field('created_at')):
+            for product in products:
+                product.created_at = self.now - timedelta(days=self.days + self.rng.randrange(30))
+            self.bulk_create(Product, products)
+        return products
+
+    def create_customers(self, user, tenant_index, count):
+        customers = []
+        types = ['regular'] * 8 + ['wholesale', 'vip']
+        for i in range(count):
+            customers.append(Customer(
+                id=self.uuid(),
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                phone=f"998{tenant_index:02d}{i + 1:07d}",
+                customer_type=self.rng.choice(types),
+                gender=self.rng.choice(['male', 'female']),
+                created_at=self.now - timedelta(days=self.rng.randrange(self.days + 1)),
+                user=user,
+            ))
+
+        with manual_timestamps(Customer._meta.get_field('created_at')):
+            self.bulk_create(Customer, customers)
+        return customers
+
+    def create_purchases(self, user, products, customers):
+        """Har bir mahsulot uchun 1-4 ta kirim"""
+        suppliers = customers[: max(len(customers) // 50, 1)]
+        purchases = []
+        with manual_timestamps(Purchase._meta.get_field('purchase_date')):
+            for index, product in enumerate(products):
+                for _ in range(self.rng.randint(1, 4)):
+                    quantity = Decimal(self.rng.randrange(10, 200))
+                    purchase_date = self.random_datetime()
+                    purchases.append(Purchase(
+                        id=self.uuid(),
+                        product=product,
+                        supplier=self.rng.choice(suppliers),
+                        quantity=quantity,
+                        price=product.purchase_price,
+                        total=quantity * product.purchase_price,
+                        invoice_number=f"PUR-{purchase_date:%Y%m%d}-{index:06d}",
+                        delivery_date=purchase_date.date(),
+                        purchase_date=purchase_date,
+                        user=user,
+                    ))
+                if len(purchases) >= self.batch_size:
+                    self.bulk_create(Purchase, purchases)
+                    purchases = []
+            self.bulk_create(Purchase, purchases)
+
+    def create_sales(self, user, products, customers, count):
+        """Sotuvlar va nasiya sotuvlar uchun qarzlar (paketlab)"""
+        # Zipf-ga yaqin taqsimot: bir nechta mahsulot sotuvlarning katta qismini beradi
+        weights = [1 / (rank + 1) for rank in range(len(products))]
+        cumulative = []
+        running = 0
+        for weight in weights:
+            running += weight
+            cumulative.append(running)
+
+        fields = [Sale._meta.get_field('sale_date'), Debt._meta.get_field('created_at')]
+        today = self.now.date()
+        created = 0
+        with manual_timestamps(*fields):
+            while created < count:
+                size = min(self.batch_size, count - created)
+                chosen = self.rng.choices(products, cum_weights=cumulative, k=size)
+                sales, debts = [], []
+                for offset, product in enumerate(chosen):
+                    quantity = Decimal(self.rng.choice([1, 1, 1, 2, 2, 3, 5]))
+                    discount = Decimal(self.rng.choice([0] * 9 + [1000]))
+                    total = quantity * product.sale_price - discount
+                    cost = quantity * product.avg_cost
+                    payment_method = self.rng.choices(PAYMENT_METHODS, weights=PAYMENT_WEIGHTS)[0]
+                    customer = self.rng.choice(customers) if (payment_method == 'credit' or self.rng.random() < 0.6) else None
+                    sale_date = self.random_datetime()
+                    sale = Sale(
+                        id=self.uuid(),
+                        customer=customer,
+                        product=product,
+                        quantity=quantity,
+                        price=product.sale_price,
+                        total=total,
+                        discount=discount,
+                        cost=cost,
+                        profit=quantity * product.sale_price - cost,
+                        payment_method=payment_method,
+                        paid_amount=0 if payment_method == 'credit' else total,
+                        invoice_number=f"INV-{sale_date:%Y%m%d}-{created + offset + 1:08d}",
+                        sale_date=sale_date,
+                        user=user,
+                    )
+                    sales.append(sale)
+
+                    if payment_method == 'credit':
+                        due_date = sale_date.date() + timedelta(days=30)
+                        paid_amount = self.rng.choice([Decimal(0), Decimal(0), (total / 2).quantize(Decimal('1')), total])
+                        if paid_amount >= total:
+                            status = 'paid'
+                        elif paid_amount > 0:
+                            status = 'partially_paid'
+                        elif due_date < today:
+                            status = 'overdue'
+                        else:
+                            status = 'pending'
+                        debts.append(Debt(
+                            id=self.uuid(),
+                            customer=customer,
+                            sale=sale,
+                            amount=total,
+                            paid_amount=paid_amount,
+                            due_date=due_date,
+                            paid_date=due_date if status == 'paid' else None,
+                            status=status,
+                            created_at=sale_date,
+                            user=user,
+                        ))
+
+                with transaction.atomic():
+                    self.bulk_create(Sale, sales)
+                    self.bulk_create(Debt, debts)
+                created += size
+                if count >= 10 * self.batch_size and created % (10 * self.batch_size) < self.batch_size:
+                    self.stdout.write(f"  {created}/{count} sotuv")
+
+    def refresh_statistics(self, user):
+        """Mahsulot, mijoz va kategoriya statistikalarini to'plamli yangilash"""
+        product_stats = Sale.objects.filter(user=user).values('product').annotate(
+            sold=Sum('quantity'), revenue=Sum('total'))
+        products = []
+        for row in product_stats.iterator(chunk_size=self.batch_size):
+            products.append(Product(id=row['product'], total_sold=row['sold'], total_revenue=row['revenue']))
+        Product.objects.bulk_update(products, ['total_sold', 'total_revenue'], batch_size=self.batch_size)
+
+        customer_stats = Sale.objects.filter(user=user, customer__isnull=False).values('customer').annotate(
+            count=Count('id'), spent=Sum('total'), last=Max('sale_date'))
+        customers = []
+        for row in customer_stats.iterator(chunk_size=self.batch_size):
+            customers.append(Customer(id=row['customer'], total_purchases=row['count'],
+                                      total_spent=row['spent'], last_purchase=row['last']))
+        Customer.objects.bulk_update(customers, ['total_purchases', 'total_spent', 'last_purchase'],
+                                     batch_size=self.batch_size)
+
+        categories = []
+        category_stats = Product.objects.filter(user=user).values('category').annotate(count=Count('id'))
+        values = {}
+        for product in Product.objects.filter(user=user).only('category_id', 'quantity', 'purchase_price'):
+            values[product.category_id] = values.get(product.category_id, 0) + product.total_value
+        for row in category_stats:
+            categories.append(Category(id=row['category'], product_count=row['count'],
+                                       total_value=values.get(row['category'], 0)))
+        Category.objects.bulk_update(categories, ['product_count', 'total_value'], batch_size=self.batch_size)
@@ -0,0 +1,33 @@
+# segment_customers.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from frontend.caching import bump_data_version
+from frontend.models import Customer
+
+
+class Command(BaseCommand):
+    """
+    Mijozlarni RFM (yaqinlik, chastota, summa) bo'yicha segmentlarga ajratish.
+
+    Har kecha ishga tushirish uchun (cron):
+        30 0 * * * cd /app && python manage.py segment_customers
+    """
+    help = "Mijozlar uchun RFM ballari va segmentlarini qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default=None, help="Faqat bitta tenant (username)")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Bitta UPDATE dagi mijozlar soni")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(customers__isnull=False).distinct()
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        for user in users:
+            count = Customer.compute_segments(user, batch_size=options['batch_size'])
+            # Mijozlar ro'yxati keshi yangilansin
+            bump_data_version(user.id, 'sales')
+            self.stdout.write(f"{user.username}: {count} ta mijoz segmentlandi")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
@@ -0,0 +1,32 @@
+# take_stock_snapshots.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from frontend.models import StockSnapshot
+
+
+class Command(BaseCommand):
+    """
+    Mahsulot qoldiqlarining suratini olish (tarixiy qoldiq so'rovlari uchun).
+
+    Har kecha ishga tushirish uchun (cron):
+        30 0 * * * cd /app && python manage.py take_stock_snapshots --keep-days 400
+    """
+    help = "Barcha mahsulotlar qoldig'ini saqlash va eski suratlarni o'chirish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=None,
+                            help="Shundan eski suratlar o'chiriladi (standart: o'chirilmaydi)")
+
+    def handle(self, *args, **options):
+        created = StockSnapshot.take()
+        self.stdout.write(f"{created} ta qoldiq surati olindi")
+
+        if options['keep_days']:
+            cutoff = timezone.now() - timedelta(days=options['keep_days'])
+            deleted, _ = StockSnapshot.objects.filter(taken_at__lt=cutoff).delete()
+            self.stdout.write(f"{deleted} ta eski surat o'chirildi")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
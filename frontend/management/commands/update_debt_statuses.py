@@ -0,0 +1,31 @@
+# update_debt_statuses.py
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from frontend.models import Debt, DebtAging
+
+
+class Command(BaseCommand):
+    """
+    Muddati o'tgan qarzlarni belgilash va qarz muddati tahlilini yangilash.
+
+    Har kuni yarim tundan keyin ishga tushirish uchun (cron):
+        5 0 * * * cd /app && python manage.py update_debt_statuses
+    """
+    help = "Muddati o'tgan qarzlarni 'overdue' qilish va qarz guruhlarini (0-30, 31-60, 61-90, 90+) yangilash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help="Hisob sanasi (YYYY-MM-DD), standart: bugun")
+
+    def handle(self, *args, **options):
+        today = options['date'] or date.today()
+
+        overdue, restored = Debt.mark_overdue(today)
+        rows = DebtAging.rebuild(today)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{today}: {overdue} ta qarz muddati o'tgan deb belgilandi, {restored} ta qaytarildi, "
+            f"{rows} ta tahlil qatori yozildi"
+        ))
@@ -0,0 +1,47 @@
+# update_reorder_points.py
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from frontend.caching import bump_data_version
+from frontend.models import Product, ReorderPoint
+
+
+class Command(BaseCommand):
+    """
+    Mahsulot holatlarini tekshirish va buyurtma nuqtalarini qayta hisoblash.
+
+    Har kecha ishga tushirish uchun (cron, forecast_demand dan keyin - prognoz bo'lsa
+    tavsiya etilgan miqdor undan olinadi):
+        15 0 * * * cd /app && python manage.py update_reorder_points
+    """
+    help = "Kam qolgan mahsulot holatlarini yangilash va sotuv tezligi bo'yicha buyurtma nuqtalarini hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=28, help="Sotuv tezligi hisoblanadigan davr (kun)")
+        parser.add_argument('--lead-time', type=int, default=7, help="Yetkazib berish muddati (kun)")
+        parser.add_argument('--cover', type=int, default=14, help="Buyurtma qoplashi kerak bo'lgan kunlar")
+        parser.add_argument('--user', default=None, help="Faqat bitta tenant (username)")
+
+    def handle(self, *args, **options):
+        updated = Product.refresh_statuses()
+        self.stdout.write(f"{updated} ta mahsulot holati yangilandi")
+
+        users = User.objects.filter(products__isnull=False).distinct()
+        if updated:
+            # Holatlar barcha tenantlar uchun yangilanadi
+            for user_id in users.values_list('id', flat=True):
+                bump_data_version(user_id, 'catalog')
+        if options['user']:
+            users = users.filter(username=options['user'])
+
+        for user in users:
+            count = ReorderPoint.rebuild(
+                user,
+                window_days=options['days'],
+                lead_time_days=options['lead_time'],
+                cover_days=options['cover'],
+            )
+            bump_data_version(user.id, 'catalog')
+            self.stdout.write(f"{user.username}: {count} ta mahsulot uchun buyurtma nuqtasi hisoblandi")
+
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
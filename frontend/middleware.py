@@ -0,0 +1,43 @@
+# middleware.py
+from asgiref.sync import iscoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware
+
+from . import profiling
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Dinamik javoblarni gzip bilan siqish (JSON, HTML).
+    Server-Sent Events siqilmaydi - gzip bufer hodisalarni ushlab qoladi.
+    Statik fayllarni WhiteNoise oldindan siqilgan holda beradi.
+    """
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+        return super().process_response(request, response)
+
+
+class ProfilingMiddleware:
+    """
+    Tanlangan so'rovlarni profillash (frontend.profiling): staff so'rovi
+    (?_profile=1 yoki X-Profile: 1) yoki PROFILING_SAMPLE_RATE tanlovi.
+    AuthenticationMiddleware dan keyin turadi.
+
+    cProfile va SQL hook'i oqimga bog'liq, shuning uchun faqat WSGI (gthread)
+    rejimida ishlaydi; ASGI'da o'chadi - async zanjir sync'ga o'tkazilmaydi.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if iscoroutinefunction(get_response):
+            raise MiddlewareNotUsed("ASGI rejimida so'rov profili olinmaydi")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reason = profiling.trigger(request)
+        if reason is None:
+            return self.get_response(request)
+        return profiling.capture(request, self.get_response, reason)
@@ -0,0 +1,601 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:39
+
+import datetime
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0003_category_customer_dashboardstats_debt_product_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('created', 'Yaratildi'), ('updated', 'Yangilandi'), ('deleted', 'Oʻchirildi'), ('product_added', 'Mahsulot qoʻshildi'), ('product_removed', 'Mahsulot olib tashlandi')], max_length=20)),
+                ('details', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ['name'], 'verbose_name': 'Kategoriya', 'verbose_name_plural': 'Kategoriyalar'},
+        ),
+        migrations.AlterModelOptions(
+            name='customer',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Mijoz', 'verbose_name_plural': 'Mijozlar'},
+        ),
+        migrations.AlterModelOptions(
+            name='dashboardstats',
+            options={'ordering': ['-date'], 'verbose_name': 'Dashboard statistikasi', 'verbose_name_plural': 'Dashboard statistikasi'},
+        ),
+        migrations.AlterModelOptions(
+            name='debt',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Qarz', 'verbose_name_plural': 'Qarzlar'},
+        ),
+        migrations.AlterModelOptions(
+            name='product',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Mahsulot', 'verbose_name_plural': 'Mahsulotlar'},
+        ),
+        migrations.RemoveField(
+            model_name='customer',
+            name='note',
+        ),
+        migrations.RemoveField(
+            model_name='dashboardstats',
+            name='total_sales_today',
+        ),
+        migrations.RemoveField(
+            model_name='purchase',
+            name='created_by',
+        ),
+        migrations.RemoveField(
+            model_name='sale',
+            name='created_by',
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='color',
+            field=models.CharField(default='#3B82F6', max_length=7, verbose_name='Rang'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='icon',
+            field=models.CharField(default='ri-folder-line', max_length=50, verbose_name='Ikonka'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subcategories', to='frontend.category', verbose_name='Ota kategoriya'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='product_count',
+            field=models.IntegerField(default=0, verbose_name='Mahsulotlar soni'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=100, unique=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='total_value',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami qiymati'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='categories', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='birth_date',
+            field=models.DateField(blank=True, null=True, verbose_name="Tug'ilgan sana"),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='company',
+            field=models.CharField(blank=True, max_length=200, null=True, verbose_name='Kompaniya'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='customer_type',
+            field=models.CharField(choices=[('regular', 'Oddiy'), ('wholesale', 'Ulgurji'), ('vip', 'VIP'), ('employee', 'Xodim')], default='regular', max_length=20, verbose_name='Mijoz turi'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='gender',
+            field=models.CharField(blank=True, choices=[('male', 'Erkak'), ('female', 'Ayol'), ('other', 'Boshqa')], max_length=10, null=True, verbose_name='Jins'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='Faol'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='last_purchase',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Oxirgi xarid'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='notes',
+            field=models.TextField(blank=True, null=True, verbose_name="Qo'shimcha ma'lumotlar"),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='tax_id',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='STIR'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='total_purchases',
+            field=models.IntegerField(default=0, verbose_name='Jami xaridlar'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='total_spent',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami sarflangan'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='customers', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='date',
+            field=models.DateField(default=datetime.date.today, unique=True, verbose_name='Sana'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='new_customers',
+            field=models.IntegerField(default=0, verbose_name='Yangi mijozlar'),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='purchase_count',
+            field=models.IntegerField(default=0, verbose_name='Kirimlar soni'),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='sales_count',
+            field=models.IntegerField(default=0, verbose_name='Sotuvlar soni'),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='total_purchases',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami kirimlar'),
+        ),
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='total_sales',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami sotuvlar'),
+        ),
+        migrations.AddField(
+            model_name='debt',
+            name='notes',
+            field=models.TextField(blank=True, null=True, verbose_name='Izohlar'),
+        ),
+        migrations.AddField(
+            model_name='debt',
+            name='paid_date',
+            field=models.DateField(blank=True, null=True, verbose_name="To'langan sana"),
+        ),
+        migrations.AddField(
+            model_name='debt',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='debt',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='debts', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='barcode',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Shtrix kod'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='brand',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Brend'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='description',
+            field=models.TextField(blank=True, null=True, verbose_name='Tavsif'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='status',
+            field=models.CharField(choices=[('active', 'Faol'), ('inactive', 'Nofaol'), ('low_stock', 'Kam qolgan'), ('out_of_stock', 'Tugagan')], default='active', max_length=20, verbose_name='Holati'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='total_revenue',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami daromad'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='total_sold',
+            field=models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name='Jami sotilgan'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='products', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='delivery_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Yetkazib berish sanasi'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='expiry_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Yaroqlilik muddati'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='invoice_number',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='Faktura raqami'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='notes',
+            field=models.TextField(blank=True, null=True, verbose_name='Izohlar'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Kutilmoqda'), ('received', 'Qabul qilingan'), ('cancelled', 'Bekor qilingan')], default='received', max_length=20, verbose_name='Holati'),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='purchases', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Chegirma'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='invoice_number',
+            field=models.CharField(blank=True, max_length=50, null=True, verbose_name='Faktura raqami'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='notes',
+            field=models.TextField(blank=True, null=True, verbose_name='Izohlar'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name="To'langan summa"),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Kutilmoqda'), ('completed', 'Yakunlangan'), ('cancelled', 'Bekor qilingan'), ('refunded', 'Qaytarilgan')], default='completed', max_length=20, verbose_name='Holati'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='tax',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Soliq'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='user',
+            field=models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, related_name='sales', to=settings.AUTH_USER_MODEL),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='phone',
+            field=models.CharField(max_length=20, unique=True, verbose_name='Telefon'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='total_customers',
+            field=models.IntegerField(default=0, verbose_name='Jami mijozlar'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='total_debt',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami qarz'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='total_products',
+            field=models.IntegerField(default=0, verbose_name='Jami mahsulotlar'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstats',
+            name='total_profit',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami foyda'),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Jami summa'),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='customer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debts', to='frontend.customer', verbose_name='Mijoz'),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name="To'langan summa"),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='sale',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debts', to='frontend.sale', verbose_name='Sotuv'),
+        ),
+        migrations.AlterField(
+            model_name='debt',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Kutilmoqda'), ('partially_paid', "Qisman to'langan"), ('paid', "To'langan"), ('overdue', 'Muddati otgan'), ('cancelled', 'Bekor qilingan')], default='pending', max_length=20, verbose_name='Holati'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='frontend.category', verbose_name='Kategoriya'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='min_quantity',
+            field=models.DecimalField(decimal_places=3, default=5, max_digits=12, verbose_name='Minimal miqdor'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='purchase_price',
+            field=models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Kirim narxi'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='quantity',
+            field=models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name='Miqdor'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='sale_price',
+            field=models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Sotuv narxi'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='unit',
+            field=models.CharField(choices=[('kg', 'Kilogram (kg)'), ('g', 'Gram (g)'), ('pc', 'Dona (pc)'), ('l', 'Litr (l)'), ('ml', 'Millilitr (ml)'), ('pack', 'Paket (pack)'), ('box', 'Quti (box)'), ('bottle', 'Shisha (bottle)'), ('m', 'Metr (m)'), ('cm', 'Santimetr (cm)'), ('pair', 'Juft (pair)'), ('set', 'Komplekt (set)')], default='pc', max_length=20, verbose_name="O'lchov birligi"),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Narx'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='purchases', to='frontend.product', verbose_name='Mahsulot'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='purchase_date',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Kirim sanasi'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='quantity',
+            field=models.DecimalField(decimal_places=3, max_digits=12, verbose_name='Miqdor'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='supplier',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='supplies', to='frontend.customer', verbose_name='Yetkazib beruvchi'),
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='total',
+            field=models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Jami summa'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='customer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sales', to='frontend.customer', verbose_name='Mijoz'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='payment_method',
+            field=models.CharField(choices=[('cash', 'Naqd pul'), ('card', 'Bank kartasi'), ('transfer', "Bank o'tkazmasi"), ('credit', 'Nasiya'), ('mixed', 'Aralash')], default='cash', max_length=20, verbose_name="To'lov usuli"),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Narx'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales', to='frontend.product', verbose_name='Mahsulot'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='quantity',
+            field=models.DecimalField(decimal_places=3, max_digits=12, verbose_name='Miqdor'),
+        ),
+        migrations.AlterField(
+            model_name='sale',
+            name='total',
+            field=models.DecimalField(decimal_places=2, max_digits=15, verbose_name='Jami summa'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='category',
+            unique_together={('name', 'user')},
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['phone'], name='frontend_cu_phone_15e00e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['first_name', 'last_name'], name='frontend_cu_first_n_a9b69c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['customer_type'], name='frontend_cu_custome_1dc5b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dashboardstats',
+            index=models.Index(fields=['date'], name='frontend_da_date_de20d6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debt',
+            index=models.Index(fields=['customer'], name='frontend_de_custome_e7000b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debt',
+            index=models.Index(fields=['status'], name='frontend_de_status_db3c0f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debt',
+            index=models.Index(fields=['due_date'], name='frontend_de_due_dat_3625a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['sku'], name='frontend_pr_sku_d0c4dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name'], name='frontend_pr_name_7ab777_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category'], name='frontend_pr_categor_79a9f8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['status'], name='frontend_pr_status_89d3da_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['purchase_date'], name='frontend_pu_purchas_1f293a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['supplier'], name='frontend_pu_supplie_b54095_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['status'], name='frontend_pu_status_8d39c9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['sale_date'], name='frontend_sa_sale_da_d6731c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['customer'], name='frontend_sa_custome_2034e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['payment_method'], name='frontend_sa_payment_308023_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['status'], name='frontend_sa_status_1116aa_idx'),
+        ),
+        migrations.AddField(
+            model_name='categoryhistory',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='frontend.category'),
+        ),
+        migrations.AddField(
+            model_name='categoryhistory',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:43
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0004_sync_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DebtAging',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('as_of', models.DateField(verbose_name='Sana')),
+                ('current', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Muddati kelmagan')),
+                ('days_0_30', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='0-30 kun')),
+                ('days_31_60', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='31-60 kun')),
+                ('days_61_90', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='61-90 kun')),
+                ('days_90_plus', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='90+ kun')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami qarz')),
+                ('debt_count', models.IntegerField(default=0, verbose_name='Qarzlar soni')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Qarz muddati tahlili',
+                'verbose_name_plural': 'Qarz muddati tahlili',
+                'ordering': ['-total'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='debt',
+            index=models.Index(fields=['status', 'due_date'], name='frontend_de_status_39b6c5_idx'),
+        ),
+        migrations.AddField(
+            model_name='debtaging',
+            name='customer',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='debt_aging', to='frontend.customer', verbose_name='Mijoz'),
+        ),
+        migrations.AddField(
+            model_name='debtaging',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debt_aging', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='debtaging',
+            index=models.Index(fields=['user', 'customer'], name='frontend_de_user_id_0eb28d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debtaging',
+            index=models.Index(fields=['user', '-total'], name='frontend_de_user_id_a7b193_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debtaging',
+            index=models.Index(fields=['user', '-days_90_plus'], name='frontend_de_user_id_cb86f5_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0005_debt_aging'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReorderPoint',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reorder', serialize=False, to='frontend.product', verbose_name='Mahsulot')),
+                ('avg_daily_sales', models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name="Kunlik o'rtacha sotuv")),
+                ('days_until_stockout', models.DecimalField(blank=True, decimal_places=1, max_digits=10, null=True, verbose_name='Tugashigacha kunlar')),
+                ('reorder_point', models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name='Buyurtma nuqtasi')),
+                ('suggested_quantity', models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name='Tavsiya etilgan miqdor')),
+                ('window_days', models.IntegerField(default=28, verbose_name='Tahlil davri (kun)')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='Hisoblangan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Buyurtma nuqtasi',
+                'verbose_name_plural': 'Buyurtma nuqtalari',
+                'ordering': ['days_until_stockout'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('status__in', ['low_stock', 'out_of_stock'])), fields=['user', 'status'], name='product_low_stock_idx'),
+        ),
+        migrations.AddField(
+            model_name='reorderpoint',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reorder_points', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='reorderpoint',
+            index=models.Index(fields=['user', 'days_until_stockout'], name='frontend_re_user_id_349fea_idx'),
+        ),
+    ]
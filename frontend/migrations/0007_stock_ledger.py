@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:54
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0006_reorder_points'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('sale', 'Sotuv'), ('purchase', 'Kirim'), ('adjustment', 'Tuzatish'), ('return', 'Qaytarish')], max_length=20, verbose_name='Turi')),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=12, verbose_name='Miqdor (+/-)')),
+                ('balance_after', models.DecimalField(decimal_places=3, max_digits=12, verbose_name='Qoldiq')),
+                ('note', models.CharField(blank=True, max_length=255, null=True, verbose_name='Izoh')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Vaqt')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='frontend.product', verbose_name='Mahsulot')),
+                ('purchase', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='frontend.purchase', verbose_name='Kirim')),
+                ('sale', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='frontend.sale', verbose_name='Sotuv')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Ombor harakati',
+                'verbose_name_plural': 'Ombor harakatlari',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['product', 'created_at'], name='frontend_st_product_f6869b_idx'), models.Index(fields=['user', 'created_at'], name='frontend_st_user_id_492b1f_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=12, verbose_name='Qoldiq')),
+                ('taken_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Vaqt')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='frontend.product', verbose_name='Mahsulot')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Qoldiq surati',
+                'verbose_name_plural': 'Qoldiq suratlari',
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['product', 'taken_at'], name='frontend_st_product_862664_idx')],
+            },
+        ),
+    ]
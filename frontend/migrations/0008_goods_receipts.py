@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:57
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_received_as_applied(apps, schema_editor):
+    # Avval qabul qilingan kirimlar omborga allaqachon qo'shilgan
+    Purchase = apps.get_model('frontend', 'Purchase')
+    Purchase.objects.filter(status='received').update(applied_quantity=F('quantity'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0007_stock_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='applied_quantity',
+            field=models.DecimalField(decimal_places=3, default=0, editable=False, max_digits=12, verbose_name="Omborga qo'shilgan miqdor"),
+        ),
+        migrations.RunPython(mark_received_as_applied, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='GoodsReceipt',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('invoice_number', models.CharField(max_length=50, verbose_name='Faktura raqami')),
+                ('delivery_date', models.DateField(blank=True, null=True, verbose_name='Yetkazib berish sanasi')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Jami summa')),
+                ('line_count', models.PositiveIntegerField(default=0, verbose_name='Qatorlar soni')),
+                ('notes', models.TextField(blank=True, null=True, verbose_name='Izohlar')),
+                ('received_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Qabul qilingan vaqt')),
+                ('supplier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='receipts', to='frontend.customer', verbose_name='Yetkazib beruvchi')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goods_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Yuk xati',
+                'verbose_name_plural': 'Yuk xatlari',
+                'ordering': ['-received_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='purchase',
+            name='receipt',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='frontend.goodsreceipt', verbose_name='Yuk xati'),
+        ),
+        migrations.AddConstraint(
+            model_name='goodsreceipt',
+            constraint=models.UniqueConstraint(fields=('user', 'invoice_number'), name='unique_receipt_invoice'),
+        ),
+    ]
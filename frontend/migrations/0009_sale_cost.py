@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:58
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_costs(apps, schema_editor):
+    # Eski sotuvlar uchun tannarx ma'lum emas - mahsulotning joriy kirim narxi olinadi
+    Product = apps.get_model('frontend', 'Product')
+    Sale = apps.get_model('frontend', 'Sale')
+    Product.objects.update(avg_cost=F('purchase_price'))
+    purchase_price = Product.objects.filter(pk=OuterRef('product_id')).values('purchase_price')[:1]
+    Sale.objects.update(cost=Subquery(purchase_price) * F('quantity'))
+    Sale.objects.update(profit=F('price') * F('quantity') - F('cost'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0008_goods_receipts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='avg_cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name="O'rtacha tannarx"),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Tannarx'),
+        ),
+        migrations.AddField(
+            model_name='sale',
+            name='profit',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Foyda'),
+        ),
+        migrations.RunPython(backfill_costs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:00
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    Category = apps.get_model('frontend', 'Category')
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def build(pk):
+        if pk not in paths:
+            parent_id = parents.get(pk)
+            paths[pk] = (build(parent_id) if parent_id in parents else '') + f"{pk.hex}/"
+        return paths[pk]
+
+    categories = [Category(id=pk, path=build(pk), depth=build(pk).count('/') - 1) for pk in parents]
+    Category.objects.bulk_update(categories, ['path', 'depth'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0009_sale_cost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1000),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
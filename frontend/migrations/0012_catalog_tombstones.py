@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0011_product_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogTombstone',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('product', 'Mahsulot'), ('customer', 'Mijoz')], max_length=20, verbose_name='Turi')),
+                ('object_id', models.UUIDField(verbose_name='Obyekt ID')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name="O'chirilgan vaqt")),
+            ],
+            options={
+                'verbose_name': "O'chirilgan obyekt",
+                'verbose_name_plural': "O'chirilgan obyektlar",
+                'ordering': ['-deleted_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['user', 'updated_at'], name='frontend_cu_user_id_cf8b9b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'updated_at'], name='frontend_pr_user_id_0b03cb_idx'),
+        ),
+        migrations.AddField(
+            model_name='catalogtombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='catalogtombstone',
+            index=models.Index(fields=['user', 'deleted_at'], name='frontend_ca_user_id_13b136_idx'),
+        ),
+    ]
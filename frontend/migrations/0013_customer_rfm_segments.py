@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0012_catalog_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='rfm_frequency',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='F (chastota)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='rfm_monetary',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='M (summa)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='rfm_recency',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='R (yaqinlik)'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='segment',
+            field=models.CharField(blank=True, choices=[('champions', 'Chempionlar'), ('loyal', 'Sodiq mijozlar'), ('potential_loyalist', "Sodiq bo'lishi mumkin"), ('new', 'Yangi mijozlar'), ('promising', 'Istiqbolli'), ('need_attention', "E'tibor kerak"), ('about_to_sleep', 'Uxlash arafasida'), ('at_risk', 'Xavf ostida'), ('cant_lose', "Yo'qotib bo'lmaydi"), ('hibernating', 'Uyquda'), ('lost', "Yo'qotilgan")], default='', max_length=20, verbose_name='Segment'),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='segmented_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Segment hisoblangan vaqt'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['user', 'segment'], name='frontend_cu_user_id_2df6e5_idx'),
+        ),
+    ]
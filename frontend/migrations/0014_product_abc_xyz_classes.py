@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0013_customer_rfm_segments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='abc_class',
+            field=models.CharField(blank=True, choices=[('A', 'A - asosiy daromad'), ('B', "B - o'rtacha daromad"), ('C', 'C - kam daromad')], default='', max_length=1, verbose_name='ABC sinfi'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='classified_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Tasniflangan vaqt'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='xyz_class',
+            field=models.CharField(blank=True, choices=[('X', 'X - barqaror talab'), ('Y', "Y - o'zgaruvchan talab"), ('Z', 'Z - tasodifiy talab')], default='', max_length=1, verbose_name='XYZ sinfi'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['user', 'abc_class', 'xyz_class'], name='frontend_pr_user_id_66ffd8_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0014_product_abc_xyz_classes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandForecast',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='forecast', serialize=False, to='frontend.product', verbose_name='Mahsulot')),
+                ('method', models.CharField(choices=[('ses', 'Eksponensial tekislash'), ('seasonal_naive', 'Haftalik mavsumiy'), ('none', "Sotuv yo'q")], max_length=20, verbose_name='Usul')),
+                ('daily', models.JSONField(default=list, verbose_name='Kunlik prognoz')),
+                ('horizon_total', models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name="Davr bo'yicha jami")),
+                ('mae', models.DecimalField(decimal_places=3, default=0, max_digits=12, verbose_name="O'rtacha xato (MAE)")),
+                ('history_days', models.IntegerField(default=84, verbose_name='Tarix (kun)')),
+                ('computed_at', models.DateTimeField(verbose_name='Hisoblangan vaqt')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demand_forecasts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Talab prognozi',
+                'verbose_name_plural': 'Talab prognozlari',
+                'indexes': [models.Index(fields=['user', 'computed_at'], name='frontend_de_user_id_843626_idx')],
+            },
+        ),
+    ]
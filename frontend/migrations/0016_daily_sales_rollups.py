@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    # Bosh sahifa va analitika KPI'lari faqat shu jadvaldan o'qiladi - butun tarix
+    # DailySalesRollup.rebuild kabi (foydalanuvchi, kun) bo'yicha GROUP BY bilan yoziladi
+    Sale = apps.get_model('frontend', 'Sale')
+    Customer = apps.get_model('frontend', 'Customer')
+    DailySalesRollup = apps.get_model('frontend', 'DailySalesRollup')
+
+    days = {}
+    for row in Sale.objects.filter(status='completed').values('user_id', day=TruncDate('sale_date')).annotate(
+        revenue=Sum('total'), profit=Sum('profit'), sales_count=Count('id'),
+    ).order_by():
+        days[row.pop('user_id'), row.pop('day')] = row
+    for row in Customer.objects.values('user_id', day=TruncDate('created_at')).annotate(
+        new_customers=Count('id'),
+    ).order_by():
+        days.setdefault((row['user_id'], row['day']), {})['new_customers'] = row['new_customers']
+
+    DailySalesRollup.objects.bulk_create([
+        DailySalesRollup(user_id=user_id, date=day, **values) for (user_id, day), values in days.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0015_demand_forecasts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Sana')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Daromad')),
+                ('profit', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Foyda')),
+                ('sales_count', models.IntegerField(default=0, verbose_name='Sotuvlar soni')),
+                ('new_customers', models.IntegerField(default=0, verbose_name='Yangi mijozlar')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Kunlik yakun',
+                'verbose_name_plural': 'Kunlik yakunlar',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='daily_rollup_user_date')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 # models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Sum, F, Q, Count
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 import uuid
@@ -25,6 +27,10 @@ class Category(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="categories")
     parent = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, 
                                related_name="subcategories", verbose_name="Ota kategoriya")
+    
+    # Daraxt indeksi (materialized path): ildizdan o'zigacha id'lar, masalan "<id1>/<id2>/"
+    path = models.CharField(max_length=1000, blank=True, default='', db_index=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Kategoriya"
@@ -46,7 +52,51 @@ class Category(models.Model):
         if not self.color:
             self.color = self.get_default_color()
         
-        super().save(*args, **kwargs)
+        # Daraxtdagi o'rnini yangilash (ko'chirilganda butun shox bitta UPDATE bilan)
+        old_path = None
+        if not self._state.adding:
+            old_path = Category.objects.filter(pk=self.pk).values_list('path', flat=True).first()
+        parent_path = self.parent.path if self.parent_id else ''
+        if old_path and parent_path.startswith(old_path):
+            raise ValidationError("Kategoriyani o'zining ichiga ko'chirib bo'lmaydi!")
+        self.path = f"{parent_path}{self.pk.hex}/"
+        self.depth = self.path.count('/') - 1
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_path and old_path != self.path:
+                self.move_descendants(old_path, self.path)
+    
+    @classmethod
+    def move_descendants(cls, old_path, new_path):
+        """old_path ostidagi barcha kategoriyalarni new_path ostiga ko'chirish (bitta UPDATE)"""
+        from django.db.models import Value
+        from django.db.models.functions import Concat, Substr
+        
+        shift = new_path.count('/') - old_path.count('/')
+        return cls.objects.filter(path__startswith=old_path).exclude(path=old_path).update(
+            path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+            depth=F('depth') + shift,
+        )
+    
+    @classmethod
+    def rebuild_paths(cls, queryset=None):
+        """Barcha yo'llarni parent bo'yicha qayta qurish (bulk_create'dan keyin yoki tuzatish uchun)"""
+        queryset = cls.objects.all() if queryset is None else queryset
+        parents = dict(queryset.values_list('id', 'parent_id'))
+        paths = {}
+        
+        def build(pk):
+            if pk not in paths:
+                parent_id = parents.get(pk)
+                paths[pk] = (build(parent_id) if parent_id in parents else '') + f"{pk.hex}/"
+            return paths[pk]
+        
+        categories = [
+            cls(id=pk, path=build(pk), depth=build(pk).count('/') - 1) for pk in parents
+        ]
+        cls.objects.bulk_update(categories, ['path', 'depth'], batch_size=1000)
+        return len(categories)
     
     def get_default_icon(self):
         """Kategoriya turiga qarab default ikon"""
@@ -97,24 +147,68 @@ class Category(models.Model):
         self.total_value = sum(p.total_value for p in products if p.total_value)
         self.save()
     
+    @classmethod
+    def with_tree_flags(cls, queryset=None):
+        """has_subcategories/has_products uchun bayroqlar (ro'yxatda har kategoriya uchun so'rov bo'lmasligi uchun)"""
+        from django.db.models import Exists, OuterRef
+        
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.annotate(
+            subcategories_exist=Exists(cls.objects.filter(parent=OuterRef('pk'))),
+            products_exist=Exists(Product.objects.filter(category=OuterRef('pk'))),
+        )
+    
     @property
     def has_subcategories(self):
         """Subkategoriyalari bormi?"""
+        if hasattr(self, 'subcategories_exist'):
+            return self.subcategories_exist
         return self.subcategories.exists()
     
     @property
     def has_products(self):
         """Mahsulotlari bormi?"""
+        if hasattr(self, 'products_exist'):
+            return self.products_exist
         return self.products.exists()
     
+    @property
+    def ancestor_ids(self):
+        """Ildizdan ota kategoriyagacha id'lar (yo'ldan, so'rovsiz)"""
+        return [uuid.UUID(part) for part in self.path.split('/')[:-2]]
+    
+    def get_ancestors(self):
+        """Ota kategoriyalar (bitta so'rov, ildizdan boshlab)"""
+        return Category.objects.filter(id__in=self.ancestor_ids).order_by('depth')
+    
+    def get_descendants(self, include_self=False):
+        """Butun shox (bitta so'rov)"""
+        descendants = Category.objects.filter(path__startswith=self.path)
+        return descendants if include_self else descendants.exclude(pk=self.pk)
+    
     def get_full_path(self):
         """Kategoriya to'liq yo'li"""
-        path = [self.name]
-        parent = self.parent
-        while parent:
-            path.insert(0, parent.name)
-            parent = parent.parent
+        path = [ancestor.name for ancestor in self.get_ancestors().only('name', 'depth')]
+        path.append(self.name)
         return " → ".join(path)
+    
+    @staticmethod
+    def rollup(categories, values):
+        """
+        Qiymatlarni shox bo'yicha yig'ish: har bir kategoriya o'zining va
+        barcha ichki kategoriyalarining yig'indisini oladi.
+        values: {category_id: {ko'rsatkich: qiymat}}
+        Qaytaradi: {category_id: {ko'rsatkich: yig'indi}}
+        """
+        by_hex = {category.pk.hex: category.pk for category in categories}
+        totals = {category.pk: {} for category in categories}
+        for category in categories:
+            for key, value in values.get(category.pk, {}).items():
+                for part in category.path.split('/')[:-1]:
+                    target = totals.get(by_hex.get(part))
+                    if target is not None:
+                        target[key] = target.get(key, 0) + value
+        return totals
 
 
 class Customer(models.Model):
@@ -125,6 +219,20 @@ class Customer(models.Model):
         ('other', 'Boshqa'),
     ]
     
+    SEGMENT_CHOICES = [
+        ('champions', 'Chempionlar'),
+        ('loyal', 'Sodiq mijozlar'),
+        ('potential_loyalist', "Sodiq bo'lishi mumkin"),
+        ('new', 'Yangi mijozlar'),
+        ('promising', 'Istiqbolli'),
+        ('need_attention', "E'tibor kerak"),
+        ('about_to_sleep', 'Uxlash arafasida'),
+        ('at_risk', 'Xavf ostida'),
+        ('cant_lose', "Yo'qotib bo'lmaydi"),
+        ('hibernating', 'Uyquda'),
+        ('lost', "Yo'qotilgan"),
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     first_name = models.CharField(max_length=100, verbose_name="Ism")
     last_name = models.CharField(max_length=100, verbose_name="Familiya")
@@ -153,6 +261,13 @@ class Customer(models.Model):
     total_spent = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Jami sarflangan")
     last_purchase = models.DateTimeField(blank=True, null=True, verbose_name="Oxirgi xarid")
     
+    # RFM segmentatsiyasi (segment_customers buyrug'i bilan hisoblanadi, 1-5 ballar)
+    rfm_recency = models.PositiveSmallIntegerField(default=0, verbose_name="R (yaqinlik)")
+    rfm_frequency = models.PositiveSmallIntegerField(default=0, verbose_name="F (chastota)")
+    rfm_monetary = models.PositiveSmallIntegerField(default=0, verbose_name="M (summa)")
+    segment = models.CharField(max_length=20, choices=SEGMENT_CHOICES, blank=True, default='', verbose_name="Segment")
+    segmented_at = models.DateTimeField(blank=True, null=True, verbose_name="Segment hisoblangan vaqt")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -168,6 +283,9 @@ class Customer(models.Model):
             models.Index(fields=['phone']),
             models.Index(fields=['first_name', 'last_name']),
             models.Index(fields=['customer_type']),
+            # Kassa delta sinxronlashi: shu vaqtdan keyin o'zgarganlar
+            models.Index(fields=['user', 'updated_at']),
+            models.Index(fields=['user', 'segment']),
         ]
 
     def __str__(self):
@@ -189,7 +307,7 @@ class Customer(models.Model):
         """Mijoz statistikasini yangilash"""
         from .models import Sale, Debt
         sales = Sale.objects.filter(customer=self)
-        debts = Debt.objects.filter(customer=self, status__in=['pending', 'partially_paid'])
+        debts = Debt.objects.filter(customer=self, status__in=Debt.OPEN_STATUSES)
         
         self.total_purchases = sales.count()
         self.total_spent = sales.aggregate(total=Sum('total'))['total'] or 0
@@ -207,14 +325,62 @@ class Customer(models.Model):
     def total_debt(self):
         """Jami qarzi"""
         from .models import Debt
-        debts = Debt.objects.filter(customer=self, status__in=['pending', 'partially_paid'])
+        debts = Debt.objects.filter(customer=self, status__in=Debt.OPEN_STATUSES)
         return debts.aggregate(total=Sum(F('amount') - F('paid_amount')))['total'] or 0
     
     @property
     def debt_count(self):
         """Qarzlar soni"""
         from .models import Debt
-        return Debt.objects.filter(customer=self, status__in=['pending', 'partially_paid']).count()
+        return Debt.objects.filter(customer=self, status__in=Debt.OPEN_STATUSES).count()
+    
+    @classmethod
+    def compute_segments(cls, user, now=None, batch_size=5000):
+        """
+        Tenant mijozlari uchun RFM segmentlari: (oxirgi xarid, soni, summasi) bitta GROUP BY
+        so'rovi bilan olinadi va ballar NumPy bilan hisoblanadi. Yozish bir xil (R, F, M)
+        guruhlari bo'yicha UPDATE ... WHERE id IN (...) bilan (ko'pi bilan 125 guruh) -
+        bulk_update'ning qator boshiga CASE WHEN ifodasi million qatorda juda sekin.
+        Xaridi yo'q mijozlarning segmenti tozalanadi. Qaytaradi: segmentlangan mijozlar soni.
+        """
+        import numpy as np
+        from django.db.models import Max
+        from .segmentation import rfm_segments
+        
+        now = now or timezone.now()
+        rows = Sale.objects.filter(user=user, customer__isnull=False, status='completed').values(
+            'customer_id'
+        ).annotate(last=Max('sale_date'), count=Count('id'), total=Sum('total')).order_by().values_list(
+            'customer_id', 'last', 'count', 'total'
+        )
+        
+        ids, last, count, total = [], [], [], []
+        for customer_id, last_sale, sale_count, sale_total in rows.iterator(chunk_size=10000):
+            ids.append(customer_id)
+            last.append(last_sale.timestamp())
+            count.append(sale_count)
+            total.append(sale_total or 0)
+        
+        with transaction.atomic():
+            if ids:
+                recency_days = (now.timestamp() - np.array(last)) / 86400
+                r, f, m, segments = rfm_segments(recency_days, np.array(count), np.array(total, dtype=float))
+                groups, inverse = np.unique(r.astype(np.int16) * 100 + f * 10 + m, return_inverse=True)
+                order = np.argsort(inverse, kind='stable')
+                ids = np.array(ids, dtype=object)[order]
+                bounds = np.searchsorted(inverse[order], np.arange(len(groups) + 1))
+                for g in range(len(groups)):
+                    first = order[bounds[g]]
+                    values = dict(rfm_recency=int(r[first]), rfm_frequency=int(f[first]), rfm_monetary=int(m[first]),
+                                  segment=str(segments[first]), segmented_at=now)
+                    for start in range(bounds[g], bounds[g + 1], batch_size):
+                        cls.objects.filter(pk__in=ids[start:min(start + batch_size, bounds[g + 1])].tolist()).update(**values)
+            
+            # Bu hisobda qatnashmaganlar (xaridi yo'q yoki hammasi qaytarilgan)
+            cls.objects.filter(user=user).filter(Q(segmented_at__isnull=True) | Q(segmented_at__lt=now)).exclude(
+                segment='', segmented_at__isnull=False
+            ).update(rfm_recency=0, rfm_frequency=0, rfm_monetary=0, segment='', segmented_at=now)
+        return len(ids)
     
     def get_loyalty_level(self):
         """Sodiqlik darajasi"""
@@ -253,6 +419,18 @@ class Product(models.Model):
         ('out_of_stock', 'Tugagan'),
     ]
     
+    ABC_CHOICES = [
+        ('A', 'A - asosiy daromad'),
+        ('B', "B - o'rtacha daromad"),
+        ('C', 'C - kam daromad'),
+    ]
+    
+    XYZ_CHOICES = [
+        ('X', 'X - barqaror talab'),
+        ('Y', "Y - o'zgaruvchan talab"),
+        ('Z', 'Z - tasodifiy talab'),
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
     # Basic info
@@ -268,6 +446,8 @@ class Product(models.Model):
     # Pricing
     purchase_price = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Kirim narxi")
     sale_price = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Sotuv narxi")
+    # Kirimlar bo'yicha o'rtacha tannarx (har bir qabul qilingan kirimda qayta hisoblanadi)
+    avg_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="O'rtacha tannarx")
     
     # Stock
     quantity = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Miqdor")
@@ -276,6 +456,8 @@ class Product(models.Model):
     
     # Images
     image = models.ImageField(upload_to='products/', blank=True, null=True, verbose_name="Rasm")
+    # Tayyor WebP variantlar kengliklari (images.THUMBNAIL_WIDTHS dan)
+    image_variants = models.JSONField(default=list, blank=True, editable=False)
     
     # Description
     description = models.TextField(blank=True, null=True, verbose_name="Tavsif")
@@ -287,6 +469,11 @@ class Product(models.Model):
     total_sold = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Jami sotilgan")
     total_revenue = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Jami daromad")
     
+    # ABC/XYZ tasnifi (classify_products buyrug'i bilan hisoblanadi)
+    abc_class = models.CharField(max_length=1, choices=ABC_CHOICES, blank=True, default='', verbose_name="ABC sinfi")
+    xyz_class = models.CharField(max_length=1, choices=XYZ_CHOICES, blank=True, default='', verbose_name="XYZ sinfi")
+    classified_at = models.DateTimeField(blank=True, null=True, verbose_name="Tasniflangan vaqt")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -303,8 +490,17 @@ class Product(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['category']),
             models.Index(fields=['status']),
+            # Faqat kam qolgan/tugagan mahsulotlar indekslanadi (qisman indeks)
+            models.Index(fields=['user', 'status'], name='product_low_stock_idx',
+                         condition=Q(status__in=['low_stock', 'out_of_stock'])),
+            # Kassa delta sinxronlashi: shu vaqtdan keyin o'zgarganlar
+            models.Index(fields=['user', 'updated_at']),
+            models.Index(fields=['user', 'abc_class', 'xyz_class']),
         ]
 
+    # Zaxirani to'ldirish kerak bo'lgan holatlar
+    LOW_STOCK_STATUSES = ['low_stock', 'out_of_stock']
+
     def __str__(self):
         return f"{self.name} ({self.sku})"
     
@@ -316,14 +512,46 @@ class Product(models.Model):
         if not self.sku:
             self.sku = self.generate_sku()
         
+        # Rasm almashtirilganmi (eski variantlar o'chiriladi, yangilari fonda yaratiladi)
+        previous_image = None
+        if not self._state.adding:
+            previous_image = Product.objects.filter(pk=self.pk).values_list('image', flat=True).first()
+        
         # O'zgarishlarni saqlash
         is_new = self.pk is None
         super().save(*args, **kwargs)
         
+        if (self.image.name or None) != (previous_image or None):
+            from .images import schedule_product_image
+            
+            if self.image_variants:
+                self.image_variants = []
+                Product.objects.filter(pk=self.pk).update(image_variants=[])
+            if self.image:
+                schedule_product_image(self, previous=previous_image)
+        
         # Kategoriya statistikasini yangilash
         if self.category:
             self.category.update_statistics()
     
+    def thumbnail_url(self, width):
+        """Berilgan kenglikka eng yaqin (undan kichik bo'lmagan) variant, bo'lmasa original"""
+        from .images import variant_url
+        
+        if not self.image:
+            return ''
+        if not self.image_variants:
+            return self.image.url
+        fitting = [w for w in sorted(self.image_variants) if w >= width]
+        return variant_url(self.image.name, fitting[0] if fitting else max(self.image_variants))
+    
+    @property
+    def image_srcset(self):
+        """<img srcset> uchun: "url 80w, url 160w, ..." """
+        from .images import variant_url
+        
+        return ', '.join(f"{variant_url(self.image.name, w)} {w}w" for w in sorted(self.image_variants))
+    
     def generate_sku(self):
         """Avtomatik SKU generatsiyasi"""
         prefix = ''.join([word[0].upper() for word in self.name.split()[:3]])
@@ -331,6 +559,8 @@ class Product(models.Model):
     
     def update_status(self):
         """Mahsulot holatini yangilash"""
+        if self.status == 'inactive':
+            return
         if self.quantity <= 0:
             self.status = 'out_of_stock'
         elif self.quantity <= self.min_quantity:
@@ -338,6 +568,97 @@ class Product(models.Model):
         elif self.quantity > self.min_quantity:
             self.status = 'active'
     
+    @classmethod
+    def refresh_statuses(cls, queryset=None):
+        """Holatni miqdorga qarab bitta UPDATE bilan qayta hisoblash (save() chetlab o'tilganda)"""
+        from django.db.models import Case, Value, When
+
+        queryset = cls.objects.all() if queryset is None else queryset
+        status = Case(
+            When(quantity__lte=0, then=Value('out_of_stock')),
+            When(quantity__lte=F('min_quantity'), then=Value('low_stock')),
+            default=Value('active'),
+        )
+        return queryset.exclude(status='inactive').exclude(
+            # Holati allaqachon to'g'ri bo'lgan qatorlar yozilmaydi
+            Q(status='out_of_stock', quantity__lte=0)
+            | Q(status='low_stock', quantity__gt=0, quantity__lte=F('min_quantity'))
+            | Q(status='active', quantity__gt=F('min_quantity'))
+        ).update(status=status)
+
+    @classmethod
+    def classify_abc_xyz(cls, user, weeks=104, now=None, batch_size=5000):
+        """
+        Tenant mahsulotlari uchun ABC (daromad ulushi) va XYZ (haftalik talab barqarorligi).
+        Oxirgi `weeks` ta to'liq hafta sotuvlari bitta GROUP BY (mahsulot, hafta) so'rovi
+        bilan olinib, zich (mahsulotlar x haftalar) NumPy matritsasiga yig'iladi. Natija
+        9 ta (ABC, XYZ) guruhi bo'yicha UPDATE ... WHERE id IN (...) bilan yoziladi.
+        Qaytaradi: tasniflangan mahsulotlar soni.
+        """
+        import numpy as np
+        from datetime import datetime, time, timedelta
+        from django.db.models import FloatField
+        from django.db.models.functions import Cast
+        from .classification import abc_classes, weekly_matrix, xyz_classes
+        
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        # Joriy (tugamagan) hafta hisobga olinmaydi - u talabni sun'iy pasaytiradi
+        end = today - timedelta(days=today.weekday())
+        bounds = [
+            timezone.make_aware(datetime.combine(end - timedelta(weeks=weeks - i), time.min))
+            for i in range(weeks + 1)
+        ]
+        
+        ids = list(cls.objects.filter(user=user).values_list('id', flat=True))
+        position = {pk: i for i, pk in enumerate(ids)}
+        rows = Sale.objects.filter(
+            user=user, status='completed', sale_date__gte=bounds[0], sale_date__lt=bounds[-1],
+        ).values('product_id', week=Sale.period_index(bounds)).annotate(
+            # Decimal emas, float - million qatorda konvertatsiya arzonroq
+            demand=Cast(Sum('quantity'), FloatField()), revenue=Cast(Sum('total'), FloatField()),
+        ).order_by().values_list('product_id', 'week', 'demand', 'revenue')
+        
+        product_index, week_index, demand, revenue = [], [], [], []
+        for product_id, week_number, quantity, total in rows.iterator(chunk_size=20000):
+            product_index.append(position[product_id])
+            week_index.append(week_number)
+            demand.append(quantity)
+            revenue.append(total)
+        
+        matrix = weekly_matrix(product_index, week_index, demand, (len(ids), weeks))
+        revenue = np.bincount(np.asarray(product_index, dtype=np.int64), weights=revenue, minlength=len(ids))
+        abc = abc_classes(revenue)
+        xyz, _ = xyz_classes(matrix)
+        
+        ids = np.array(ids, dtype=object)
+        with transaction.atomic():
+            for abc_class in 'ABC':
+                for xyz_class in 'XYZ':
+                    group = ids[(abc == abc_class) & (xyz == xyz_class)].tolist()
+                    for offset in range(0, len(group), batch_size):
+                        cls.objects.filter(pk__in=group[offset:offset + batch_size]).update(
+                            abc_class=abc_class, xyz_class=xyz_class, classified_at=now)
+        return len(ids)
+
+    @property
+    def unit_cost(self):
+        """Sotuvda ishlatiladigan birlik tannarxi (kirim bo'lmasa - kirim narxi)"""
+        return self.avg_cost or self.purchase_price
+    
+    def receive_cost(self, quantity, price):
+        """
+        Kirimdan keyingi o'rtacha tannarx (harakatlanuvchi o'rtacha).
+        Chaqirilganda self.quantity hali kirimdan oldingi qoldiq bo'lishi kerak.
+        """
+        from decimal import Decimal
+        
+        on_hand = max(self.quantity, Decimal(0))
+        if on_hand + quantity <= 0:
+            return self.unit_cost
+        value = on_hand * self.unit_cost + quantity * price
+        return (value / (on_hand + quantity)).quantize(Decimal('0.01'))
+    
     @property
     def profit(self):
         """Foyda"""
@@ -358,7 +679,7 @@ class Product(models.Model):
     @property
     def is_low_stock(self):
         """Minimal chegara yaqinligi"""
-        return self.quantity <= self.min_quantity
+        return self.status in self.LOW_STOCK_STATUSES
     
     def get_stock_status_color(self):
         """Zapas holati uchun rang"""
@@ -376,6 +697,189 @@ class Product(models.Model):
             raise ValidationError("Miqdor manfiy bo'lishi mumkin emas!")
 
 
+class ReorderPoint(models.Model):
+    """Mahsulot uchun buyurtma nuqtasi va tugash prognozi (har kecha hisoblanadi)"""
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True,
+                                   related_name="reorder", verbose_name="Mahsulot")
+
+    avg_daily_sales = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Kunlik o'rtacha sotuv")
+    days_until_stockout = models.DecimalField(max_digits=10, decimal_places=1, blank=True, null=True,
+                                              verbose_name="Tugashigacha kunlar")
+    reorder_point = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Buyurtma nuqtasi")
+    suggested_quantity = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Tavsiya etilgan miqdor")
+    window_days = models.IntegerField(default=28, verbose_name="Tahlil davri (kun)")
+    computed_at = models.DateTimeField(auto_now=True, verbose_name="Hisoblangan vaqt")
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reorder_points")
+
+    class Meta:
+        verbose_name = "Buyurtma nuqtasi"
+        verbose_name_plural = "Buyurtma nuqtalari"
+        ordering = ['days_until_stockout']
+        indexes = [
+            models.Index(fields=['user', 'days_until_stockout']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.days_until_stockout} kun"
+
+    @property
+    def needs_reorder(self):
+        return self.product.quantity <= self.reorder_point
+
+    # Prognoz xatosi (MAE) bo'yicha xavfsizlik zaxirasi: ~95% xizmat darajasi, sigma ~ 1.25 * MAE
+    SAFETY_FACTOR = 1.65 * 1.25
+    # Shundan eski prognoz ishlatilmaydi (forecast_demand ishlamay qolgan bo'lsa - sotuv tezligi)
+    FORECAST_MAX_AGE_DAYS = 2
+
+    @classmethod
+    def rebuild(cls, user, window_days=28, lead_time_days=7, cover_days=14, now=None):
+        """
+        Tenant mahsulotlari uchun sotuv tezligini bitta GROUP BY so'rovi bilan olish va
+        buyurtma nuqtasi / tugash muddatini hisoblash. Yangi DemandForecast bo'lsa, talab
+        tekis tezlik o'rniga kunlik prognozdan olinadi va prognoz xatosiga qarab
+        xavfsizlik zaxirasi qo'shiladi.
+        """
+        import math
+        from datetime import timedelta
+        from decimal import Decimal
+
+        now = now or timezone.now()
+        since = now - timedelta(days=window_days)
+        fresh = now - timedelta(days=cls.FORECAST_MAX_AGE_DAYS)
+        rows = Product.objects.filter(user=user).exclude(status='inactive').annotate(
+            sold=Sum('sales__quantity', filter=Q(sales__sale_date__gte=since, sales__status='completed'), default=0)
+        ).values_list('id', 'quantity', 'min_quantity', 'sold',
+                      'forecast__daily', 'forecast__mae', 'forecast__computed_at')
+
+        records = []
+        for product_id, quantity, min_quantity, sold, daily, mae, forecast_at in rows.iterator(chunk_size=2000):
+            if daily and forecast_at >= fresh:
+                lead_demand = DemandForecast.demand_over(daily, lead_time_days)
+                safety = cls.SAFETY_FACTOR * float(mae) * math.sqrt(lead_time_days)
+                velocity = Decimal(DemandForecast.demand_over(daily, lead_time_days + cover_days) / (lead_time_days + cover_days))
+                reorder_point = max(Decimal(lead_demand + safety), min_quantity)
+                target = Decimal(DemandForecast.demand_over(daily, lead_time_days + cover_days) + safety)
+            else:
+                velocity = Decimal(sold) / window_days
+                reorder_point = max(velocity * lead_time_days, min_quantity)
+                target = velocity * (lead_time_days + cover_days)
+            records.append(cls(
+                product_id=product_id,
+                user=user,
+                avg_daily_sales=velocity.quantize(Decimal('0.001')),
+                days_until_stockout=(max(quantity, Decimal(0)) / velocity).quantize(Decimal('0.1')) if velocity else None,
+                reorder_point=reorder_point.quantize(Decimal('0.001')),
+                suggested_quantity=max(target - quantity, Decimal(0)).quantize(Decimal('0.001')) if quantity <= reorder_point else 0,
+                window_days=window_days,
+                computed_at=now,
+            ))
+
+        fields = ['avg_daily_sales', 'days_until_stockout', 'reorder_point', 'suggested_quantity', 'window_days', 'computed_at']
+        cls.objects.bulk_create(records, batch_size=1000, update_conflicts=True,
+                                unique_fields=['product'], update_fields=fields)
+        return len(records)
+
+
+class DemandForecast(models.Model):
+    """Mahsulot talabi prognozi: bugundan boshlab kunlik miqdorlar (har kecha hisoblanadi)"""
+    METHOD_CHOICES = [
+        ('ses', 'Eksponensial tekislash'),
+        ('seasonal_naive', 'Haftalik mavsumiy'),
+        ('none', "Sotuv yo'q"),
+    ]
+
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True,
+                                   related_name="forecast", verbose_name="Mahsulot")
+
+    method = models.CharField(max_length=20, choices=METHOD_CHOICES, verbose_name="Usul")
+    daily = models.JSONField(default=list, verbose_name="Kunlik prognoz")
+    horizon_total = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="Davr bo'yicha jami")
+    mae = models.DecimalField(max_digits=12, decimal_places=3, default=0, verbose_name="O'rtacha xato (MAE)")
+    history_days = models.IntegerField(default=84, verbose_name="Tarix (kun)")
+    computed_at = models.DateTimeField(verbose_name="Hisoblangan vaqt")
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="demand_forecasts")
+
+    class Meta:
+        verbose_name = "Talab prognozi"
+        verbose_name_plural = "Talab prognozlari"
+        indexes = [
+            models.Index(fields=['user', 'computed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.horizon_total} ({self.get_method_display()})"
+
+    @staticmethod
+    def demand_over(daily, days):
+        """Birinchi `days` kun talabi; prognoz qisqaroq bo'lsa oxirgi hafta o'rtachasi bilan davom etadi"""
+        total = sum(daily[:days])
+        if days > len(daily):
+            tail = daily[-7:]
+            total += (days - len(daily)) * sum(tail) / len(tail)
+        return total
+
+    @classmethod
+    def rebuild(cls, user, history_days=84, horizon_days=28, now=None):
+        """
+        Tenant mahsulotlari uchun talab prognozi. Oxirgi `history_days` to'liq kun sotuvlari
+        bitta GROUP BY (mahsulot, kun) so'rovi bilan olinadi, barcha mahsulotlar bitta
+        NumPy matritsasida birga prognoz qilinadi (frontend/forecasting.py).
+        Qaytaradi: prognoz yozilgan mahsulotlar soni.
+        """
+        from datetime import datetime, time, timedelta
+        from decimal import Decimal
+        from django.db.models import FloatField
+        from django.db.models.functions import Cast
+        from .forecasting import daily_matrix, forecast
+
+        now = now or timezone.now()
+        # Bugungi (tugamagan) kun tarixga kirmaydi - prognoz bugundan boshlanadi
+        today = timezone.localdate(now)
+        bounds = [
+            timezone.make_aware(datetime.combine(today - timedelta(days=history_days - i), time.min))
+            for i in range(history_days + 1)
+        ]
+
+        ids = list(Product.objects.filter(user=user).exclude(status='inactive').values_list('id', flat=True))
+        position = {pk: i for i, pk in enumerate(ids)}
+        rows = Sale.objects.filter(
+            user=user, status='completed', sale_date__gte=bounds[0], sale_date__lt=bounds[-1],
+        ).exclude(product__status='inactive').values('product_id', day=Sale.period_index(bounds)).annotate(
+            demand=Cast(Sum('quantity'), FloatField()),
+        ).order_by().values_list('product_id', 'day', 'demand')
+
+        product_index, day_index, demand = [], [], []
+        for product_id, day, quantity in rows.iterator(chunk_size=20000):
+            product_index.append(position[product_id])
+            day_index.append(day)
+            demand.append(quantity)
+
+        if not ids:
+            return 0
+        history = daily_matrix(product_index, day_index, demand, (len(ids), history_days))
+        result, methods, mae = forecast(history, horizon_days)
+
+        records = [cls(
+            product_id=product_id,
+            user=user,
+            method=methods[i],
+            daily=[round(value, 3) for value in result[i].tolist()],
+            horizon_total=Decimal(float(result[i].sum())).quantize(Decimal('0.001')),
+            mae=Decimal(float(mae[i])).quantize(Decimal('0.001')),
+            history_days=history_days,
+            computed_at=now,
+        ) for i, product_id in enumerate(ids)]
+
+        fields = ['method', 'daily', 'horizon_total', 'mae', 'history_days', 'computed_at']
+        cls.objects.bulk_create(records, batch_size=1000, update_conflicts=True,
+                                unique_fields=['product'], update_fields=fields)
+        return len(records)
+
+
 class Sale(models.Model):
     """Sotuvlar modeli"""
     PAYMENT_METHODS = [
@@ -404,6 +908,10 @@ class Sale(models.Model):
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name="Chegirma")
     tax = models.DecimalField(max_digits=10, decimal_places=2, default=0, verbose_name="Soliq")
     
+    # Tannarx sotuv paytida yoziladi - foyda hisobotlari mahsulot jadvaliga qo'shilmaydi
+    cost = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Tannarx")
+    profit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Foyda")
+    
     # Status
     status = models.CharField(max_length=20, choices=[
         ('pending', 'Kutilmoqda'),
@@ -438,6 +946,8 @@ class Sale(models.Model):
         return f"Sotuv #{self.invoice_number or self.id}" if self.invoice_number else f"Sotuv {self.id}"
     
     def save(self, *args, **kwargs):
+        from decimal import Decimal
+        
         # Jami summani hisoblash
         self.total = (self.quantity * self.price) - self.discount + self.tax
         
@@ -445,18 +955,249 @@ class Sale(models.Model):
         if not self.invoice_number:
             self.invoice_number = self.generate_invoice_number()
         
-        super().save(*args, **kwargs)
-        
-        # Mahsulot miqdorini yangilash
-        self.product.quantity -= self.quantity
-        self.product.total_sold += self.quantity
-        self.product.total_revenue += self.total
-        self.product.save()
+        if not self._state.adding:
+            # Qayta saqlash (izoh, to'lov usuli) qoldiq va jurnalga tegmaydi - ular sotuv
+            # yaratilganda bir marta yoziladi, qaytarish esa faqat refund() orqali
+            self.profit = self.price * self.quantity - self.cost
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic():
+                product = Product.objects.select_for_update().get(pk=self.product_id)
+                
+                # Tannarx sotuv yaratilganda joriy o'rtacha tannarx bo'yicha belgilanadi
+                self.cost = (product.unit_cost * self.quantity).quantize(Decimal('0.01'))
+                self.profit = self.price * self.quantity - self.cost
+                
+                super().save(*args, **kwargs)
+                
+                # Mahsulot miqdorini yangilash
+                product.quantity -= self.quantity
+                product.total_sold += self.quantity
+                product.total_revenue += self.total
+                product.save()
+                self.product = product
+                StockMovement.record(product, 'sale', -self.quantity, sale=self)
         
         # Mijoz statistikasini yangilash
         if self.customer:
             self.customer.update_statistics()
     
+    def refund(self, note=None):
+        """
+        Sotuvni qaytarish: mahsulot omborga qaytadi, harakat jurnalga yoziladi.
+        Sotuv va mahsulot qulflab qayta o'qiladi - parallel qaytarishlardan faqat bittasi
+        omborga qo'shadi. Qaytaradi: True - qaytarildi, False - allaqachon qaytarilgan.
+        """
+        from .signals import publish_sale_refund
+        
+        with transaction.atomic():
+            sale = Sale.objects.select_for_update().get(pk=self.pk)
+            if sale.status == 'refunded':
+                self.status = sale.status
+                return False
+            product = Product.objects.select_for_update().get(pk=sale.product_id)
+            
+            # save() chaqirilmaydi - update() signal yubormaydi, shuning uchun yakun,
+            # versiya va KPI hodisasi publish_sale_refund orqali
+            Sale.objects.filter(pk=sale.pk).update(status='refunded', updated_at=timezone.now())
+            sale.status = self.status = 'refunded'
+            product.quantity += sale.quantity
+            product.total_sold -= sale.quantity
+            product.total_revenue -= sale.total
+            product.save()
+            self.product = product
+            StockMovement.record(product, 'return', sale.quantity, sale=sale, note=note)
+            publish_sale_refund(sale)
+        return True
+    
+    @staticmethod
+    def period_index(bounds):
+        """
+        sale_date qaysi oraliqqa tushishi: bounds[i] <= sale_date < bounds[i + 1] bo'lsa i.
+        Kun/hafta raqami Extract*/Trunc* bilan emas, CASE bilan olinadi - ular SQLite'da har
+        bir qator uchun Python funksiyasini chaqiradi, CASE esa istalgan bazada SQL ichida.
+        So'rov sale_date >= bounds[0] bilan filtrlangan bo'lishi kerak.
+        """
+        from django.db.models import Case, IntegerField, Value, When
+        
+        return Case(
+            *[When(sale_date__gte=bounds[i], then=Value(i)) for i in range(len(bounds) - 2, 0, -1)],
+            default=Value(0), output_field=IntegerField(),
+        )
+    
+    @classmethod
+    def heatmap(cls, user, start, end):
+        """
+        Hafta kuni x soat bo'yicha sotuvlar soni va summasi, bitta GROUP BY bilan.
+        Soat va kun TIME_ZONE (Asia/Tashkent) mahalliy vaqtida olinadi; start va end -
+        sanalar (ikkalasi ham kiradi). Qaytaradi: {'count': 7x24, 'revenue': 7x24},
+        qatorlar Dushanbadan boshlanadi.
+        """
+        from datetime import datetime, time, timedelta
+        from django.db.models.functions import ExtractHour, ExtractWeekDay
+        
+        tz = timezone.get_default_timezone()
+        rows = cls.objects.filter(
+            user=user, status='completed',
+            sale_date__gte=timezone.make_aware(datetime.combine(start, time.min), tz),
+            sale_date__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+        ).values(
+            weekday=ExtractWeekDay('sale_date', tzinfo=tz), hour=ExtractHour('sale_date', tzinfo=tz),
+        ).annotate(count=Count('id'), revenue=Sum('total')).order_by()
+        
+        count = [[0] * 24 for _ in range(7)]
+        revenue = [[0.0] * 24 for _ in range(7)]
+        for row in rows:
+            # ExtractWeekDay: 1 - Yakshanba ... 7 - Shanba
+            day = (row['weekday'] + 5) % 7
+            count[day][row['hour']] = row['count']
+            revenue[day][row['hour']] = float(row['revenue'])
+        return {'count': count, 'revenue': revenue}
+    
+    @classmethod
+    def ingest_offline(cls, user, rows):
+        """
+        Oflayn kassadan kelgan sotuvlarni bitta tranzaksiyada qabul qilish.
+        rows: [{'id', 'product_id', 'quantity', 'price', 'discount'?, 'payment_method'?,
+                'customer_id'?, 'sold_at'?}, ...]
+        Sotuv id'si klientda yaratiladi - qayta yuborilgan sotuv 'duplicate' bo'ladi.
+        Ombor yetmasa ham sotuv yoziladi (mol allaqachon berilgan), lekin ziddiyat qaytariladi.
+        Qaytaradi: (natijalar [{'id', 'status', 'message'?}], ziddiyatlar)
+        """
+        from django.db import IntegrityError
+
+        try:
+            return cls._ingest_offline(user, rows)
+        except IntegrityError:
+            # Parallel paket shu id'ni birinchi yozdi - qayta urinishda u 'duplicate' bo'ladi
+            return cls._ingest_offline(user, rows)
+
+    @classmethod
+    def _ingest_offline(cls, user, rows):
+        from collections import defaultdict
+        from datetime import timedelta
+        from decimal import Decimal
+        from django.db.models import Case, DateTimeField, DecimalField, Value, When
+
+        results = []
+        conflicts = []
+        now = timezone.now()
+
+        with transaction.atomic():
+            products = {
+                product.pk: product
+                for product in Product.objects.select_for_update().filter(
+                    user=user, pk__in={row['product_id'] for row in rows}).order_by('pk')
+            }
+            # Qulflardan keyin: shu mahsulotlarga parallel paket yozgan sotuvlar ham ko'rinadi
+            ids = [row['id'] for row in rows]
+            existing = set(cls.objects.filter(user=user, pk__in=ids).values_list('id', flat=True))
+            # Boshqa foydalanuvchida band id - qayta yozib bo'lmaydi, klient navbatidan o'chadi
+            taken = set(cls.objects.filter(pk__in=ids).exclude(user=user).values_list('id', flat=True))
+            customers = set(Customer.objects.filter(
+                user=user, pk__in={row['customer_id'] for row in rows if row.get('customer_id')}
+            ).values_list('id', flat=True))
+            initial = {pk: product.quantity for pk, product in products.items()}
+
+            sales, debts, sold_at, seen = [], [], {}, set()
+            shortfalls = defaultdict(list)
+            for row in rows:
+                if row['id'] in existing or row['id'] in seen:
+                    results.append({'id': row['id'], 'status': 'duplicate'})
+                    continue
+                if row['id'] in taken:
+                    results.append({'id': row['id'], 'status': 'duplicate', 'message': "Sotuv id band"})
+                    continue
+                product = products.get(row['product_id'])
+                customer_id = row.get('customer_id')
+                payment_method = row.get('payment_method') or 'cash'
+                if product is None:
+                    results.append({'id': row['id'], 'status': 'rejected', 'message': "Mahsulot topilmadi"})
+                    continue
+                if customer_id and customer_id not in customers:
+                    results.append({'id': row['id'], 'status': 'rejected', 'message': "Mijoz topilmadi"})
+                    continue
+                if payment_method == 'credit' and not customer_id:
+                    results.append({'id': row['id'], 'status': 'rejected', 'message': "Nasiya uchun mijoz kerak"})
+                    continue
+                seen.add(row['id'])
+
+                quantity, price = row['quantity'], row['price']
+                discount = row.get('discount') or Decimal(0)
+                total = quantity * price - discount
+                cost = (product.unit_cost * quantity).quantize(Decimal('0.01'))
+                if product.quantity < quantity:
+                    shortfalls[product.pk].append(row['id'])
+                product.quantity -= quantity
+                product.total_sold += quantity
+                product.total_revenue += total
+
+                sale = cls(
+                    id=row['id'], product=product, customer_id=customer_id, user=user,
+                    quantity=quantity, price=price, discount=discount, total=total,
+                    cost=cost, profit=price * quantity - cost, payment_method=payment_method,
+                    paid_amount=0 if payment_method == 'credit' else total,
+                    invoice_number=f"POS-{now:%Y%m%d}-{row['id'].hex[:8].upper()}",
+                )
+                sales.append(sale)
+                # Klient vaqti kelajakda bo'lishi mumkin emas
+                sold_at[sale.pk] = min(row.get('sold_at') or now, now)
+                if payment_method == 'credit':
+                    debts.append(Debt(
+                        customer_id=customer_id, sale=sale, amount=total, user=user, status='pending',
+                        due_date=sold_at[sale.pk].date() + timedelta(days=30),
+                    ))
+                results.append({'id': row['id'], 'status': 'created'})
+
+            if sales:
+                cls.objects.bulk_create(sales)
+                # sale_date auto_now_add - sotilgan vaqtni bitta UPDATE bilan tiklash
+                cls.objects.filter(pk__in=sold_at).update(sale_date=Case(
+                    *[When(pk=pk, then=Value(value)) for pk, value in sold_at.items()],
+                    output_field=DateTimeField(),
+                ))
+                Debt.objects.bulk_create(debts)
+
+                touched = {sale.product_id for sale in sales}
+                decimal = DecimalField(max_digits=15, decimal_places=3)
+                Product.objects.filter(pk__in=touched).update(
+                    quantity=Case(*[When(pk=pk, then=Value(products[pk].quantity)) for pk in touched], output_field=decimal),
+                    total_sold=Case(*[When(pk=pk, then=Value(products[pk].total_sold)) for pk in touched], output_field=decimal),
+                    total_revenue=Case(*[When(pk=pk, then=Value(products[pk].total_revenue)) for pk in touched], output_field=decimal),
+                    updated_at=now,
+                )
+                Product.refresh_statuses(Product.objects.filter(pk__in=touched))
+
+                # Jurnal: har bir sotuvdan keyingi qoldiq bilan (ketma-ket)
+                balances = {pk: products[pk].quantity + sum(s.quantity for s in sales if s.product_id == pk)
+                            for pk in touched}
+                movements = []
+                for sale in sales:
+                    balances[sale.product_id] -= sale.quantity
+                    movements.append(StockMovement(
+                        product_id=sale.product_id, user=user, kind='sale', quantity=-sale.quantity,
+                        balance_after=balances[sale.product_id], sale=sale,
+                    ))
+                StockMovement.objects.bulk_create(movements)
+
+                credit_customers = {debt.customer_id for debt in debts}
+                for customer in Customer.objects.filter(pk__in={s.customer_id for s in sales if s.customer_id}):
+                    customer.update_statistics()
+                    if customer.pk in credit_customers:
+                        DebtAging.refresh_customer(customer)
+
+            for product_id, sale_ids in shortfalls.items():
+                conflicts.append({
+                    'product_id': product_id,
+                    'name': products[product_id].name,
+                    'available': initial[product_id],
+                    'requested': sum(sale.quantity for sale in sales if sale.product_id == product_id),
+                    'quantity_after': products[product_id].quantity,
+                    'sale_ids': sale_ids,
+                })
+
+        return results, conflicts
+    
     def generate_invoice_number(self):
         """Avtomatik faktura raqami"""
         from datetime import datetime
@@ -464,11 +1205,6 @@ class Sale(models.Model):
         count = Sale.objects.filter(sale_date__date=datetime.now().date()).count() + 1
         return f"INV-{date_str}-{count:04d}"
     
-    @property
-    def profit(self):
-        """Sotuvdan foyda"""
-        return (self.price - self.product.purchase_price) * self.quantity
-    
     @property
     def is_paid(self):
         """To'langanmi?"""
@@ -494,6 +1230,9 @@ class Purchase(models.Model):
     price = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Narx")
     total = models.DecimalField(max_digits=15, decimal_places=2, verbose_name="Jami summa")
     
+    receipt = models.ForeignKey('GoodsReceipt', on_delete=models.CASCADE, null=True, blank=True,
+                                related_name="lines", verbose_name="Yuk xati")
+    
     # Additional info
     invoice_number = models.CharField(max_length=50, blank=True, null=True, verbose_name="Faktura raqami")
     delivery_date = models.DateField(blank=True, null=True, verbose_name="Yetkazib berish sanasi")
@@ -505,6 +1244,9 @@ class Purchase(models.Model):
         ('received', 'Qabul qilingan'),
         ('cancelled', 'Bekor qilingan'),
     ], default='received', verbose_name="Holati")
+    # Omborga allaqachon qo'shilgan miqdor (qayta saqlashda ikki marta qo'shilmasligi uchun)
+    applied_quantity = models.DecimalField(max_digits=12, decimal_places=3, default=0, editable=False,
+                                           verbose_name="Omborga qo'shilgan miqdor")
     
     # Notes
     notes = models.TextField(blank=True, null=True, verbose_name="Izohlar")
@@ -533,12 +1275,23 @@ class Purchase(models.Model):
         # Jami summani hisoblash
         self.total = self.quantity * self.price
         
-        # Mahsulot miqdorini yangilash
-        if self.status == 'received':
-            self.product.quantity += self.quantity
-            self.product.save()
+        # Omborda bo'lishi kerak bo'lgan miqdor bilan allaqachon qo'shilgani orasidagi farq
+        target = self.quantity if self.status == 'received' else 0
+        delta = target - self.applied_quantity
+        self.applied_quantity = target
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            # Mahsulot miqdorini faqat farq bo'yicha yangilash
+            if delta:
+                product = Product.objects.select_for_update().get(pk=self.product_id)
+                if delta > 0:
+                    product.avg_cost = product.receive_cost(delta, self.price)
+                product.quantity += delta
+                product.save()
+                self.product = product
+                StockMovement.record(product, 'purchase', delta, purchase=self)
     
     @property
     def unit_price(self):
@@ -546,6 +1299,280 @@ class Purchase(models.Model):
         return self.price / self.quantity if self.quantity else 0
 
 
+class GoodsReceipt(models.Model):
+    """Yetkazib beruvchidan kelgan yuk xati (bir nechta kirim qatori)"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    invoice_number = models.CharField(max_length=50, verbose_name="Faktura raqami")
+    supplier = models.ForeignKey(Customer, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name="receipts", verbose_name="Yetkazib beruvchi")
+    delivery_date = models.DateField(blank=True, null=True, verbose_name="Yetkazib berish sanasi")
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Jami summa")
+    line_count = models.PositiveIntegerField(default=0, verbose_name="Qatorlar soni")
+    notes = models.TextField(blank=True, null=True, verbose_name="Izohlar")
+    received_at = models.DateTimeField(default=timezone.now, verbose_name="Qabul qilingan vaqt")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="goods_receipts")
+
+    class Meta:
+        verbose_name = "Yuk xati"
+        verbose_name_plural = "Yuk xatlari"
+        ordering = ['-received_at']
+        constraints = [
+            # Bir faktura faqat bir marta qabul qilinadi (qayta yuborish omborni ikki barobar oshirmaydi)
+            models.UniqueConstraint(fields=['user', 'invoice_number'], name='unique_receipt_invoice'),
+        ]
+
+    def __str__(self):
+        return f"Yuk xati #{self.invoice_number}"
+
+    @classmethod
+    def receive(cls, user, invoice_number, lines, supplier=None, delivery_date=None, notes=None):
+        """
+        Butun yukni bitta tranzaksiyada qabul qilish.
+        lines: [{'product_id', 'quantity', 'price', 'expiry_date'?}, ...]
+        Ombor bitta UPDATE bilan yangilanadi. Faktura avval qabul qilingan bo'lsa,
+        hech narsa o'zgarmaydi. Qaytaradi: (yuk xati, yangi yaratildimi)
+        """
+        from collections import defaultdict
+        from decimal import Decimal
+        from django.db.models import Case, DecimalField, Value, When
+
+        quantities = defaultdict(Decimal)
+        for line in lines:
+            quantities[line['product_id']] += line['quantity']
+
+        with transaction.atomic():
+            receipt, created = cls.objects.get_or_create(
+                user=user, invoice_number=invoice_number,
+                defaults={
+                    'supplier': supplier,
+                    'delivery_date': delivery_date,
+                    'notes': notes,
+                    'total': sum((line['quantity'] * line['price'] for line in lines), Decimal(0)),
+                    'line_count': len(lines),
+                },
+            )
+            if not created:
+                return receipt, False
+
+            products = {
+                product.pk: product
+                for product in Product.objects.select_for_update().filter(user=user, pk__in=quantities)
+            }
+            missing = [str(pk) for pk in quantities if pk not in products]
+            if missing:
+                # Tranzaksiya bekor qilinadi - yuk xati ham saqlanmaydi
+                raise ValueError(f"Mahsulot topilmadi: {', '.join(missing)}")
+
+            purchases = Purchase.objects.bulk_create([
+                Purchase(
+                    receipt=receipt, product_id=line['product_id'], supplier=supplier,
+                    quantity=line['quantity'], price=line['price'],
+                    total=line['quantity'] * line['price'], applied_quantity=line['quantity'],
+                    invoice_number=invoice_number, delivery_date=delivery_date,
+                    expiry_date=line.get('expiry_date'), status='received', user=user,
+                )
+                for line in lines
+            ])
+
+            # Yangi o'rtacha tannarx (qatorlar ketma-ket qo'llanadi)
+            costs = {}
+            on_hand = {pk: product.quantity for pk, product in products.items()}
+            for line in lines:
+                product = products[line['product_id']]
+                product.quantity = on_hand[product.pk]
+                product.avg_cost = costs.get(product.pk, product.avg_cost)
+                costs[product.pk] = product.receive_cost(line['quantity'], line['price'])
+                on_hand[product.pk] += line['quantity']
+            for pk, product in products.items():
+                product.quantity = on_hand[pk] - quantities[pk]
+
+            # Barcha mahsulotlar qoldig'i va tannarxi bitta UPDATE bilan
+            Product.objects.filter(pk__in=quantities).update(
+                quantity=F('quantity') + Case(
+                    *[When(pk=pk, then=Value(quantity)) for pk, quantity in quantities.items()],
+                    output_field=DecimalField(max_digits=12, decimal_places=3),
+                ),
+                avg_cost=Case(
+                    *[When(pk=pk, then=Value(cost)) for pk, cost in costs.items()],
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                ),
+                updated_at=timezone.now(),
+            )
+            Product.refresh_statuses(Product.objects.filter(pk__in=quantities))
+
+            # Jurnal: har bir qator uchun yangi qoldiq bilan
+            movements = []
+            for purchase in purchases:
+                product = products[purchase.product_id]
+                product.quantity += purchase.quantity
+                movements.append(StockMovement(
+                    product=product, user=user, kind='purchase', quantity=purchase.quantity,
+                    balance_after=product.quantity, purchase=purchase,
+                ))
+            StockMovement.objects.bulk_create(movements)
+
+        return receipt, True
+
+
+class StockMovement(models.Model):
+    """Ombor harakatlari jurnali (faqat qo'shiladi, o'zgartirilmaydi)"""
+    KIND_CHOICES = [
+        ('sale', 'Sotuv'),
+        ('purchase', 'Kirim'),
+        ('adjustment', 'Tuzatish'),
+        ('return', 'Qaytarish'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="movements", verbose_name="Mahsulot")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Turi")
+    quantity = models.DecimalField(max_digits=12, decimal_places=3, verbose_name="Miqdor (+/-)")
+    balance_after = models.DecimalField(max_digits=12, decimal_places=3, verbose_name="Qoldiq")
+
+    # Manba hujjat
+    sale = models.ForeignKey(Sale, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name="movements", verbose_name="Sotuv")
+    purchase = models.ForeignKey(Purchase, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name="movements", verbose_name="Kirim")
+    note = models.CharField(max_length=255, blank=True, null=True, verbose_name="Izoh")
+
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Vaqt")
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="stock_movements")
+
+    class Meta:
+        verbose_name = "Ombor harakati"
+        verbose_name_plural = "Ombor harakatlari"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['product', 'created_at']),
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.quantity:+} ({self.get_kind_display()})"
+
+    @classmethod
+    def record(cls, product, kind, quantity, **kwargs):
+        """Miqdor o'zgargandan keyin (o'sha tranzaksiya ichida) harakatni yozish"""
+        return cls.objects.create(
+            product=product, user_id=product.user_id, kind=kind,
+            quantity=quantity, balance_after=product.quantity, **kwargs
+        )
+
+    @classmethod
+    def stock_at(cls, when, products):
+        """
+        Berilgan vaqtdagi qoldiq: eng yaqin oldingi snapshot + undan keyingi harakatlar.
+        Snapshot bo'lmasa - joriy qoldiqdan keyingi harakatlar ayiriladi.
+        Qaytaradi: {product_id: miqdor}
+        """
+        from django.db.models import Case, DecimalField, OuterRef, Subquery, When
+        from django.db.models.functions import Coalesce
+
+        snapshots = StockSnapshot.objects.filter(product=OuterRef('pk'), taken_at__lte=when).order_by('-taken_at')
+
+        def movement_sum(**lookups):
+            movements = cls.objects.filter(product=OuterRef('pk'), **lookups).order_by().values('product')
+            return Coalesce(
+                Subquery(movements.annotate(total=Sum('quantity')).values('total')[:1]),
+                0, output_field=DecimalField(max_digits=12, decimal_places=3),
+            )
+
+        rows = products.annotate(
+            snapshot_quantity=Subquery(snapshots.values('quantity')[:1]),
+            snapshot_at=Subquery(snapshots.values('taken_at')[:1]),
+        ).annotate(
+            forward=Case(When(snapshot_at__isnull=False, then=movement_sum(
+                created_at__gt=OuterRef('snapshot_at'), created_at__lte=when,
+            ))),
+            backward=Case(When(snapshot_at__isnull=True, then=movement_sum(created_at__gt=when))),
+        ).values_list('id', 'quantity', 'snapshot_quantity', 'forward', 'backward')
+
+        result = {}
+        for product_id, quantity, snapshot_quantity, forward, backward in rows:
+            if snapshot_quantity is not None:
+                result[product_id] = snapshot_quantity + (forward or 0)
+            else:
+                result[product_id] = quantity - (backward or 0)
+        return result
+
+
+class StockSnapshot(models.Model):
+    """Mahsulot qoldig'ining davriy surati"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="snapshots", verbose_name="Mahsulot")
+    quantity = models.DecimalField(max_digits=12, decimal_places=3, verbose_name="Qoldiq")
+    taken_at = models.DateTimeField(default=timezone.now, verbose_name="Vaqt")
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="stock_snapshots")
+
+    class Meta:
+        verbose_name = "Qoldiq surati"
+        verbose_name_plural = "Qoldiq suratlari"
+        ordering = ['-taken_at']
+        indexes = [
+            models.Index(fields=['product', 'taken_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name}: {self.quantity} ({self.taken_at:%Y-%m-%d})"
+
+    @classmethod
+    def take(cls, products=None, batch_size=2000):
+        """Barcha (yoki berilgan) mahsulotlar qoldig'ini bir vaqt belgisi bilan saqlash"""
+        products = Product.objects.all() if products is None else products
+        taken_at = timezone.now()
+        created = 0
+        batch = []
+        with transaction.atomic():
+            for product_id, user_id, quantity in products.values_list('id', 'user_id', 'quantity').iterator(chunk_size=batch_size):
+                batch.append(cls(product_id=product_id, user_id=user_id, quantity=quantity, taken_at=taken_at))
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            cls.objects.bulk_create(batch)
+        return created + len(batch)
+
+
+class CatalogTombstone(models.Model):
+    """O'chirilgan mahsulot/mijoz belgisi - kassalar delta sinxronlashda ularni ham o'chiradi"""
+    KIND_CHOICES = [
+        ('product', 'Mahsulot'),
+        ('customer', 'Mijoz'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Turi")
+    object_id = models.UUIDField(verbose_name="Obyekt ID")
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="O'chirilgan vaqt")
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="catalog_tombstones")
+
+    class Meta:
+        verbose_name = "O'chirilgan obyekt"
+        verbose_name_plural = "O'chirilgan obyektlar"
+        ordering = ['-deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.object_id} ({self.deleted_at:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def prune(cls, days):
+        """Eski belgilarni o'chirish. Bundan eski versiyali kassalar to'liq snapshot oladi."""
+        from datetime import timedelta
+
+        return cls.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()[0]
+
+
 class Debt(models.Model):
     """Qarzlar modeli"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -589,10 +1616,95 @@ class Debt(models.Model):
             models.Index(fields=['customer']),
             models.Index(fields=['status']),
             models.Index(fields=['due_date']),
+            models.Index(fields=['status', 'due_date']),
         ]
 
+    # To'lanmagan (ochiq) qarz holatlari
+    OPEN_STATUSES = ['pending', 'partially_paid', 'overdue']
+
     def __str__(self):
         return f"Qarz: {self.customer.full_name} - {self.remaining_amount}"
+
+    @classmethod
+    def allocate_payment(cls, customer, amount, today=None):
+        """
+        Bitta to'lovni mijozning ochiq qarzlariga muddat bo'yicha (FIFO) taqsimlash.
+        Bitta tranzaksiya va bitta bulk_update; mijoz agregatlari bir marta yangilanadi.
+        Qaytaradi: ([(qarz, to'langan summa), ...], taqsimlanmay qolgan summa)
+        """
+        from datetime import date
+        from decimal import Decimal
+
+        from .signals import publish_debts_batch
+
+        today = today or date.today()
+        remaining = Decimal(amount)
+        allocations = []
+
+        with transaction.atomic():
+            debts = cls.objects.select_for_update().filter(
+                customer=customer, status__in=cls.OPEN_STATUSES
+            ).order_by('due_date', 'created_at')
+
+            now = timezone.now()
+            for debt in debts:
+                if remaining <= 0:
+                    break
+                applied = min(debt.remaining_amount, remaining)
+                debt.paid_amount += applied
+                if debt.paid_amount >= debt.amount:
+                    debt.status = 'paid'
+                    debt.paid_date = today
+                elif debt.due_date < today:
+                    debt.status = 'overdue'
+                else:
+                    debt.status = 'partially_paid'
+                debt.updated_at = now
+                remaining -= applied
+                allocations.append((debt, applied))
+
+            if allocations:
+                cls.objects.bulk_update(
+                    [debt for debt, _ in allocations],
+                    ['paid_amount', 'status', 'paid_date', 'updated_at'],
+                )
+                DebtAging.refresh_customer(customer)
+                publish_debts_batch(customer.user_id, [debt for debt, _ in allocations])
+
+        return allocations, remaining
+
+    @classmethod
+    def mark_overdue(cls, today=None):
+        """
+        Muddati o'tgan qarzlarni bitta UPDATE bilan 'overdue' holatiga o'tkazish.
+        UPDATE signal yubormaydi - o'zgargan foydalanuvchilarning 'sales' versiyasi shu yerda oshiriladi.
+        """
+        from datetime import date
+        from django.db.models import Case, Value, When
+
+        from .caching import bump_data_version
+
+        today = today or date.today()
+        now = timezone.now()
+        # Qisman to'langanlari ham - qoldig'i muddatida to'lanmagan
+        to_overdue = cls.objects.filter(status__in=['pending', 'partially_paid'], due_date__lt=today)
+        # Muddati uzaytirilgan qarzlarni qaytarish (to'lov bo'lgan bo'lsa - 'partially_paid')
+        to_restore = cls.objects.filter(status='overdue', due_date__gte=today)
+
+        with transaction.atomic():
+            user_ids = set(to_overdue.order_by().values_list('user_id', flat=True).distinct())
+            user_ids.update(to_restore.order_by().values_list('user_id', flat=True).distinct())
+            overdue = to_overdue.update(status='overdue', updated_at=now)
+            restored = to_restore.update(status=Case(
+                When(paid_amount__gt=0, then=Value('partially_paid')), default=Value('pending'),
+            ), updated_at=now)
+
+            def bump():
+                for user_id in user_ids:
+                    bump_data_version(user_id, 'sales')
+
+            transaction.on_commit(bump)
+        return overdue, restored
     
     def save(self, *args, **kwargs):
         # Statusni yangilash
@@ -609,10 +1721,10 @@ class Debt(models.Model):
         if self.paid_amount >= self.amount:
             self.status = 'paid'
             self.paid_date = date.today()
-        elif self.paid_amount > 0:
-            self.status = 'partially_paid'
         elif date.today() > self.due_date:
             self.status = 'overdue'
+        elif self.paid_amount > 0:
+            self.status = 'partially_paid'
         else:
             self.status = 'pending'
     
@@ -636,6 +1748,121 @@ class Debt(models.Model):
         return 0
 
 
+class DebtAging(models.Model):
+    """Qarzlar muddati bo'yicha guruhlari (mijoz va tenant kesimida)"""
+    BUCKETS = ['current', 'days_0_30', 'days_31_60', 'days_61_90', 'days_90_plus']
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Mijoz bo'sh bo'lsa - tenant bo'yicha jami qator
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, null=True, blank=True,
+                                 related_name="debt_aging", verbose_name="Mijoz")
+    as_of = models.DateField(verbose_name="Sana")
+
+    # Qolgan summalar, muddat o'tgan kunlar bo'yicha
+    current = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Muddati kelmagan")
+    days_0_30 = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="0-30 kun")
+    days_31_60 = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="31-60 kun")
+    days_61_90 = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="61-90 kun")
+    days_90_plus = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="90+ kun")
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Jami qarz")
+    debt_count = models.IntegerField(default=0, verbose_name="Qarzlar soni")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="debt_aging")
+
+    class Meta:
+        verbose_name = "Qarz muddati tahlili"
+        verbose_name_plural = "Qarz muddati tahlili"
+        ordering = ['-total']
+        indexes = [
+            models.Index(fields=['user', 'customer']),
+            models.Index(fields=['user', '-total']),
+            models.Index(fields=['user', '-days_90_plus']),
+        ]
+
+    def __str__(self):
+        owner = self.customer.full_name if self.customer_id else self.user.username
+        return f"Qarz tahlili: {owner} - {self.as_of}"
+
+    @staticmethod
+    def bucket_aggregates(today):
+        """Guruhlar uchun shartli SUM ifodalari (hisob bazada bajariladi)"""
+        from datetime import timedelta
+
+        remaining = F('amount') - F('paid_amount')
+        return {
+            'current': Sum(remaining, filter=Q(due_date__gte=today), default=0),
+            'days_0_30': Sum(remaining, filter=Q(due_date__lt=today, due_date__gte=today - timedelta(days=30)), default=0),
+            'days_31_60': Sum(remaining, filter=Q(due_date__lt=today - timedelta(days=30),
+                                                  due_date__gte=today - timedelta(days=60)), default=0),
+            'days_61_90': Sum(remaining, filter=Q(due_date__lt=today - timedelta(days=60),
+                                                  due_date__gte=today - timedelta(days=90)), default=0),
+            'days_90_plus': Sum(remaining, filter=Q(due_date__lt=today - timedelta(days=90)), default=0),
+            'total': Sum(remaining, default=0),
+            'debt_count': Count('id'),
+        }
+
+    @classmethod
+    def refresh_customer(cls, customer):
+        """Bitta mijoz qatorini qayta hisoblash va tenant qatoriga farqni qo'shish"""
+        summary = cls.objects.filter(user_id=customer.user_id, customer__isnull=True).first()
+        if summary is None:
+            # Tahlil hali yaratilmagan - tungi buyruq to'liq hisoblaydi
+            return
+
+        keys = cls.BUCKETS + ['total', 'debt_count']
+        values = Debt.objects.filter(customer=customer, status__in=Debt.OPEN_STATUSES).aggregate(
+            **cls.bucket_aggregates(summary.as_of)
+        )
+        row = cls.objects.filter(user_id=customer.user_id, customer=customer).first()
+        old = {key: getattr(row, key) if row else 0 for key in keys}
+
+        cls.objects.filter(pk=summary.pk).update(
+            **{key: F(key) + (values[key] - old[key]) for key in keys}
+        )
+        if not values['debt_count']:
+            if row is not None:
+                row.delete()
+        elif row is None:
+            cls.objects.create(user_id=customer.user_id, customer=customer, as_of=summary.as_of, **values)
+        else:
+            cls.objects.filter(pk=row.pk).update(**values)
+
+    @classmethod
+    def rebuild(cls, today=None, user=None):
+        """Guruhlarni bitta GROUP BY so'rovi bilan qayta hisoblash"""
+        from datetime import date
+
+        today = today or date.today()
+        debts = Debt.objects.filter(status__in=Debt.OPEN_STATUSES)
+        if user is not None:
+            debts = debts.filter(user=user)
+
+        rows = debts.values('user', 'customer').annotate(**cls.bucket_aggregates(today)).order_by()
+
+        records = []
+        tenants = {}
+        for row in rows:
+            values = {key: row[key] for key in cls.BUCKETS + ['total', 'debt_count']}
+            records.append(cls(user_id=row['user'], customer_id=row['customer'], as_of=today, **values))
+
+            tenant = tenants.setdefault(row['user'], dict.fromkeys(values, 0))
+            for key, value in values.items():
+                tenant[key] += value
+
+        for user_id, values in tenants.items():
+            records.append(cls(user_id=user_id, customer=None, as_of=today, **values))
+
+        with transaction.atomic():
+            stale = cls.objects.all() if user is None else cls.objects.filter(user=user)
+            stale.delete()
+            cls.objects.bulk_create(records, batch_size=1000)
+        return len(records)
+
+
 class DashboardStats(models.Model):
     """Dashboard statistikasi"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -690,11 +1917,8 @@ class DashboardStats(models.Model):
         stats.total_purchases = purchases_today.aggregate(total=Sum('total'))['total'] or 0
         stats.purchase_count = purchases_today.count()
         
-        # Foyda
-        total_profit = 0
-        for sale in sales_today:
-            total_profit += sale.profit
-        stats.total_profit = total_profit
+        # Foyda (sotuvda yozilgan tannarx bo'yicha)
+        stats.total_profit = sales_today.aggregate(total=Sum('profit'))['total'] or 0
         
         # Mijozlar
         from .models import Customer
@@ -707,14 +1931,174 @@ class DashboardStats(models.Model):
         
         # Qarzlar
         from .models import Debt
-        stats.total_debt = Debt.objects.filter(status__in=['pending', 'partially_paid', 'overdue']).aggregate(
-            total=Sum('remaining_amount')
+        stats.total_debt = Debt.objects.filter(status__in=Debt.OPEN_STATUSES).aggregate(
+            total=Sum(F('amount') - F('paid_amount'))
         )['total'] or 0
         
         stats.save()
         return stats
 
 
+class DailySalesRollup(models.Model):
+    """
+    Tenant bo'yicha kunlik sotuv yakunlari (mahalliy sana). Davrlarni solishtirish
+    sotuvlar jadvalini emas, shu jadvalni (user, date) indeksi bo'yicha o'qiydi.
+    Sotuv/mijoz o'zgarganda tegishli kun signal orqali qayta hisoblanadi.
+    """
+    METRICS = ['revenue', 'profit', 'sales_count', 'new_customers']
+
+    date = models.DateField(verbose_name="Sana")
+    revenue = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Daromad")
+    profit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Foyda")
+    sales_count = models.IntegerField(default=0, verbose_name="Sotuvlar soni")
+    new_customers = models.IntegerField(default=0, verbose_name="Yangi mijozlar")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Foreign key
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_rollups")
+
+    class Meta:
+        verbose_name = "Kunlik yakun"
+        verbose_name_plural = "Kunlik yakunlar"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='daily_rollup_user_date'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.date} - {self.revenue}"
+
+    @staticmethod
+    def day_bounds(day):
+        """Mahalliy kunning boshlanishi va tugashi (aware datetime)"""
+        from datetime import datetime, time, timedelta
+
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+    @classmethod
+    def refresh_day(cls, user_id, day):
+        """
+        Bitta kun qatorini qayta hisoblash. Chaqiruvchilar: Sale/Customer signallari,
+        Sale.refund, publish_sales_batch va mijozlar bulk API'si (signal yubormaydigan
+        yozuvlar yakunni o'zi yangilashi kerak).
+        """
+        start, end = cls.day_bounds(day)
+        values = Sale.objects.filter(
+            user_id=user_id, status='completed', sale_date__gte=start, sale_date__lt=end,
+        ).aggregate(revenue=Sum('total', default=0), profit=Sum('profit', default=0), sales_count=Count('id'))
+        values['new_customers'] = Customer.objects.filter(
+            user_id=user_id, created_at__gte=start, created_at__lt=end,
+        ).count()
+        cls.objects.bulk_create([cls(user_id=user_id, date=day, **values)], update_conflicts=True,
+                                unique_fields=['user', 'date'], update_fields=cls.METRICS + ['updated_at'])
+
+    @classmethod
+    def rebuild(cls, user, since=None):
+        """`since` sanasidan (bo'lmasa - butun tarix) kunlik qatorlarni GROUP BY bilan qayta yozish"""
+        from django.db.models.functions import TruncDate
+
+        sales = Sale.objects.filter(user=user, status='completed')
+        customers = Customer.objects.filter(user=user)
+        if since is not None:
+            sales = sales.filter(sale_date__gte=cls.day_bounds(since)[0])
+            customers = customers.filter(created_at__gte=cls.day_bounds(since)[0])
+
+        days = {}
+        for row in sales.values(day=TruncDate('sale_date')).annotate(
+            revenue=Sum('total'), profit=Sum('profit'), sales_count=Count('id'),
+        ).order_by():
+            days[row.pop('day')] = row
+        for row in customers.values(day=TruncDate('created_at')).annotate(new_customers=Count('id')).order_by():
+            days.setdefault(row['day'], {})['new_customers'] = row['new_customers']
+
+        records = [cls(user=user, date=day, **values) for day, values in days.items()]
+        with transaction.atomic():
+            stale = cls.objects.filter(user=user)
+            if since is not None:
+                stale = stale.filter(date__gte=since)
+            stale.delete()
+            cls.objects.bulk_create(records, batch_size=1000)
+        return len(records)
+
+    @classmethod
+    def totals(cls, user, ranges):
+        """
+        Bir nechta (boshlanish, tugash) sana oralig'i yakunlari bitta so'rov bilan:
+        umumiy oraliq (user, date) indeksi bo'yicha o'qiladi, har bir oraliq - shartli SUM.
+        """
+        aggregates = {}
+        for index, (start, end) in enumerate(ranges):
+            period = Q(date__gte=start, date__lte=end)
+            for metric in cls.METRICS:
+                aggregates[f'{metric}_{index}'] = Sum(metric, filter=period, default=0)
+        row = cls.objects.filter(
+            user=user, date__gte=min(start for start, _ in ranges), date__lte=max(end for _, end in ranges),
+        ).aggregate(**aggregates)
+
+        result = []
+        for index in range(len(ranges)):
+            values = {metric: row[f'{metric}_{index}'] for metric in cls.METRICS}
+            values['revenue'], values['profit'] = float(values['revenue']), float(values['profit'])
+            values['avg_basket'] = round(values['revenue'] / values['sales_count'], 2) if values['sales_count'] else 0
+            result.append(values)
+        return result
+
+    @staticmethod
+    def year_ago(day):
+        """O'tgan yilning shu sanasi (29-fevral -> 28-fevral)"""
+        try:
+            return day.replace(year=day.year - 1)
+        except ValueError:
+            return day.replace(year=day.year - 1, day=28)
+
+    @classmethod
+    def period_ranges(cls, period, today):
+        """
+        Davr boshidan bugungacha va oldingi davrning xuddi shu qismi:
+        (boshlanish, tugash), (oldingi boshlanish, oldingi tugash).
+        """
+        from calendar import monthrange
+        from datetime import timedelta
+
+        if period == 'day':
+            yesterday = today - timedelta(days=1)
+            return (today, today), (yesterday, yesterday)
+        if period == 'week':
+            start = today - timedelta(days=today.weekday())
+            return (start, today), (start - timedelta(days=7), today - timedelta(days=7))
+        if period == 'month':
+            previous = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+            last_day = monthrange(previous.year, previous.month)[1]
+            return (today.replace(day=1), today), (previous, previous.replace(day=min(today.day, last_day)))
+        if period == 'year':
+            return (today.replace(month=1, day=1), today), (today.replace(year=today.year - 1, month=1, day=1), cls.year_ago(today))
+        raise ValueError(period)
+
+    @classmethod
+    def compare(cls, user, start, end, previous):
+        """
+        Joriy oraliq, oldingi davr (`previous` = (boshlanish, tugash)) va o'tgan yilning
+        shu sanalari. Ikki so'rov: joriy + oldingi davr birga, o'tgan yil alohida.
+        """
+        last_year_range = (cls.year_ago(start), cls.year_ago(end))
+        current, prior = cls.totals(user, [(start, end), previous])
+        last_year, = cls.totals(user, [last_year_range])
+
+        def change(now, then):
+            return {
+                metric: round((now[metric] - then[metric]) / then[metric] * 100, 1) if then[metric] else None
+                for metric in now
+            }
+
+        return {
+            'current': {'from': start, 'to': end, **current},
+            'previous': {'from': previous[0], 'to': previous[1], **prior},
+            'last_year': {'from': last_year_range[0], 'to': last_year_range[1], **last_year},
+            'change': {'previous': change(current, prior), 'last_year': change(current, last_year)},
+        }
+
+
 
 class CategoryHistory(models.Model):
     """Kategoriya tarixi"""
@@ -0,0 +1,164 @@
+# profiling.py
+"""
+So'rov profillari (ProfilingMiddleware).
+
+Profil olinadi, agar:
+- staff foydalanuvchi `?_profile=1` yoki `X-Profile: 1` sarlavhasi bilan so'rasa;
+- yoki tasodifiy tanlovda (PROFILING_SAMPLE_RATE ulushi, barcha so'rovlar uchun).
+
+Har bir profil PROFILING_DIR da ikki fayl: `<nom>.prof` - cProfile natijasi
+(snakeviz, gprof2dot yoki `python -m pstats` bilan ochiladi) va `<nom>.json` -
+so'rov ma'lumotlari va SQL vaqt chizig'i (parametrlarsiz). Eng ko'pi bilan
+PROFILING_MAX_FILES ta profil PROFILING_MAX_AGE_DAYS kun saqlanadi.
+
+cProfile jarayonda bitta vaqtda bitta ishlaydi - parallel so'rovlardan faqat
+bittasi profillanadi, qolganlari oddiy bajariladi.
+"""
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+NAME_RE = re.compile(r'^\d{8}-\d{6}-[0-9a-f]{8}$')
+
+_lock = threading.Lock()
+
+
+def trigger(request):
+    """'staff', 'sample' yoki None - so'rov profillanadimi"""
+    if request.GET.get('_profile') == '1' or request.headers.get('X-Profile') == '1':
+        if request.user.is_staff:
+            return 'staff'
+    if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return 'sample'
+    return None
+
+
+class SqlTimeline:
+    """connection.execute_wrapper: har bir so'rovning boshlanishi va davomiyligi (ms)"""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+        self.count = 0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.total_ms += duration
+            if len(self.queries) < settings.PROFILING_SQL_LIMIT:
+                self.queries.append({
+                    'start_ms': round((start - self.started) * 1000, 3),
+                    'duration_ms': round(duration, 3),
+                    'sql': sql,
+                })
+
+
+def capture(request, get_response, reason):
+    """So'rovni cProfile va SQL vaqt chizig'i bilan bajarish; profil nomi X-Profile-Id da"""
+    if not _lock.acquire(blocking=False):
+        return get_response(request)
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        timeline = SqlTimeline(started)
+        with connection.execute_wrapper(timeline):
+            profiler.enable()
+            try:
+                response = get_response(request)
+            finally:
+                profiler.disable()
+        duration = (time.perf_counter() - started) * 1000
+    finally:
+        _lock.release()
+
+    name = save(request, response, profiler, timeline, duration, reason)
+    response['X-Profile-Id'] = name
+    return response
+
+
+def save(request, response, profiler, timeline, duration, reason):
+    directory = settings.PROFILING_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    name = f"{timezone.localtime(now):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    profiler.dump_stats(directory / f"{name}.prof")
+    meta = {
+        'name': name,
+        'created_at': now.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': getattr(request.resolver_match, 'view_name', None),
+        'user': request.user.get_username() if request.user.is_authenticated else None,
+        'reason': reason,
+        'status': response.status_code,
+        'duration_ms': round(duration, 3),
+        'sql_count': timeline.count,
+        'sql_ms': round(timeline.total_ms, 3),
+        'sql': timeline.queries,
+    }
+    (directory / f"{name}.json").write_text(json.dumps(meta, ensure_ascii=False))
+    prune()
+    return name
+
+
+def prune():
+    """Muddati o'tgan va PROFILING_MAX_FILES dan ortiq (eng eskilari) profillarni o'chirish"""
+    directory = settings.PROFILING_DIR
+    names = sorted((path.stem for path in directory.glob('*.json') if NAME_RE.match(path.stem)), reverse=True)
+    cutoff = f"{timezone.localtime(timezone.now() - timedelta(days=settings.PROFILING_MAX_AGE_DAYS)):%Y%m%d-%H%M%S}"
+    for index, name in enumerate(names):
+        if index >= settings.PROFILING_MAX_FILES or name < cutoff:
+            for extension in ('json', 'prof'):
+                (directory / f"{name}.{extension}").unlink(missing_ok=True)
+
+
+def load(name):
+    """Profil ma'lumotlari (SQL vaqt chizig'i bilan) yoki None"""
+    if not NAME_RE.match(name):
+        return None
+    try:
+        return json.loads((settings.PROFILING_DIR / f"{name}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def slowest(limit=50):
+    """Eng sekin profillar (SQL vaqt chizig'isiz)"""
+    profiles = []
+    for path in settings.PROFILING_DIR.glob('*.json'):
+        meta = load(path.stem)
+        if meta:
+            meta.pop('sql')
+            profiles.append(meta)
+    profiles.sort(key=lambda meta: meta['duration_ms'], reverse=True)
+    return profiles[:limit]
+
+
+def top_functions(name, limit=30, sort='cumulative'):
+    """pstats jadvali (matn) - sahifada ko'rsatish uchun"""
+    if not NAME_RE.match(name):
+        return ''
+    output = io.StringIO()
+    try:
+        stats = pstats.Stats(str(settings.PROFILING_DIR / f"{name}.prof"), stream=output)
+    except OSError:
+        return ''
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
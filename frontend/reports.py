@@ -0,0 +1,112 @@
+# reports.py
+"""
+Yuklab olinadigan hisobotlar (PDF va Excel).
+
+pandas va reportlab og'ir kutubxonalar (o'nlab MB xotira, soniyaga yaqin import).
+Bu modul faqat export_report ichida import qilinadi - worker'lar ularni hisobot
+birinchi marta so'ralgandagina yuklaydi. Ishga tushish narxi `startup:*`
+benchmark ssenariylarida kuzatiladi.
+"""
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pandas as pd
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.utils import timezone
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .models import Product, Sale
+
+EXCEL_ROW_LIMIT = 100
+
+
+def sales_for_period(user, period):
+    """Davr bo'yicha tenant sotuvlari (day, week, month, year)"""
+    today = timezone.now().date()
+    if period == 'day':
+        since = today
+    elif period == 'week':
+        since = today - timedelta(days=7)
+    elif period == 'month':
+        since = today.replace(day=1)
+    else:
+        since = today.replace(month=1, day=1)
+    return Sale.objects.filter(user=user, sale_date__date__gte=since)
+
+
+def _filename(period, extension):
+    return f'attachment; filename="report_{period}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}"'
+
+
+def sales_pdf(sales, period):
+    response = HttpResponse(content_type='application/pdf')
+    response['Content-Disposition'] = _filename(period, 'pdf')
+
+    p = canvas.Canvas(response, pagesize=letter)
+    p.setTitle(f"Sotuv hisoboti - {period}")
+
+    # Sarlavha
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(100, 750, "Sklat.uz - Sotuv hisoboti")
+    p.setFont("Helvetica", 12)
+    p.drawString(100, 730, f"Davr: {period}")
+    p.drawString(100, 710, f"Yaratilgan sana: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+
+    # Ma'lumotlar
+    total_sales = sales.aggregate(total=Sum('total'))['total'] or 0
+    p.drawString(100, 680, f"Jami sotuv: {total_sales:,.0f} so'm")
+
+    p.showPage()
+    p.save()
+    return response
+
+
+def sales_excel(sales, period):
+    data = [{
+        'ID': sale.id,
+        'Mahsulot': sale.product.name,
+        'Miqdor': sale.quantity,
+        'Narx': sale.price,
+        'Jami': sale.total,
+        'Sana': sale.sale_date.strftime('%Y-%m-%d %H:%M'),
+        'Mijoz': sale.customer.full_name if sale.customer else 'Noma\'lum',
+    } for sale in sales.select_related('product', 'customer')[:EXCEL_ROW_LIMIT]]
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        pd.DataFrame(data).to_excel(writer, sheet_name='Sotuvlar', index=False)
+    output.seek(0)
+
+    response = HttpResponse(
+        output,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = _filename(period, 'xlsx')
+    return response
+
+
+def classification_excel(user):
+    """ABC/XYZ tasnifi: barcha tasniflangan mahsulotlar, sinflar bo'yicha tartiblangan"""
+    rows = Product.objects.filter(user=user).exclude(abc_class='').order_by(
+        'abc_class', 'xyz_class', '-total_revenue'
+    ).values_list('name', 'sku', 'category__name', 'abc_class', 'xyz_class', 'quantity', 'unit', 'total_revenue')
+    frame = pd.DataFrame.from_records(
+        rows.iterator(chunk_size=10000),
+        columns=['Mahsulot', 'SKU', 'Kategoriya', 'ABC', 'XYZ', 'Qoldiq', 'Birlik', 'Jami daromad'],
+    )
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        frame.to_excel(writer, sheet_name='ABC-XYZ', index=False)
+        # Qisqacha: har bir (ABC, XYZ) katagidagi mahsulotlar soni
+        pd.crosstab(frame['ABC'], frame['XYZ']).to_excel(writer, sheet_name='Matritsa')
+    output.seek(0)
+
+    response = HttpResponse(
+        output,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = _filename('abc_xyz', 'xlsx')
+    return response
@@ -0,0 +1,53 @@
+# segmentation.py
+"""
+RFM (Recency, Frequency, Monetary) segmentatsiyasi - NumPy massivlarida.
+
+Har bir ko'rsatkich tenant mijozlari ichida kvintillarga (1-5) bo'linadi:
+oxirgi xariddan beri kunlar (kam - yaxshi), xaridlar soni va jami summa.
+Segment R va F/M o'rtachasi bo'yicha 5x5 jadvaldan olinadi. Hisob butun
+massiv ustida bajariladi - mijoz boshiga Python sikli yo'q.
+"""
+import numpy as np
+
+from .models import Customer
+
+SEGMENTS = Customer.SEGMENT_CHOICES
+
+SEGMENT_CODES = np.array([code for code, _ in SEGMENTS])
+_INDEX = {code: i for i, (code, _) in enumerate(SEGMENTS)}
+
+# Qatorlar - R (1..5), ustunlar - F/M o'rtachasi (1..5)
+SEGMENT_GRID = np.array([[_INDEX[code] for code in row] for row in [
+    ['lost', 'hibernating', 'at_risk', 'at_risk', 'cant_lose'],
+    ['hibernating', 'hibernating', 'at_risk', 'at_risk', 'cant_lose'],
+    ['about_to_sleep', 'about_to_sleep', 'need_attention', 'loyal', 'loyal'],
+    ['promising', 'potential_loyalist', 'potential_loyalist', 'loyal', 'loyal'],
+    ['new', 'potential_loyalist', 'potential_loyalist', 'champions', 'champions'],
+]])
+
+
+def quintile_scores(values):
+    """
+    Qiymatlarning kvintil bali (1..5, katta qiymat - katta bal).
+    Teng qiymatlar bir xil o'rtacha rangni oladi, shuning uchun bitta xarid qilgan
+    ko'p mijozlar tasodifan turli kvintillarga bo'linib ketmaydi.
+    """
+    values = np.asarray(values)
+    if not len(values):
+        return np.zeros(0, dtype=np.int8)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    average_rank = (ends - counts + 1 + ends) / 2
+    share = average_rank[inverse] / len(values)
+    return np.clip(np.ceil(share * 5), 1, 5).astype(np.int8)
+
+
+def rfm_segments(recency_days, frequency, monetary):
+    """
+    Qaytaradi: (r, f, m, segmentlar) - har biri mijozlar soniga teng massiv.
+    """
+    r = (6 - quintile_scores(recency_days)).astype(np.int8)
+    f = quintile_scores(frequency)
+    m = quintile_scores(monetary)
+    fm = (f.astype(np.int16) + m + 1) // 2
+    return r, f, m, SEGMENT_CODES[SEGMENT_GRID[r - 1, fm - 1]]
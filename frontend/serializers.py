@@ -0,0 +1,351 @@
+# serializers.py
+"""
+REST API (v1) serializerlari.
+
+`?fields=id,name,price` bilan faqat kerakli maydonlar qaytadi (sparse fieldsets).
+Ro'yxat serializerlari (many=True) bulk_create/bulk_update bilan yozadi - har bir
+qator uchun alohida INSERT/UPDATE bo'lmaydi.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from .caching import bump_data_version
+from .models import Category, Customer, Debt, DebtAging, Product, Purchase, Sale, StockMovement
+from .signals import refresh_rollup_on_commit
+
+
+class SparseFieldsMixin:
+    """`?fields=a,b` - qolgan maydonlar javobdan olib tashlanadi"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or 'fields' not in request.query_params:
+            return
+        wanted = {name.strip() for name in request.query_params['fields'].split(',') if name.strip()}
+        for name in set(self.fields) - wanted - {'id'}:
+            self.fields.pop(name)
+
+
+class TenantPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """Bog'liq obyekt faqat so'rov egasiga tegishli bo'lishi kerak"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.context['request'].user)
+
+    def to_internal_value(self, data):
+        # Bulk so'rovda obyektlar oldindan bitta so'rov bilan yuklangan (BulkListSerializer)
+        preloaded = self.context.get('related', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        obj = preloaded.get(str(data))
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+# =============== BULK ===============
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    POST: bitta bulk_create. PATCH (instance - obyektlar ro'yxati): bitta bulk_update.
+    Model-ga xos ishlar (SKU, holat, harakatlar) `child.prepare_bulk` va `child.after_bulk` da.
+    Bog'liq obyektlar va unikal maydonlar har bir qator uchun emas, paket uchun bir marta tekshiriladi.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self.preload_related(data)
+        return super().to_internal_value(data)
+
+    def preload_related(self, data):
+        related = self.context.setdefault('related', {})
+        for name, field in self.child.fields.items():
+            if not isinstance(field, TenantPrimaryKeyField) or field.read_only:
+                continue
+            keys = {str(row[name]) for row in data if isinstance(row, dict) and row.get(name)}
+            try:
+                related[name] = {str(obj.pk): obj for obj in field.get_queryset().filter(pk__in=keys)}
+            except (TypeError, ValueError, DjangoValidationError):
+                # Noto'g'ri UUID - har bir qator o'z xatosini oladi
+                related[name] = {}
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, list):
+            instances = self.context['instances']
+            instance = instances.get(str(data.get('id'))) if isinstance(data, dict) else None
+            if instance is None:
+                raise serializers.ValidationError({'id': "Obyekt topilmadi"})
+            self.child.instance = instance
+        return super().run_child_validation(data)
+
+    def validate(self, attrs):
+        """Unikal maydonlar: paket ichida takrorlanmasin va bazada band bo'lmasin (bitta so'rov)"""
+        model = self.child.Meta.model
+        exclude = [obj.pk for obj in self.instance] if isinstance(self.instance, list) else []
+        errors = {}
+        for name in self.child.bulk_unique_fields:
+            values = [row[name] for row in attrs if row.get(name)]
+            duplicates = {value for value in values if values.count(value) > 1}
+            taken = set(model.objects.filter(**{f"{name}__in": values}).exclude(pk__in=exclude)
+                        .values_list(name, flat=True))
+            if duplicates | taken:
+                errors[name] = f"Band yoki takrorlangan: {', '.join(sorted(duplicates | taken))}"
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        user = self.context['request'].user
+        objects = [model(user=user, **attrs) for attrs in validated_data]
+        with transaction.atomic():
+            self.child.prepare_bulk(objects, created=True)
+            model.objects.bulk_create(objects, batch_size=500)
+            self.child.after_bulk(objects, created=True)
+        return objects
+
+    def update(self, instances, validated_data):
+        by_id = {obj.pk: obj for obj in instances}
+        fields = {'updated_at'}
+        objects = []
+        now = timezone.now()
+        for attrs in validated_data:
+            obj = by_id[attrs.pop('id')]
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+                fields.add(name)
+            # bulk_update auto_now ni qo'llamaydi - kassa deltasi updated_at ga tayanadi
+            obj.updated_at = now
+            objects.append(obj)
+        with transaction.atomic():
+            self.child.prepare_bulk(objects, created=False)
+            self.child.Meta.model.objects.bulk_update(objects, sorted(fields), batch_size=500)
+            self.child.after_bulk(objects, created=False)
+        return objects
+
+
+class BulkSerializerMixin:
+    """Bulk PATCH qatorlarida `id` majburiy; unikal maydonlar paket darajasida tekshiriladi"""
+    bulk_unique_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('bulk'):
+            for name in self.bulk_unique_fields:
+                fields[name].validators = [v for v in fields[name].validators if not isinstance(v, UniqueValidator)]
+        if self.context.get('bulk_update'):
+            fields['id'] = serializers.UUIDField()
+        return fields
+
+    def prepare_bulk(self, objects, created):
+        pass
+
+    def after_bulk(self, objects, created):
+        pass
+
+
+# =============== SERIALIZERS ===============
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'parent', 'path', 'depth', 'product_count', 'total_value']
+        read_only_fields = fields
+
+
+class ProductSerializer(SparseFieldsMixin, BulkSerializerMixin, serializers.ModelSerializer):
+    bulk_unique_fields = ('sku',)
+    category = TenantPrimaryKeyField(queryset=Category.objects.all(), allow_null=True, required=False)
+    category_name = serializers.CharField(source='category.name', read_only=True, default=None)
+
+    class Meta:
+        model = Product
+        list_serializer_class = BulkListSerializer
+        fields = [
+            'id', 'name', 'sku', 'barcode', 'category', 'category_name', 'brand',
+            'purchase_price', 'sale_price', 'avg_cost', 'quantity', 'unit', 'min_quantity',
+            'description', 'status', 'total_sold', 'total_revenue', 'created_at', 'updated_at',
+            'abc_class', 'xyz_class', 'classified_at',
+        ]
+        read_only_fields = [
+            'avg_cost', 'total_sold', 'total_revenue', 'created_at', 'updated_at',
+            'abc_class', 'xyz_class', 'classified_at',
+        ]
+        extra_kwargs = {'sku': {'required': False}}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # Qoldiq faqat yaratishda beriladi, keyin kirim/sotuv/qaytarish orqali o'zgaradi
+        if self.instance is not None or self.context.get('bulk_update'):
+            fields['quantity'].read_only = True
+        return fields
+
+    def validate_status(self, value):
+        if value not in ('active', 'inactive'):
+            raise serializers.ValidationError("Faqat 'active' yoki 'inactive' berish mumkin")
+        return value
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            product = Product.objects.create(user=self.context['request'].user, **validated_data)
+            if product.quantity:
+                StockMovement.record(product, 'adjustment', product.quantity, note="Boshlang'ich qoldiq (API)")
+        return product
+
+    def prepare_bulk(self, objects, created):
+        if created:
+            # generate_sku har chaqiruvda count() qiladi - paketda bitta sanoq yetadi
+            offset = Product.objects.count()
+            for index, product in enumerate(objects, start=1):
+                if not product.sku:
+                    prefix = ''.join(word[0].upper() for word in product.name.split()[:3])
+                    product.sku = f"{prefix}{offset + index:04d}"
+                product.update_status()
+
+    def after_bulk(self, objects, created):
+        if not created:
+            # min_quantity o'zgargan bo'lishi mumkin
+            Product.refresh_statuses(Product.objects.filter(pk__in=[p.pk for p in objects]))
+        else:
+            StockMovement.objects.bulk_create([
+                StockMovement(product=product, user_id=product.user_id, kind='adjustment',
+                              quantity=product.quantity, balance_after=product.quantity,
+                              note="Boshlang'ich qoldiq (API)")
+                for product in objects if product.quantity
+            ])
+        for category in Category.objects.filter(pk__in={p.category_id for p in objects if p.category_id}):
+            category.update_statistics()
+        user_id = objects[0].user_id if objects else None
+        transaction.on_commit(lambda: bump_data_version(user_id, 'catalog'))
+
+
+class CustomerSerializer(SparseFieldsMixin, BulkSerializerMixin, serializers.ModelSerializer):
+    bulk_unique_fields = ('phone',)
+    # Ro'yxatda annotatsiya (CustomerViewSet), bitta obyektda - Customer.total_debt
+    open_debt = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Customer
+        list_serializer_class = BulkListSerializer
+        fields = [
+            'id', 'first_name', 'last_name', 'phone', 'email', 'address', 'birth_date', 'gender',
+            'company', 'tax_id', 'notes', 'is_active', 'customer_type',
+            'total_purchases', 'total_spent', 'last_purchase', 'open_debt', 'created_at', 'updated_at',
+            'segment', 'rfm_recency', 'rfm_frequency', 'rfm_monetary', 'segmented_at',
+        ]
+        read_only_fields = [
+            'total_purchases', 'total_spent', 'last_purchase', 'created_at', 'updated_at',
+            'segment', 'rfm_recency', 'rfm_frequency', 'rfm_monetary', 'segmented_at',
+        ]
+
+    def get_open_debt(self, obj):
+        value = getattr(obj, 'open_debt', None)
+        return str(value if value is not None else obj.total_debt)
+
+    def validate_phone(self, value):
+        # Customer.save() bilan bir xil: faqat raqamlar (bulk_create save() ni chaqirmaydi)
+        return ''.join(filter(str.isdigit, value))
+
+    def create(self, validated_data):
+        return Customer.objects.create(user=self.context['request'].user, **validated_data)
+
+    def after_bulk(self, objects, created):
+        if not objects:
+            return
+        if created:
+            # bulk_create post_save yubormaydi - yangi mijozlar kunlik yakunlarga shu yerda tushadi
+            refresh_rollup_on_commit(objects[0].user_id, *(customer.created_at for customer in objects))
+        else:
+            user_id = objects[0].user_id
+            transaction.on_commit(lambda: bump_data_version(user_id, 'sales'))
+
+
+class SaleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    product = TenantPrimaryKeyField(queryset=Product.objects.all())
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    customer = TenantPrimaryKeyField(queryset=Customer.objects.all(), allow_null=True, required=False)
+    customer_name = serializers.CharField(source='customer.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Sale
+        fields = [
+            'id', 'product', 'product_name', 'customer', 'customer_name', 'quantity', 'price',
+            'discount', 'tax', 'total', 'cost', 'profit', 'payment_method', 'paid_amount',
+            'status', 'invoice_number', 'notes', 'sale_date',
+        ]
+        read_only_fields = ['total', 'cost', 'profit', 'status', 'invoice_number', 'sale_date']
+
+    def validate(self, attrs):
+        if attrs['quantity'] <= 0:
+            raise serializers.ValidationError({'quantity': "Miqdor musbat bo'lishi kerak"})
+        if attrs.get('payment_method') == 'credit' and not attrs.get('customer'):
+            raise serializers.ValidationError({'customer': "Nasiya uchun mijoz kerak"})
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        with transaction.atomic():
+            sale = Sale.objects.create(user=user, **validated_data)
+            # Nasiya: qarz sotuv bilan bitta tranzaksiyada (sell_product, Sale.ingest_offline kabi)
+            if sale.payment_method == 'credit':
+                Debt.objects.create(
+                    customer=sale.customer, sale=sale, amount=sale.total,
+                    paid_amount=min(sale.paid_amount, sale.total), user=user,
+                    due_date=timezone.localdate() + timedelta(days=30),
+                )
+                DebtAging.refresh_customer(sale.customer)
+        return sale
+
+
+class OfflineSaleSerializer(serializers.Serializer):
+    """Sale.ingest_offline qatori (kassadan yoki tashqi tizimdan paket)"""
+    id = serializers.UUIDField()
+    product_id = serializers.UUIDField()
+    customer_id = serializers.UUIDField(required=False, allow_null=True, default=None)
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=3, min_value=Decimal('0.001'))
+    price = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0)
+    discount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, default=0)
+    payment_method = serializers.ChoiceField(choices=Sale.PAYMENT_METHODS, default='cash')
+    sold_at = serializers.DateTimeField(required=False, allow_null=True, default=None)
+
+
+class PurchaseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    product = TenantPrimaryKeyField(queryset=Product.objects.all())
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    supplier = TenantPrimaryKeyField(queryset=Customer.objects.all(), allow_null=True, required=False)
+    supplier_name = serializers.CharField(source='supplier.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = Purchase
+        fields = [
+            'id', 'product', 'product_name', 'supplier', 'supplier_name', 'quantity', 'price', 'total',
+            'receipt', 'invoice_number', 'delivery_date', 'expiry_date', 'status', 'notes', 'purchase_date',
+        ]
+        read_only_fields = ['total', 'receipt', 'purchase_date']
+
+    def validate_quantity(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Miqdor musbat bo'lishi kerak")
+        return value
+
+    def create(self, validated_data):
+        return Purchase.objects.create(user=self.context['request'].user, **validated_data)
+
+
+class DebtSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    customer_name = serializers.CharField(source='customer.full_name', read_only=True)
+    invoice_number = serializers.CharField(source='sale.invoice_number', read_only=True)
+    remaining_amount = serializers.DecimalField(max_digits=15, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Debt
+        fields = [
+            'id', 'customer', 'customer_name', 'sale', 'invoice_number', 'amount', 'paid_amount',
+            'remaining_amount', 'due_date', 'paid_date', 'status', 'notes', 'created_at',
+        ]
+        read_only_fields = fields
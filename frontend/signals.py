@@ -0,0 +1,241 @@
+# signals.py
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .live import broker
+from .models import CatalogTombstone, Category, Customer, DailySalesRollup, Debt, GoodsReceipt, Product, Purchase, Sale
+
+
+def publish_on_commit(user_id, build):
+    """Tranzaksiya yakunlangandan keyin hodisani bir marta hisoblab tarqatish"""
+    if not broker.has_subscribers(user_id):
+        return
+
+    def send():
+        event = build()
+        if event:
+            broker.publish(user_id, *event)
+
+    transaction.on_commit(send)
+
+
+@receiver(post_save, sender=Sale)
+def sale_saved(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    def build():
+        totals = broker.apply(instance.user_id, sales_total=instance.total, profit=instance.profit)
+        return 'kpi', {
+            'type': 'sale',
+            'sales_delta': instance.total,
+            'profit_delta': instance.profit,
+            'totals': totals,
+        }
+
+    publish_on_commit(instance.user_id, build)
+
+
+@receiver(post_save, sender=Purchase)
+def purchase_saved(sender, instance, created, **kwargs):
+    if not created or instance.status != 'received':
+        return
+
+    def build():
+        totals = broker.apply(instance.user_id, purchases_total=instance.total)
+        return 'kpi', {
+            'type': 'purchase',
+            'purchases_delta': instance.total,
+            'totals': totals,
+        }
+
+    publish_on_commit(instance.user_id, build)
+
+
+@receiver(post_save, sender=GoodsReceipt)
+def goods_receipt_saved(sender, instance, created, **kwargs):
+    # Yuk qatorlari bulk_create bilan yoziladi - post_save faqat yuk xati uchun keladi
+    if not created:
+        return
+
+    def build():
+        totals = broker.apply(instance.user_id, purchases_total=instance.total)
+        return 'kpi', {
+            'type': 'purchase',
+            'purchases_delta': instance.total,
+            'totals': totals,
+        }
+
+    publish_on_commit(instance.user_id, build)
+
+
+def publish_sales_batch(user_id, sale_ids):
+    """bulk_create bilan yozilgan sotuvlar uchun (post_save kelmaydi) bitta KPI hodisasi"""
+    from django.db.models import Sum
+
+    transaction.on_commit(lambda: bump_data_version(user_id, 'sales', 'catalog'))
+
+    def refresh_rollups():
+        dates = Sale.objects.filter(pk__in=sale_ids).values_list('sale_date', flat=True)
+        for day in {timezone.localdate(value) for value in dates}:
+            DailySalesRollup.refresh_day(user_id, day)
+        # Yakun yozilgandan keyin - oldingi versiya bilan eski yakun keshlanib qolmasin
+        bump_data_version(user_id, 'sales')
+
+    transaction.on_commit(refresh_rollups)
+
+    def build():
+        delta = Sale.objects.filter(pk__in=sale_ids).aggregate(
+            sales_total=Sum('total', default=0), profit=Sum('profit', default=0))
+        totals = broker.apply(user_id, **delta)
+        return 'kpi', {
+            'type': 'sale',
+            'sales_delta': delta['sales_total'],
+            'profit_delta': delta['profit'],
+            'count': len(sale_ids),
+            'totals': totals,
+        }
+
+    publish_on_commit(user_id, build)
+
+
+def publish_sale_refund(sale):
+    """Sale.refund (queryset update - post_save kelmaydi): kunlik yakun, versiya va KPI hodisasi"""
+    transaction.on_commit(lambda: bump_data_version(sale.user_id, 'catalog'))
+    refresh_rollup_on_commit(sale.user_id, sale.sale_date)
+    if timezone.localdate(sale.sale_date) != timezone.localdate():
+        # Jonli yakunlar faqat bugungi kun uchun - eski sotuv qaytarilsa KPI hodisasi yo'q
+        return
+
+    def build():
+        totals = broker.apply(sale.user_id, sales_total=-sale.total, profit=-sale.profit)
+        return 'kpi', {
+            'type': 'refund',
+            'sales_delta': -sale.total,
+            'profit_delta': -sale.profit,
+            'totals': totals,
+        }
+
+    publish_on_commit(sale.user_id, build)
+
+
+def debt_event(debt, created=False):
+    return 'debt', {
+        'id': debt.id,
+        'customer': debt.customer_id,
+        'status': debt.status,
+        'remaining': debt.remaining_amount,
+        'created': created,
+    }
+
+
+@receiver(post_save, sender=Debt)
+def debt_saved(sender, instance, created, **kwargs):
+    publish_on_commit(instance.user_id, lambda: debt_event(instance, created))
+
+
+def publish_debts_batch(user_id, debts):
+    """bulk_update bilan yozilgan qarzlar uchun (post_save kelmaydi): versiya va har qarzga hodisa"""
+    transaction.on_commit(lambda: bump_data_version(user_id, 'sales'))
+    for debt in debts:
+        publish_on_commit(user_id, lambda debt=debt: debt_event(debt))
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    if instance.status not in ('low_stock', 'out_of_stock'):
+        return
+
+    def build():
+        return 'low_stock', {
+            'id': instance.id,
+            'name': instance.name,
+            'sku': instance.sku,
+            'quantity': instance.quantity,
+            'min_quantity': instance.min_quantity,
+            'status': instance.status,
+        }
+
+    publish_on_commit(instance.user_id, build)
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # Ichki kategoriyalar ildizga chiqadi (parent SET_NULL) - yo'llari ham qisqaradi
+    if instance.path:
+        Category.move_descendants(instance.path, '')
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Customer)
+def catalog_object_deleted(sender, instance, **kwargs):
+    # Kassalar delta so'rovida o'chirilganlarni ham bilishi kerak
+    CatalogTombstone.objects.create(
+        user_id=instance.user_id,
+        kind='product' if sender is Product else 'customer',
+        object_id=instance.pk,
+    )
+
+
+# =============== FRAGMENT CACHE VERSIONS ===============
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def catalog_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_data_version(instance.user_id, 'catalog'))
+
+
+@receiver(post_save, sender=User)
+def profile_changed(sender, instance, **kwargs):
+    # Sahifalarda foydalanuvchi ma'lumotlari ham chiziladi (ETag shu versiyalarga bog'liq)
+    transaction.on_commit(lambda: bump_data_version(instance.pk))
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_save, sender=Purchase)
+@receiver(post_save, sender=GoodsReceipt)
+@receiver(post_save, sender=Debt)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Sale)
+@receiver(post_delete, sender=Purchase)
+@receiver(post_delete, sender=Debt)
+@receiver(post_delete, sender=Customer)
+def sales_changed(sender, instance, **kwargs):
+    # Sotuv va kirimlar mahsulot qoldig'ini ham o'zgartiradi
+    transaction.on_commit(lambda: bump_data_version(instance.user_id, 'sales', 'catalog'))
+
+
+# =============== DAILY ROLLUPS ===============
+def refresh_rollup_on_commit(user_id, *moments):
+    """Vaqtlar tushgan kunlarning yakunlarini commit'dan keyin qayta hisoblash"""
+    days = {timezone.localdate(moment) for moment in moments}
+
+    def refresh():
+        for day in days:
+            DailySalesRollup.refresh_day(user_id, day)
+        # Yakun yozilgandan keyin - oldingi versiya bilan eski yakun keshlanib qolmasin
+        bump_data_version(user_id, 'sales')
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+def sale_rollup_changed(sender, instance, **kwargs):
+    refresh_rollup_on_commit(instance.user_id, instance.sale_date)
+
+
+@receiver(post_save, sender=Customer)
+def customer_rollup_created(sender, instance, created, **kwargs):
+    if created:
+        refresh_rollup_on_commit(instance.user_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Customer)
+def customer_rollup_deleted(sender, instance, **kwargs):
+    refresh_rollup_on_commit(instance.user_id, instance.created_at)
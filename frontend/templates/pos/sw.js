@@ -0,0 +1,87 @@
+{% load static %}// sw.js - kassa (POS) uchun service worker
+'use strict';
+
+importScripts('{% static "js/pos-queue.js" %}');
+
+var CACHE = 'sklat-pos-v3';
+var PRECACHE = [
+    '/pos/',
+    '{% static "js/pos-queue.js" %}',
+    '{% static "js/pos.js" %}',
+    '{% static "img/sklatlogo.png" %}'
+];
+
+self.addEventListener('install', function (event) {
+    event.waitUntil(
+        caches.open(CACHE).then(function (cache) {
+            // Kirilmagan bo'lsa ba'zi sahifalar login'ga yo'naltiradi - bittasi xato bo'lsa ham o'rnatiladi
+            return Promise.all(PRECACHE.map(function (url) {
+                return cache.add(new Request(url, { credentials: 'same-origin' })).catch(function () {});
+            }));
+        }).then(function () { return self.skipWaiting(); })
+    );
+});
+
+self.addEventListener('activate', function (event) {
+    event.waitUntil(
+        caches.keys().then(function (keys) {
+            return Promise.all(keys.filter(function (key) { return key !== CACHE; }).map(function (key) {
+                return caches.delete(key);
+            }));
+        }).then(function () { return self.clients.claim(); })
+    );
+});
+
+function networkFirst(request) {
+    return fetch(request).then(function (response) {
+        if (response.ok && !response.redirected) {
+            var copy = response.clone();
+            caches.open(CACHE).then(function (cache) { cache.put(request, copy); });
+        }
+        return response;
+    }).catch(function () {
+        return caches.match(request, { ignoreSearch: true });
+    });
+}
+
+function cacheFirst(request) {
+    return caches.match(request).then(function (cached) {
+        return cached || fetch(request).then(function (response) {
+            if (response.ok) {
+                var copy = response.clone();
+                caches.open(CACHE).then(function (cache) { cache.put(request, copy); });
+            }
+            return response;
+        });
+    });
+}
+
+self.addEventListener('fetch', function (event) {
+    var request = event.request;
+    var url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+    // Katalog sahifaning o'zida (IndexedDB) saqlanadi va delta bilan yangilanadi - bu yerda keshlanmaydi
+    if (url.pathname === '/pos/') {
+        event.respondWith(networkFirst(request));
+    } else if (url.pathname.indexOf('{% get_static_prefix %}') === 0) {
+        // Static fayllar hash nomli - o'zgarmaydi
+        event.respondWith(cacheFirst(request));
+    }
+});
+
+self.addEventListener('sync', function (event) {
+    // Teg: pos-sync-<foydalanuvchi id> - navbat shu foydalanuvchining bazasida
+    if (event.tag.indexOf('pos-sync-') === 0) {
+        event.waitUntil(
+            PosQueue.use(event.tag.slice('pos-sync-'.length)).flush().then(function (summary) {
+                return self.clients.matchAll().then(function (clients) {
+                    clients.forEach(function (client) {
+                        client.postMessage({ type: 'pos-synced', summary: summary });
+                    });
+                });
+            })
+        );
+    }
+});
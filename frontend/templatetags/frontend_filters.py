@@ -0,0 +1,16 @@
+# frontend_filters.py
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def split(value, separator=','):
+    """Satrni ro'yxatga ajratish: "a,b,c"|split:"," """
+    return str(value).split(separator)
+
+
+@register.filter
+def thumbnail(product, width):
+    """Mahsulot rasmining kerakli kenglikdagi varianti: {{ product|thumbnail:160 }}"""
+    return product.thumbnail_url(int(width))
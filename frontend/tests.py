@@ -1,3 +1,1112 @@
-from django.test import TestCase
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from beckend import warmup
+
+from . import catalog, images, profiling
+from .caching import bump_data_version, data_version
+from .classification import abc_classes, xyz_classes
+from .forecasting import forecast
+from .live import broker
+from .segmentation import quintile_scores
+from .models import (
+    Category, Customer, DailySalesRollup, Debt, DebtAging, DemandForecast, GoodsReceipt, Product, Purchase,
+    ReorderPoint, Sale, StockMovement, StockSnapshot,
+)
+
+
+class ApiQueryBudgetTests(TestCase):
+    """
+    REST API v1: so'rovlar soni qatorlar soniga bog'liq bo'lmasligi (N+1 yo'q)
+    va belgilangan byudjetdan oshmasligi kerak.
+    """
+    # Sessiya + foydalanuvchi + asosiy SELECT (+ ehtiyot uchun bittasi)
+    LIST_BUDGET = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('api', password='api-pass')
+        cls.other = User.objects.create_user('other', password='other-pass')
+        cls.category = Category.objects.create(name='Ichimliklar', user=cls.user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def populate(self, count, start=0):
+        """`count` ta mahsulot, mijoz, kirim, sotuv va qarz"""
+        for i in range(start, start + count):
+            product = Product.objects.create(
+                name=f"Mahsulot {i}", sku=f"SKU{i:05d}", category=self.category, user=self.user,
+                purchase_price=Decimal('1000'), sale_price=Decimal('1500'), quantity=Decimal('100'),
+            )
+            customer = Customer.objects.create(first_name='Mijoz', last_name=str(i), phone=f"99890{i:07d}", user=self.user)
+            Purchase.objects.create(product=product, supplier=customer, quantity=Decimal('5'),
+                                    price=Decimal('1000'), user=self.user)
+            sale = Sale.objects.create(product=product, customer=customer, quantity=Decimal('2'),
+                                       price=Decimal('1500'), payment_method='credit', user=self.user)
+            Debt.objects.create(customer=customer, sale=sale, amount=sale.total,
+                                due_date=date.today() + timedelta(days=30), user=self.user)
+
+    def count_queries(self, method, url, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, **kwargs)
+        self.assertLess(response.status_code, 300, response.content[:500])
+        return len(queries), response
+
+    def test_list_endpoints_do_not_grow_with_rows(self):
+        urls = ['/api/v1/products/', '/api/v1/customers/', '/api/v1/sales/',
+                '/api/v1/purchases/', '/api/v1/debts/']
+        self.populate(3)
+        small = {url: self.count_queries('get', url)[0] for url in urls}
+        self.populate(17, start=3)
+        for url in urls:
+            with self.subTest(url=url):
+                queries, response = self.count_queries('get', url)
+                self.assertEqual(len(response.json()['results']), 20)
+                self.assertEqual(queries, small[url])
+                self.assertLessEqual(queries, self.LIST_BUDGET)
+
+    def test_bad_filter_value_is_400(self):
+        for url in ('/api/v1/products/?category=abc', '/api/v1/sales/?customer=abc', '/api/v1/sales/?date_from=abc'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_sparse_fields(self):
+        self.populate(2)
+        _, response = self.count_queries('get', '/api/v1/products/?fields=name,sale_price')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'name', 'sale_price'})
+
+    def test_keyset_pagination_walks_all_rows(self):
+        self.populate(7)
+        seen, url = [], '/api/v1/products/?limit=3'
+        while url:
+            queries, response = self.count_queries('get', url)
+            self.assertLessEqual(queries, self.LIST_BUDGET)
+            data = response.json()
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_tenant_isolation(self):
+        foreign = Product.objects.create(name='Begona', sku='FOREIGN1', user=self.other,
+                                         purchase_price=1, sale_price=2)
+        response = self.client.get(f'/api/v1/products/{foreign.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_bulk_create_products_is_constant(self):
+        def rows(prefix, count):
+            return [{'name': f"{prefix} {i}", 'sku': f"{prefix}{i:04d}", 'category': str(self.category.pk),
+                     'purchase_price': '100', 'sale_price': '150', 'quantity': '10'} for i in range(count)]
+
+        # SQLite bitta INSERT'ga ~47 qator sig'diradi (parametrlar chegarasi) - paket shundan kichik
+        small, _ = self.count_queries('post', '/api/v1/products/bulk/', data=rows('A', 2), content_type='application/json')
+        large, response = self.count_queries('post', '/api/v1/products/bulk/', data=rows('B', 40), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()), 40)
+        self.assertEqual(small, large)
+        self.assertEqual(Product.objects.filter(user=self.user).count(), 42)
+
+    def test_bulk_rejects_duplicate_sku(self):
+        Product.objects.create(name='Bor', sku='TAKEN', user=self.user, purchase_price=1, sale_price=2)
+        response = self.client.post('/api/v1/products/bulk/', data=[
+            {'name': 'Yangi', 'sku': 'TAKEN', 'purchase_price': '1', 'sale_price': '2'},
+        ], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update_customers_is_constant(self):
+        self.populate(20)
+        customers = list(Customer.objects.filter(user=self.user).values_list('pk', flat=True))
+
+        def patch(ids, kind):
+            return self.count_queries('patch', '/api/v1/customers/bulk/', content_type='application/json',
+                                      data=[{'id': str(pk), 'customer_type': kind} for pk in ids])
+
+        small, _ = patch(customers[:2], 'vip')
+        large, response = patch(customers, 'wholesale')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(small, large)
+        self.assertEqual(Customer.objects.filter(customer_type='wholesale').count(), 20)
+
+    def test_credit_sale_creates_debt(self):
+        self.populate(1)
+        product, customer = Product.objects.get(user=self.user), Customer.objects.get(user=self.user)
+        _, response = self.count_queries('post', '/api/v1/sales/', content_type='application/json', data={
+            'product': str(product.pk), 'customer': str(customer.pk), 'quantity': '2', 'price': '1500',
+            'payment_method': 'credit',
+        })
+        self.assertEqual(response.status_code, 201)
+        debt = Debt.objects.get(sale_id=response.json()['id'])
+        self.assertEqual((debt.customer_id, debt.amount, debt.status), (customer.pk, Decimal('3000'), 'pending'))
+
+    def test_bulk_sales_are_idempotent(self):
+        self.populate(1)
+        product = Product.objects.get(user=self.user)
+        rows = [{'id': f"00000000-0000-4000-8000-{i:012d}", 'product_id': str(product.pk),
+                 'quantity': '1', 'price': '1500'} for i in range(5)]
+
+        _, response = self.count_queries('post', '/api/v1/sales/bulk/', data=rows, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        _, replay = self.count_queries('post', '/api/v1/sales/bulk/', data=rows, content_type='application/json')
+        self.assertEqual({row['status'] for row in replay.json()['results']}, {'duplicate'})
+        product.refresh_from_db()
+        self.assertEqual(product.quantity, Decimal('100') + 5 - 2 - 5)
+
+
+class DebtAllocationTests(TestCase):
+    """Debt.allocate_payment: to'lov ochiq qarzlarga muddat bo'yicha (FIFO) taqsimlanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('debts', password='debts-pass')
+        cls.product = Product.objects.create(name='Un', sku='UN0001', user=cls.user, purchase_price=Decimal('50'),
+                                             sale_price=Decimal('100'), quantity=Decimal('100'))
+        cls.customer = Customer.objects.create(first_name='Mijoz', last_name='Qarzdor', phone='998901234567', user=cls.user)
+
+    def setUp(self):
+        # Keyinroq ochilgan, lekin muddati oldinroq qarz birinchi yopiladi
+        self.later = self.debt(Decimal('1'), days=20)
+        self.earlier = self.debt(Decimal('1.5'), days=10)
+
+    def debt(self, quantity, days):
+        sale = Sale.objects.create(product=self.product, customer=self.customer, quantity=quantity,
+                                   price=Decimal('100'), payment_method='credit', user=self.user)
+        return Debt.objects.create(customer=self.customer, sale=sale, amount=sale.total,
+                                   due_date=date.today() + timedelta(days=days), user=self.user)
+
+    def allocate(self, amount):
+        with self.captureOnCommitCallbacks(execute=True):
+            allocations, remaining = Debt.allocate_payment(self.customer, amount)
+        self.earlier.refresh_from_db()
+        self.later.refresh_from_db()
+        return allocations, remaining
+
+    def test_partial_payment_goes_to_earliest_due(self):
+        allocations, remaining = self.allocate(Decimal('100'))
+        self.assertEqual([(debt.pk, applied) for debt, applied in allocations], [(self.earlier.pk, Decimal('100'))])
+        self.assertEqual(remaining, 0)
+        self.assertEqual((self.earlier.status, self.earlier.paid_amount), ('partially_paid', Decimal('100')))
+        self.assertEqual((self.later.status, self.later.paid_amount), ('pending', 0))
+
+    def test_exact_payment_closes_all(self):
+        _, remaining = self.allocate(Decimal('250'))
+        self.assertEqual(remaining, 0)
+        for debt in (self.earlier, self.later):
+            self.assertEqual(debt.status, 'paid')
+            self.assertEqual(debt.paid_date, date.today())
+            self.assertEqual(debt.remaining_amount, 0)
+
+    def test_overpayment_is_returned(self):
+        allocations, remaining = self.allocate(Decimal('300'))
+        self.assertEqual(remaining, Decimal('50'))
+        self.assertEqual(sum(applied for _, applied in allocations), Decimal('250'))
+        self.assertEqual({self.earlier.status, self.later.status}, {'paid'})
+
+    def test_bumps_sales_version(self):
+        before = data_version(self.user.id, 'sales')
+        self.allocate(Decimal('10'))
+        self.assertNotEqual(data_version(self.user.id, 'sales'), before)
+
+
+class GoodsReceiptTests(TestCase):
+    """GoodsReceipt.receive: bir faktura ikki marta yuborilsa ombor bir marta o'zgaradi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('receipts', password='receipts-pass')
+        cls.products = [
+            Product.objects.create(name=f"Mahsulot {i}", sku=f"RC{i:04d}", user=cls.user, purchase_price=Decimal('10'),
+                                   sale_price=Decimal('20'), quantity=Decimal('5'))
+            for i in range(2)
+        ]
+
+    def test_receive_is_idempotent(self):
+        lines = [
+            {'product_id': self.products[0].pk, 'quantity': Decimal('3'), 'price': Decimal('10')},
+            {'product_id': self.products[0].pk, 'quantity': Decimal('2'), 'price': Decimal('16')},
+            {'product_id': self.products[1].pk, 'quantity': Decimal('4'), 'price': Decimal('10')},
+        ]
+        receipt, created = GoodsReceipt.receive(self.user, 'INV-1', lines)
+        replay, replay_created = GoodsReceipt.receive(self.user, 'INV-1', lines)
+
+        self.assertTrue(created)
+        self.assertFalse(replay_created)
+        self.assertEqual(replay.pk, receipt.pk)
+        self.assertEqual(Purchase.objects.filter(receipt=receipt).count(), 3)
+        self.assertEqual(StockMovement.objects.filter(purchase__receipt=receipt).count(), 3)
+        first, second = (Product.objects.get(pk=product.pk) for product in self.products)
+        self.assertEqual(first.quantity, Decimal('10'))
+        self.assertEqual(second.quantity, Decimal('9'))
+        # (5*10 + 3*10 + 2*16) / 10
+        self.assertEqual(first.avg_cost, Decimal('11.20'))
+
+    def test_unknown_product_rolls_back(self):
+        lines = [{'product_id': self.products[0].pk, 'quantity': Decimal('1'), 'price': Decimal('10')},
+                 {'product_id': uuid.uuid4(), 'quantity': Decimal('1'), 'price': Decimal('10')}]
+        with self.assertRaises(ValueError):
+            GoodsReceipt.receive(self.user, 'INV-2', lines)
+        self.assertFalse(GoodsReceipt.objects.filter(invoice_number='INV-2').exists())
+        self.assertEqual(Product.objects.get(pk=self.products[0].pk).quantity, Decimal('5'))
+
+
+class OfflineIngestTests(TestCase):
+    """Sale.ingest_offline: takroriy va band id'lar, qoldiq ziddiyatlari"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('kassa', password='kassa-pass')
+        cls.other = User.objects.create_user('begona', password='begona-pass')
+        cls.product = Product.objects.create(name='Non', sku='NON001', user=cls.user, purchase_price=Decimal('2000'),
+                                             sale_price=Decimal('3000'), quantity=Decimal('3'))
+        foreign_product = Product.objects.create(name='Non', sku='NON002', user=cls.other,
+                                                 purchase_price=Decimal('1'), sale_price=Decimal('2'), quantity=10)
+        cls.foreign_sale = Sale.objects.create(product=foreign_product, quantity=1, price=2, user=cls.other)
+
+    def row(self, quantity='1', sale_id=None, product_id=None):
+        return {'id': sale_id or uuid.uuid4(), 'product_id': product_id or self.product.pk,
+                'quantity': Decimal(quantity), 'price': Decimal('3000')}
+
+    def ingest(self, rows):
+        results, conflicts = Sale.ingest_offline(self.user, rows)
+        return [result['status'] for result in results], conflicts
+
+    def test_replayed_and_repeated_ids_are_duplicates(self):
+        first = self.row()
+        statuses, _ = self.ingest([first, dict(first)])
+        self.assertEqual(statuses, ['created', 'duplicate'])
+        statuses, _ = self.ingest([first])
+        self.assertEqual(statuses, ['duplicate'])
+        self.assertEqual(Sale.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).quantity, Decimal('2'))
+
+    def test_id_of_another_tenant_is_duplicate(self):
+        results, _ = Sale.ingest_offline(self.user, [self.row(sale_id=self.foreign_sale.pk), self.row()])
+        self.assertEqual([result['status'] for result in results], ['duplicate', 'created'])
+        self.assertEqual(Sale.objects.get(pk=self.foreign_sale.pk).user, self.other)
+
+    def test_foreign_product_is_rejected(self):
+        foreign_product = self.foreign_sale.product_id
+        statuses, _ = self.ingest([self.row(product_id=foreign_product)])
+        self.assertEqual(statuses, ['rejected'])
+
+    def test_shortfall_is_recorded_as_conflict(self):
+        statuses, conflicts = self.ingest([self.row('2'), self.row('2')])
+        self.assertEqual(statuses, ['created', 'created'])
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(conflicts[0]['product_id'], self.product.pk)
+        self.assertEqual(Product.objects.get(pk=self.product.pk).quantity, Decimal('-1'))
+
+
+class DebtStatusTests(TestCase):
+    """Debt.mark_overdue, DebtAging.rebuild: muddati o'tgan qarzlar ochiq qarz sifatida hisoblanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('aging', password='aging-pass')
+        cls.product = Product.objects.create(name='Shakar', sku='SH0001', user=cls.user, purchase_price=Decimal('50'),
+                                             sale_price=Decimal('100'), quantity=Decimal('100'))
+        cls.customer = Customer.objects.create(first_name='Mijoz', last_name='Kechikkan', phone='998907654321', user=cls.user)
+
+    def debt(self, due_in, paid=0):
+        sale = Sale.objects.create(product=self.product, customer=self.customer, quantity=Decimal('1'),
+                                   price=Decimal('100'), payment_method='credit', user=self.user)
+        debt = Debt.objects.create(customer=self.customer, sale=sale, amount=sale.total, paid_amount=paid,
+                                   due_date=date.today() + timedelta(days=30), user=self.user)
+        # Muddat o'tib ketgan holat: save() chetlab o'tiladi (tungi buyruq ishlamagan)
+        Debt.objects.filter(pk=debt.pk).update(due_date=date.today() + timedelta(days=due_in))
+        return debt
+
+    def test_mark_overdue_flips_pending_and_partially_paid(self):
+        pending, partial, current = self.debt(-5), self.debt(-40, paid=30), self.debt(5)
+        with self.captureOnCommitCallbacks(execute=True):
+            overdue, restored = Debt.mark_overdue()
+        self.assertEqual((overdue, restored), (2, 0))
+        statuses = dict(Debt.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[pending.pk], 'overdue')
+        self.assertEqual(statuses[partial.pk], 'overdue')
+        self.assertEqual(statuses[current.pk], 'pending')
+
+        # Muddat uzaytirilsa, oldingi holat (to'lov bo'yicha) tiklanadi
+        Debt.objects.update(due_date=date.today() + timedelta(days=10))
+        self.assertEqual(Debt.mark_overdue(), (0, 2))
+        statuses = dict(Debt.objects.values_list('pk', 'status'))
+        self.assertEqual((statuses[pending.pk], statuses[partial.pk]), ('pending', 'partially_paid'))
+
+    def test_overdue_debt_counts_as_open(self):
+        self.debt(-5)
+        self.debt(5, paid=40)
+        Debt.mark_overdue()
+        self.assertEqual(self.customer.total_debt, Decimal('160'))
+        self.assertEqual(self.customer.debt_count, 2)
+
+    def test_aging_buckets(self):
+        self.debt(5)
+        self.debt(-10)
+        self.debt(-45, paid=20)
+        self.debt(-120)
+        Debt.mark_overdue()
+        DebtAging.rebuild()
+        row = DebtAging.objects.get(user=self.user, customer=self.customer)
+        self.assertEqual((row.current, row.days_0_30, row.days_31_60, row.days_90_plus),
+                         (Decimal('100'), Decimal('100'), Decimal('80'), Decimal('100')))
+        self.assertEqual((row.total, row.debt_count), (Decimal('380'), 4))
+
+    def test_debt_aging_api_rejects_bad_customer(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/api/debt-aging/?customer=abc').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/debt-aging/?customer={self.customer.pk}').status_code, 200)
+
+
+class StockLedgerTests(TestCase):
+    """StockMovement jurnali: sotuv/qaytarish yozuvlari va StockMovement.stock_at"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('ombor', password='ombor-pass')
+
+    def setUp(self):
+        self.product = Product.objects.create(name='Guruch', sku='GR0001', user=self.user, purchase_price=Decimal('50'),
+                                              sale_price=Decimal('100'), quantity=Decimal('10'))
+
+    def sell(self, quantity):
+        return Sale.objects.create(product=self.product, quantity=Decimal(quantity), price=Decimal('100'), user=self.user)
+
+    def quantity(self):
+        return Product.objects.get(pk=self.product.pk).quantity
+
+    def test_resave_and_double_refund_change_stock_once(self):
+        sale = self.sell('3')
+        sale.notes = "Izoh"
+        sale.save()
+        self.assertEqual(self.quantity(), Decimal('7'))
+        self.assertEqual(StockMovement.objects.filter(sale=sale, kind='sale').count(), 1)
+
+        self.assertTrue(sale.refund())
+        self.assertFalse(Sale.objects.get(pk=sale.pk).refund())
+        self.assertEqual(self.quantity(), Decimal('10'))
+        self.assertEqual(StockMovement.objects.filter(sale=sale, kind='return').count(), 1)
+
+    def test_stock_at_with_and_without_snapshot(self):
+        self.sell('3')
+        StockSnapshot.take(Product.objects.filter(pk=self.product.pk))
+        two_days_ago = timezone.now() - timedelta(days=2)
+        StockMovement.objects.update(created_at=two_days_ago)
+        StockSnapshot.objects.update(taken_at=two_days_ago)
+        self.sell('2')
+
+        yesterday = timezone.now() - timedelta(days=1)
+        products = Product.objects.filter(pk=self.product.pk)
+        self.assertEqual(StockMovement.stock_at(yesterday, products), {self.product.pk: Decimal('7')})
+        self.assertEqual(StockMovement.stock_at(timezone.now(), products), {self.product.pk: Decimal('5')})
+        StockSnapshot.objects.all().delete()
+        self.assertEqual(StockMovement.stock_at(yesterday, products), {self.product.pk: Decimal('7')})
+
+    def test_stock_at_api_rejects_bad_product(self):
+        self.client.force_login(self.user)
+        today = date.today().isoformat()
+        self.assertEqual(self.client.get(f'/api/stock-at/?date={today}&product=abc').status_code, 400)
+        response = self.client.get(f'/api/stock-at/?date={today}&product={self.product.pk}')
+        self.assertEqual(response.json()['products'][0]['quantity'], 10.0)
+
+
+class DailySalesRollupTests(TestCase):
+    """DailySalesRollup: signallar, qaytarish va bulk API'dan keyin yakun sotuvlarga mos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('yakun', password='yakun-pass')
+        cls.product = Product.objects.create(name='Yog\'', sku='YG0001', user=cls.user, purchase_price=Decimal('60'),
+                                             sale_price=Decimal('100'), quantity=Decimal('100'))
+
+    def today(self):
+        row = DailySalesRollup.objects.filter(user=self.user, date=timezone.localdate()).first()
+        return row and (row.revenue, row.profit, row.sales_count, row.new_customers)
+
+    def test_sale_and_refund_refresh_the_day(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            kept = Sale.objects.create(product=self.product, quantity=2, price=Decimal('100'), user=self.user)
+            refunded = Sale.objects.create(product=self.product, quantity=1, price=Decimal('100'), user=self.user)
+        self.assertEqual(self.today(), (Decimal('300'), Decimal('120'), 2, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            refunded.refund()
+        self.assertEqual(self.today(), (kept.total, kept.profit, 1, 0))
+
+    def test_bulk_created_customers_are_counted(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/customers/bulk/', content_type='application/json', data=[
+                {'first_name': 'A', 'last_name': str(i), 'phone': f"99893000000{i}"} for i in range(3)
+            ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.today()[3], 3)
+
+    def test_rebuild_covers_users_with_customers_only(self):
+        other = User.objects.create_user('mijozlar', password='mijozlar-pass')
+        Customer.objects.create(first_name='Faqat', last_name='Mijoz', phone='998931111111', user=other)
+        DailySalesRollup.objects.all().delete()
+        call_command('rollup_daily_sales', stdout=StringIO())
+        self.assertEqual(DailySalesRollup.objects.get(user=other).new_customers, 1)
+
+    def test_compare_against_previous_period_and_last_year(self):
+        today = timezone.localdate()
+        for day, revenue in ((today, 200), (today - timedelta(days=7), 100), (DailySalesRollup.year_ago(today), 400)):
+            DailySalesRollup.objects.create(user=self.user, date=day, revenue=revenue, profit=revenue / 2, sales_count=2)
+        result = DailySalesRollup.compare(self.user, today, today, (today - timedelta(days=7),) * 2)
+        self.assertEqual(result['current']['revenue'], 200)
+        self.assertEqual(result['current']['avg_basket'], 100)
+        self.assertEqual(result['change']['previous']['revenue'], 100.0)
+        self.assertEqual(result['change']['last_year']['revenue'], -50.0)
+
+
+class LiveTotalsTests(TestCase):
+    """Jonli KPI: farqlar bo'yicha yuritilgan yakun qayta ulanishdagi snapshot bilan bir xil"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jonli', password='jonli-pass')
+        cls.product = Product.objects.create(name='Tuz', sku='TZ0001', user=cls.user, purchase_price=Decimal('10'),
+                                             sale_price=Decimal('20'), quantity=Decimal('100'))
+
+    def tearDown(self):
+        broker._totals.pop(self.user.pk, None)
+
+    def test_deltas_match_snapshot_after_refund(self):
+        broker.snapshot(self.user.pk)
+        with mock.patch.object(broker, 'has_subscribers', return_value=True), \
+                mock.patch.object(broker, 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                Sale.objects.create(product=self.product, quantity=3, price=Decimal('20'), user=self.user)
+                sale = Sale.objects.create(product=self.product, quantity=2, price=Decimal('20'), user=self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                sale.refund()
+
+        events = [call.args[2]['type'] for call in publish.call_args_list if call.args[1] == 'kpi']
+        self.assertEqual(events, ['sale', 'sale', 'refund'])
+        followed = broker.snapshot(self.user.pk)
+        reconnected = broker.compute_totals(self.user.pk, followed['date'])
+        self.assertEqual((followed['sales_total'], followed['profit']), (Decimal('60'), Decimal('30')))
+        self.assertEqual(reconnected, followed)
+
+
+class DemandForecastTests(TestCase):
+    """forecasting.forecast va DemandForecast -> ReorderPoint zanjiri"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('prognoz', password='prognoz-pass')
+        cls.product = Product.objects.create(name='Sut', sku='ST0001', user=cls.user, purchase_price=Decimal('8'),
+                                             sale_price=Decimal('10'), quantity=Decimal('500'))
+
+    def test_short_history(self):
+        result, methods, mae = forecast(np.array([[3.0], [0.0]]), 5)
+        self.assertEqual(result.shape, (2, 5))
+        self.assertEqual(result[0].tolist(), [3.0] * 5)
+        self.assertEqual(methods.tolist(), ['ses', 'none'])
+        self.assertEqual(mae.tolist(), [0, 0])
+        result, methods, _ = forecast(np.zeros((1, 0)), 3)
+        self.assertEqual((result.tolist(), methods.tolist()), ([[0, 0, 0]], ['none']))
+
+    def test_weekly_pattern_is_seasonal(self):
+        history = np.tile([10.0, 0, 0, 0, 0, 0, 0], (1, 8))
+        result, methods, _ = forecast(history, 7)
+        self.assertEqual(methods[0], 'seasonal_naive')
+        self.assertEqual(result[0].tolist(), [10.0, 0, 0, 0, 0, 0, 0])
+
+    def test_forecast_feeds_reorder_point(self):
+        now = timezone.now()
+        for days_ago in range(1, 29):
+            sale = Sale.objects.create(product=self.product, quantity=2, price=Decimal('10'), user=self.user)
+            Sale.objects.filter(pk=sale.pk).update(sale_date=now - timedelta(days=days_ago))
+
+        self.assertEqual(DemandForecast.rebuild(self.user, now=now), 1)
+        prediction = DemandForecast.objects.get(product=self.product)
+        self.assertAlmostEqual(prediction.daily[0], 2, places=1)
+        ReorderPoint.rebuild(self.user, now=now)
+        reorder = ReorderPoint.objects.get(product=self.product)
+        self.assertEqual(reorder.avg_daily_sales,
+                         Decimal(DemandForecast.demand_over(prediction.daily, 21) / 21).quantize(Decimal('0.001')))
+        self.assertGreaterEqual(reorder.reorder_point, Decimal('14'))
+
+
+class CustomerSegmentTests(TestCase):
+    """Customer.compute_segments: RFM ballari va segmentlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('rfm', password='rfm-pass')
+        cls.product = Product.objects.create(name='Choy', sku='CH0001', user=cls.user, purchase_price=Decimal('10'),
+                                             sale_price=Decimal('20'), quantity=Decimal('1000'))
+
+    def customer(self, index, purchases, days_ago, price='20'):
+        customer = Customer.objects.create(first_name='Mijoz', last_name=str(index), phone=f"99894000000{index}",
+                                           user=self.user)
+        for _ in range(purchases):
+            sale = Sale.objects.create(product=self.product, customer=customer, quantity=1, price=Decimal(price),
+                                       user=self.user)
+            Sale.objects.filter(pk=sale.pk).update(sale_date=timezone.now() - timedelta(days=days_ago))
+        return customer
+
+    def test_quintiles_keep_ties_together(self):
+        self.assertEqual(quintile_scores([1, 1, 1, 1, 5]).tolist(), [3, 3, 3, 3, 5])
+        self.assertEqual(quintile_scores([]).tolist(), [])
+
+    def test_segments(self):
+        best = self.customer(1, 6, days_ago=1, price='100')
+        for index in range(2, 5):
+            self.customer(index, 2, days_ago=30 * index)
+        worst = self.customer(5, 1, days_ago=300, price='5')
+        refunded = self.customer(6, 1, days_ago=2)
+        Sale.objects.get(customer=refunded).refund()
+
+        self.assertEqual(Customer.compute_segments(self.user), 5)
+        best.refresh_from_db()
+        worst.refresh_from_db()
+        refunded.refresh_from_db()
+        self.assertEqual((best.rfm_recency, best.rfm_frequency, best.rfm_monetary, best.segment), (5, 5, 5, 'champions'))
+        self.assertEqual((worst.rfm_recency, worst.segment), (1, 'lost'))
+        self.assertEqual(refunded.segment, '')
+
+
+class AbcXyzTests(TestCase):
+    """ABC (daromad ulushi) va XYZ (haftalik talab barqarorligi) tasnifi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('abc', password='abc-pass')
+
+    def test_abc_and_xyz_thresholds(self):
+        self.assertEqual(abc_classes([800, 150, 50, 0]).tolist(), ['A', 'B', 'C', 'C'])
+        self.assertEqual(abc_classes([0, 0]).tolist(), ['C', 'C'])
+        demand = np.array([[5, 5, 5, 5], [10, 0, 10, 0], [20, 0, 0, 0], [0, 0, 0, 0]], dtype=float)
+        self.assertEqual(xyz_classes(demand)[0].tolist(), ['X', 'Y', 'Z', 'Z'])
+
+    def test_classify_products(self):
+        steady, bursty, idle = (
+            Product.objects.create(name=name, sku=f"AX{i:04d}", user=self.user, purchase_price=Decimal('1'),
+                                   sale_price=Decimal('10'), quantity=Decimal('1000'))
+            for i, name in enumerate(('Doimiy', 'Tasodifiy', "Sotilmaydi"))
+        )
+        today = timezone.localdate()
+        monday = today - timedelta(days=today.weekday())
+        for week in range(4):
+            moment = timezone.make_aware(datetime.combine(monday - timedelta(days=7 * week + 3), time(12)))
+            for product, quantity in ((steady, 10), (bursty, 8 if week == 0 else 0)):
+                if quantity:
+                    sale = Sale.objects.create(product=product, quantity=quantity, price=Decimal('10'), user=self.user)
+                    Sale.objects.filter(pk=sale.pk).update(sale_date=moment)
+
+        self.assertEqual(Product.classify_abc_xyz(self.user, weeks=4), 3)
+        classes = dict(Product.objects.filter(user=self.user).values_list('pk', 'abc_class'))
+        xyz = dict(Product.objects.filter(user=self.user).values_list('pk', 'xyz_class'))
+        self.assertEqual((classes[steady.pk], xyz[steady.pk]), ('A', 'X'))
+        self.assertEqual((classes[bursty.pk], xyz[bursty.pk]), ('B', 'Z'))
+        self.assertEqual((classes[idle.pk], xyz[idle.pk]), ('C', 'Z'))
+
+
+class SalesHeatmapTests(TestCase):
+    """Sale.heatmap: mahalliy vaqtdagi hafta kuni x soat, qaytarilgan sotuvlarsiz"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('issiqlik', password='issiqlik-pass')
+        cls.product = Product.objects.create(name='Kofe', sku='KF0001', user=cls.user, purchase_price=Decimal('10'),
+                                             sale_price=Decimal('20'), quantity=Decimal('100'))
+
+    def sell(self, moment=None):
+        sale = Sale.objects.create(product=self.product, quantity=1, price=Decimal('20'), user=self.user)
+        if moment:
+            Sale.objects.filter(pk=sale.pk).update(sale_date=moment)
+        return sale
+
+    def test_local_weekday_and_hour(self):
+        today = timezone.localdate()
+        monday = today - timedelta(days=today.weekday() + 7)
+        self.sell(timezone.make_aware(datetime.combine(monday, time(9, 30))))
+        # Yakshanba 23:30 mahalliy vaqt (UTC'da 18:30) - soat mahalliy vaqtda olinadi
+        self.sell(timezone.make_aware(datetime.combine(monday + timedelta(days=6), time(23, 30))))
+        self.sell(timezone.make_aware(datetime.combine(monday, time(9, 45)))).refund()
+
+        data = Sale.heatmap(self.user, monday, monday + timedelta(days=6))
+        self.assertEqual(data['count'][0][9], 1)
+        self.assertEqual(data['revenue'][0][9], 20.0)
+        self.assertEqual(data['count'][6][23], 1)
+        self.assertEqual(sum(map(sum, data['count'])), 2)
+
+    def test_api_sees_new_sales_today(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sell()
+        first = self.client.get('/api/sales-heatmap/').json()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sell()
+        second = self.client.get('/api/sales-heatmap/').json()
+        self.assertEqual(sum(map(sum, second['count'])), sum(map(sum, first['count'])) + 1)
+        self.assertEqual(self.client.get('/api/sales-heatmap/?from=abc').status_code, 400)
+
+
+class ConditionalGetTests(TestCase):
+    """Versiya ETag'lari (faqat umumiy kesh bilan) va gzip"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('etag', password='etag-pass')
+        cls.product = Product.objects.create(name='Asal', sku='AS0001', user=cls.user, purchase_price=Decimal('10'),
+                                             sale_price=Decimal('20'), quantity=Decimal('100'))
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_not_modified_until_data_changes(self):
+        response = self.client.get('/api/kpi-compare/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/kpi-compare/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            Sale.objects.create(product=self.product, quantity=1, price=Decimal('20'), user=self.user)
+        response = self.client.get('/api/kpi-compare/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_no_version_etag_without_shared_cache(self):
+        # Faqat ConditionalGetMiddleware'ning kontent ETag'i qoladi
+        response = self.client.get('/api/kpi-compare/')
+        self.assertNotIn('no-cache', response.get('Cache-Control', ''))
+
+    def test_json_is_gzipped(self):
+        response = self.client.get('/api/sales-heatmap/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class ProfilingTests(TestCase):
+    """Staff profillari, tasodifiy tanlov o'chiq va profillarni tozalash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('prof-staff', password='prof-pass', is_staff=True)
+        cls.user = User.objects.create_user('prof-user', password='prof-pass')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        patcher = override_settings(PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=0)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/api/kpi-compare/?_profile=1')
+        name = response['X-Profile-Id']
+        self.assertTrue((self.directory / f"{name}.prof").exists())
+        meta = profiling.load(name)
+        self.assertEqual(meta['reason'], 'staff')
+        self.assertEqual(meta['sql_count'], len(meta['sql']))
+        self.assertGreater(meta['sql_count'], 0)
+
+    def test_other_users_are_not_profiled(self):
+        self.client.force_login(self.user)
+        self.assertFalse(self.client.get('/api/kpi-compare/?_profile=1').has_header('X-Profile-Id'))
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_prune_keeps_newest(self):
+        today = timezone.localdate()
+        names = [f"{today - timedelta(days=days):%Y%m%d}-120000-{days:08x}" for days in range(3)]
+        for name in names:
+            (self.directory / f"{name}.json").write_text('{}')
+            (self.directory / f"{name}.prof").write_text('')
+        with override_settings(PROFILING_MAX_FILES=2, PROFILING_MAX_AGE_DAYS=30):
+            profiling.prune()
+        self.assertEqual(sorted(path.stem for path in self.directory.glob('*.json')), sorted(names[:2]))
+        self.assertIsNone(profiling.load('../secret'))
+
+
+class AsyncApiTests(TestCase):
+    """Async JSON API: grafik oraliqlari, davr yakuni va tenant bo'yicha qidiruv"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('async-user', password='async-pass')
+        other = User.objects.create_user('async-other', password='async-pass')
+        cls.product = Product.objects.create(name='Choy', sku='CY0001', user=cls.user, purchase_price=Decimal('5'),
+                                             sale_price=Decimal('10'), quantity=Decimal('100'))
+        Product.objects.create(name='Choy', sku='CY0002', user=other, purchase_price=Decimal('5'),
+                               sale_price=Decimal('10'), quantity=Decimal('100'))
+        today = Sale.objects.create(product=cls.product, quantity=2, price=Decimal('10'), user=cls.user)
+        old = Sale.objects.create(product=cls.product, quantity=3, price=Decimal('10'), user=cls.user)
+        Sale.objects.filter(pk=old.pk).update(sale_date=today.sale_date - timedelta(days=3))
+
+    async def test_week_chart_and_summary(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/sales-chart/', {'period': 'week'})
+        payload = response.json()
+        amounts = [point['amount'] for point in payload['data']]
+        self.assertEqual(len(amounts), 7)
+        self.assertEqual(amounts[-1], 20.0)
+        self.assertEqual(amounts[-4], 30.0)
+        self.assertEqual(payload['summary'], {'total': 50.0, 'count': 2})
+
+    async def test_product_search_is_scoped_to_tenant(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/get-products/', {'search': 'Choy'})
+        self.assertEqual([product['sku'] for product in response.json()['products']], ['CY0001'])
+
+    async def test_login_required(self):
+        response = await self.async_client.get('/api/sales-data/')
+        self.assertEqual(response.status_code, 302)
+
+
+class ReorderPointTests(TestCase):
+    """Holatni qayta hisoblash va sotuv tezligi bo'yicha buyurtma nuqtasi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reorder', password='reorder-pass')
+        cls.plenty = cls.product('RP0001', Decimal('128'))
+        cls.short = cls.product('RP0002', Decimal('33'))
+        for product in (cls.plenty, cls.short):
+            Sale.objects.create(product=product, quantity=28, price=Decimal('10'), user=cls.user)
+
+    @classmethod
+    def product(cls, sku, quantity):
+        return Product.objects.create(name=sku, sku=sku, user=cls.user, purchase_price=Decimal('5'),
+                                      sale_price=Decimal('10'), quantity=quantity, min_quantity=Decimal('10'))
+
+    def test_refresh_statuses_keeps_inactive(self):
+        Product.objects.filter(pk=self.plenty.pk).update(quantity=0)
+        Product.objects.filter(pk=self.short.pk).update(status='inactive')
+        Product.refresh_statuses(Product.objects.filter(user=self.user))
+        statuses = dict(Product.objects.filter(user=self.user).values_list('sku', 'status'))
+        self.assertEqual(statuses, {'RP0001': 'out_of_stock', 'RP0002': 'inactive'})
+
+    def test_rebuild_from_velocity(self):
+        self.assertEqual(ReorderPoint.rebuild(self.user), 2)
+        plenty = ReorderPoint.objects.get(product=self.plenty)
+        self.assertEqual(plenty.avg_daily_sales, Decimal('1'))
+        self.assertEqual(plenty.reorder_point, Decimal('10'))
+        self.assertEqual(plenty.days_until_stockout, Decimal('100'))
+        self.assertEqual(plenty.suggested_quantity, 0)
+        short = ReorderPoint.objects.get(product=self.short)
+        self.assertEqual(short.days_until_stockout, Decimal('5'))
+        # (7 + 14) kunlik talab - qoldiq
+        self.assertEqual(short.suggested_quantity, Decimal('16'))
+        self.assertEqual(Product.objects.get(pk=self.short.pk).status, 'low_stock')
+
+
+class MovingAverageCostTests(TestCase):
+    """Kirimda harakatlanuvchi o'rtacha tannarx va sotuv foydasi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('avgcost', password='avgcost-pass')
+        cls.product = Product.objects.create(name='Guruch', sku='MA0001', user=cls.user, purchase_price=Decimal('10'),
+                                             sale_price=Decimal('30'), quantity=Decimal('10'))
+
+    def test_purchase_moves_average_and_sale_uses_it(self):
+        Purchase.objects.create(product=self.product, quantity=Decimal('10'), price=Decimal('20'), user=self.user)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.avg_cost, Decimal('15'))
+        sale = Sale.objects.create(product=self.product, quantity=4, price=Decimal('30'), user=self.user)
+        self.assertEqual(sale.cost, Decimal('60'))
+        self.assertEqual(sale.profit, Decimal('60'))
+        # Qayta saqlash tannarxni o'zgartirmaydi
+        Purchase.objects.create(product=self.product, quantity=Decimal('16'), price=Decimal('40'), user=self.user)
+        sale.notes = 'izoh'
+        sale.save()
+        sale.refresh_from_db()
+        self.assertEqual(sale.cost, Decimal('60'))
+
+    def test_unreceived_purchase_keeps_cost(self):
+        Purchase.objects.create(product=self.product, quantity=Decimal('10'), price=Decimal('20'), user=self.user,
+                                status='pending')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.unit_cost, Decimal('10'))
+        self.assertEqual(self.product.quantity, Decimal('10'))
+
+
+class CategoryPathTests(TestCase):
+    """Kategoriya daraxti yo'llari: ko'chirish, o'chirish va qayta qurish"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tree', password='tree-pass')
+        cls.root = Category.objects.create(name='Oziq-ovqat', user=cls.user)
+        cls.child = Category.objects.create(name='Sut', parent=cls.root, user=cls.user)
+        cls.leaf = Category.objects.create(name='Qatiq', parent=cls.child, user=cls.user)
+        cls.other = Category.objects.create(name='Ichimlik', user=cls.user)
+
+    def test_move_rewrites_subtree(self):
+        self.child.parent = self.other
+        self.child.save()
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.path, f"{self.other.pk.hex}/{self.child.pk.hex}/{self.leaf.pk.hex}/")
+        self.assertEqual(self.leaf.depth, 2)
+        self.assertEqual(self.leaf.get_full_path(), 'Ichimlik → Sut → Qatiq')
+        self.assertEqual(list(self.root.get_descendants()), [])
+
+    def test_move_into_own_subtree_is_rejected(self):
+        self.root.parent = self.leaf
+        with self.assertRaises(ValidationError):
+            self.root.save()
+
+    def test_delete_reroots_children(self):
+        self.root.delete()
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.path, f"{self.child.pk.hex}/{self.leaf.pk.hex}/")
+        self.assertEqual(self.leaf.depth, 1)
+
+    def test_rebuild_paths(self):
+        Category.objects.filter(user=self.user).update(path='', depth=0)
+        Category.rebuild_paths(Category.objects.filter(user=self.user))
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.depth, 2)
+        self.assertEqual(set(self.root.get_descendants()), {self.child, self.leaf})
+
+
+# Sahifa testlari uchun: manifest (collectstatic) talab qilinmaydi
+PLAIN_STATIC = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}}
+
+
+@override_settings(STORAGES=PLAIN_STATIC)
+class FragmentCacheTests(TestCase):
+    """Tenant versiyalari: signal oshiradi, fragment yangi versiya bilan qayta chiziladi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('fragment', password='fragment-pass')
+        cls.other = User.objects.create_user('fragment-other', password='fragment-pass')
+
+    def setUp(self):
+        # Lokal kesh testlar orasida saqlanadi, foydalanuvchi id'lari esa qayta ishlatiladi
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_signals_bump_only_owner_scopes(self):
+        before = {user.pk: [data_version(user.pk, scope) for scope in ('catalog', 'sales')] for user in (self.user, self.other)}
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name='Tuz', sku='FC0001', user=self.user, purchase_price=Decimal('1'),
+                                   sale_price=Decimal('2'), quantity=Decimal('5'))
+        self.assertGreater(data_version(self.user.pk, 'catalog'), before[self.user.pk][0])
+        self.assertEqual(data_version(self.user.pk, 'sales'), before[self.user.pk][1])
+        self.assertEqual([data_version(self.other.pk, scope) for scope in ('catalog', 'sales')], before[self.other.pk])
+
+    def test_bump_survives_evicted_key(self):
+        version = data_version(self.user.pk, 'sales')
+        cache.clear()
+        with mock.patch('frontend.caching.time.time', return_value=timezone.now().timestamp() + 1):
+            bump_data_version(self.user.pk, 'sales')
+        self.assertGreater(data_version(self.user.pk, 'sales'), version)
+
+    def test_customer_list_fragment(self):
+        self.client.get('/mijozlar/')
+        # bulk_create signal yubormaydi - versiya o'zgarmagani uchun eski fragment beriladi
+        Customer.objects.bulk_create([Customer(first_name='Jasur', last_name='Karimov', phone='+998900000101', user=self.user)])
+        self.assertNotContains(self.client.get('/mijozlar/'), 'Karimov')
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(first_name='Dilnoza', last_name='Rahimova', phone='+998900000102', user=self.user)
+        response = self.client.get('/mijozlar/')
+        self.assertContains(response, 'Karimov')
+        self.assertContains(response, 'Rahimova')
+
+
+@override_settings(STORAGES=PLAIN_STATIC)
+class HeadAssetsTests(TestCase):
+    """Sahifa boshi: yig'ilgan lokal assetlar yoki CDN"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('assets', password='assets-pass')
+
+    @override_settings(SELF_HOSTED_ASSETS=True)
+    def test_self_hosted(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/analitika/')
+        self.assertContains(response, '/static/css/app.css')
+        self.assertContains(response, '/static/vendor/echarts/echarts.min.js')
+        self.assertNotContains(response, 'cdn.tailwindcss.com')
+        self.assertNotContains(response, 'cdnjs.cloudflare.com')
+
+    @override_settings(SELF_HOSTED_ASSETS=False)
+    def test_cdn_fallback(self):
+        response = self.client.get('/login/')
+        self.assertContains(response, 'cdn.tailwindcss.com')
+        self.assertNotContains(response, 'echarts')
+
+
+class ThumbnailTests(TestCase):
+    """WebP variantlari: nomlar, kengliklar va o'chirish"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = FileSystemStorage(location=directory.name)
+
+    def save_image(self, name, size):
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new('P', size).save(buffer, 'PNG')
+        return self.storage.save(name, ContentFile(buffer.getvalue()))
+
+    def test_variant_name_keeps_extension(self):
+        self.assertEqual(images.variant_name('products/olma.jpg', 160), 'products/thumbs/olma.jpg-160.webp')
+        self.assertNotEqual(images.variant_name('products/olma.png', 160), images.variant_name('products/olma.jpg', 160))
+
+    def test_generate_and_delete_variants(self):
+        from PIL import Image
+
+        name = self.save_image('products/olma.png', (200, 100))
+        self.assertEqual(images.generate_variants(name, self.storage), [80, 160])
+        with self.storage.open(images.variant_name(name, 160)) as variant:
+            image = Image.open(variant)
+            self.assertEqual((image.format, image.size), ('WEBP', (160, 80)))
+        self.assertFalse(self.storage.exists(images.variant_name(name, 320)))
+        images.delete_variants(name, self.storage)
+        self.assertFalse(self.storage.exists(images.variant_name(name, 80)))
+
+    def test_small_original_gets_smallest_variant(self):
+        name = self.save_image('products/nok.png', (40, 40))
+        self.assertEqual(images.generate_variants(name, self.storage), [80])
+
+
+class CatalogDeltaTests(TestCase):
+    """Kassa katalogi: to'liq snapshot, delta va o'chirilganlar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('catalog', password='catalog-pass')
+        cls.kept = cls.product('CD0001')
+        cls.changed = cls.product('CD0002')
+        cls.removed = cls.product('CD0003')
+        cls.customer = Customer.objects.create(first_name='Aziz', last_name='Nazarov', phone='+998900000201', user=cls.user)
+        # Hammasi kassa oxirgi marta sinxronlashdan oldin yozilgan
+        earlier = timezone.now() - timedelta(days=1)
+        Product.objects.filter(user=cls.user).update(updated_at=earlier)
+        Customer.objects.filter(user=cls.user).update(updated_at=earlier)
+
+    @classmethod
+    def product(cls, sku):
+        return Product.objects.create(name=sku, sku=sku, user=cls.user, purchase_price=Decimal('5'),
+                                      sale_price=Decimal('10'), quantity=Decimal('10'))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_full_snapshot(self):
+        payload = catalog.snapshot(self.user)
+        self.assertTrue(payload['full'])
+        self.assertEqual(sorted(payload['products']['sku']), ['CD0001', 'CD0002', 'CD0003'])
+        self.assertEqual(payload['customers']['name'], ['Aziz Nazarov'])
+
+    def test_delta_since_version(self):
+        since = catalog.to_version(timezone.now() - timedelta(hours=1))
+        self.changed.sale_price = Decimal('12')
+        self.changed.save()
+        removed_id = self.removed.pk
+        self.removed.delete()
+        self.customer.is_active = False
+        self.customer.save()
+
+        payload = catalog.snapshot(self.user, since)
+        self.assertFalse(payload['full'])
+        self.assertEqual(payload['products']['id'], [self.changed.pk])
+        self.assertEqual(payload['products']['price'], [12.0])
+        self.assertEqual(payload['customers']['id'], [])
+        self.assertEqual(payload['deleted'], {'products': [removed_id], 'customers': [self.customer.pk]})
+
+    def test_version_older_than_tombstones_gets_full_snapshot(self):
+        since = catalog.to_version(timezone.now() - timedelta(days=settings.CATALOG_TOMBSTONE_DAYS + 1))
+        self.assertTrue(catalog.snapshot(self.user, since)['full'])
+
+
+class ReportExportTests(TestCase):
+    """Hisobotlar: og'ir kutubxonalar kechiktirib yuklanadi, eksport tenant bilan cheklanadi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('report', password='report-pass')
+        other = User.objects.create_user('report-other', password='report-pass')
+        for user, sku in ((cls.user, 'RE0001'), (other, 'RE0002')):
+            product = Product.objects.create(name=sku, sku=sku, user=user, purchase_price=Decimal('5'),
+                                             sale_price=Decimal('10'), quantity=Decimal('10'))
+            Sale.objects.create(product=product, quantity=1, price=Decimal('10'), user=user)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_worker_boot_skips_report_stack(self):
+        code = (
+            "import sys, django; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            "print(' '.join(name for name in ('pandas', 'reportlab') if name in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE})
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_excel_export_is_scoped_to_tenant(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get('/api/export-report/', {'format': 'excel', 'type': 'sales', 'period': 'day'})
+        rows = list(load_workbook(BytesIO(response.content)).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual([row[1] for row in rows], ['RE0001'])
+
+    def test_unsupported_format_redirects(self):
+        response = self.client.get('/api/export-report/', {'format': 'pdf', 'type': 'abc_xyz'})
+        self.assertRedirects(response, '/analitika/', fetch_redirect_response=False)
+
+
+class RuntimeProfileTests(SimpleTestCase):
+    """gunicorn profili: shablonlarni isitish va xotira bo'yicha worker'ni qayta ishga tushirish"""
+
+    def load_config(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return runpy.run_path(str(settings.BASE_DIR / 'gunicorn.conf.py'))
+
+    def test_warm_up_compiles_every_template(self):
+        with mock.patch('django.db.connections.close_all') as close_all, self.assertNoLogs('beckend.warmup', 'WARNING'):
+            self.assertEqual(warmup.warm_up(), len(warmup.template_names()))
+        close_all.assert_called_once()
+
+    def test_worker_recycled_over_memory_cap(self):
+        config = self.load_config(GUNICORN_MAX_WORKER_MEMORY_MB='1', WEB_CONCURRENCY='3')
+        self.assertEqual(config['workers'], 3)
+        worker = mock.Mock(alive=True)
+        config['post_request'](worker, None, {}, None)
+        self.assertFalse(worker.alive)
+
+        config = self.load_config(GUNICORN_MAX_WORKER_MEMORY_MB='0')
+        worker = mock.Mock(alive=True)
+        config['post_request'](worker, None, {}, None)
+        self.assertTrue(worker.alive)
+
+
+class LiveStreamTests(TestCase):
+    """SSE faqat ASGI'da: WSGI worker oqimi cheksiz javob bilan band qilinmaydi"""
+
+    def test_wsgi_gets_no_content(self):
+        user = User.objects.create_user('stream', password='stream-pass')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/api/live/').status_code, 204)
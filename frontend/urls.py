@@ -1,5 +1,8 @@
-from django.urls import path
+from django.urls import include, path
+from rest_framework.authtoken.views import obtain_auth_token
+
 from . import views
+from .api import router
 
 urlpatterns = [
     # =============== AUTHENTICATION ===============
@@ -16,22 +19,42 @@ urlpatterns = [
     
     # =============== PRODUCT OPERATIONS ===============
     path('add-product/', views.add_product, name='add_product'),
-    path('edit-product/<int:product_id>/', views.edit_product, name='edit_product'),
-    path('delete-product/<int:product_id>/', views.delete_product, name='delete_product'),
-    path('product/<int:product_id>/', views.product_detail, name='product_detail'),
+    path('edit-product/<uuid:product_id>/', views.edit_product, name='edit_product'),
+    path('delete-product/<uuid:product_id>/', views.delete_product, name='delete_product'),
+    path('product/<uuid:product_id>/', views.product_detail, name='product_detail'),
     path('sell-product/', views.sell_product, name='sell_product'),
     
     # =============== CUSTOMER OPERATIONS ===============
     path('add-customer/', views.add_customer, name='add_customer'),
-    path('edit-customer/<int:customer_id>/', views.edit_customer, name='edit_customer'),
-    path('delete-customer/<int:customer_id>/', views.delete_customer, name='delete_customer'),
-    path('customer/<int:customer_id>/', views.customer_detail, name='customer_detail'),
+    path('edit-customer/<uuid:customer_id>/', views.edit_customer, name='edit_customer'),
+    path('delete-customer/<uuid:customer_id>/', views.delete_customer, name='delete_customer'),
+    path('customer/<uuid:customer_id>/', views.customer_detail, name='customer_detail'),
     
     # =============== API ENDPOINTS ===============
     path('api/sales-data/', views.api_sales_data, name='api_sales_data'),
     path('api/sales-chart/', views.api_sales_chart, name='api_sales_chart'),
+    path('api/get-products/', views.api_get_products, name='api_get_products'),
+    path('api/get-customers/', views.api_get_customers, name='api_get_customers'),
+    path('api/customers/<uuid:customer_id>/pay-debts/', views.api_pay_customer_debts, name='api_pay_customer_debts'),
+    path('api/debt-aging/', views.api_debt_aging, name='api_debt_aging'),
+    path('api/low-stock/', views.api_low_stock, name='api_low_stock'),
+    path('api/purchases/receive/', views.api_receive_goods, name='api_receive_goods'),
+    path('pos/', views.pos, name='pos'),
+    path('sw.js', views.service_worker, name='service_worker'),
+    path('api/pos/catalog/', views.api_pos_catalog, name='api_pos_catalog'),
+    path('api/pos/sync/', views.api_pos_sync, name='api_pos_sync'),
+    path('api/stock-at/', views.api_stock_at, name='api_stock_at'),
+    path('api/sales-heatmap/', views.api_sales_heatmap, name='api_sales_heatmap'),
+    path('api/kpi-compare/', views.api_kpi_compare, name='api_kpi_compare'),
+    path('api/live/', views.api_live_stream, name='api_live_stream'),
     path('api/save-language/', views.save_language, name='save_language'),
     path('api/export-report/', views.export_report, name='export_report'),
+    path('profiles/', views.profiles, name='profiles'),
+    path('profiles/<str:name>.<str:extension>', views.profile_download, name='profile_download'),
+    
+    # =============== REST API v1 ===============
+    path('api/v1/auth/token/', obtain_auth_token, name='api_token'),
+    path('api/v1/', include(router.urls)),
     
     # =============== TEST PAGES (Ishonch uchun) ===============
 
@@ -2,20 +2,39 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse, StreamingHttpResponse
+from django.db import transaction
 from django.db.models import Sum, Count, F, Q, Avg, Max
+from django.db.models.functions import TruncDate
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+import asyncio
 import json
-import pandas as pd
-from io import BytesIO
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
+import uuid
 from django.core.paginator import Paginator
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.views.static import serve
+from asgiref.sync import sync_to_async
+from . import catalog, live
+from .caching import conditional_on_data_version, data_version
+from .serializers import OfflineSaleSerializer
+from .signals import publish_sales_batch
 from .models import *
 
+# =============== MEDIA ===============
+def product_thumbnail(request, path):
+    """Mahsulot rasmi varianti. Nomi original bilan almashadi, shuning uchun muddatsiz keshlanadi"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 # =============== TEST VIEWS ===============
 def test_view(request):
     """Test sahifasi"""
@@ -111,45 +130,49 @@ def logout_view(request):
     """Chiqish"""
     logout(request)
     messages.success(request, "Muvaffaqiyatli chiqildi!")
-    return redirect('login')
+    response = redirect('login')
+    # Service worker keshidagi /pos/ sahifasi ham foydalanuvchiniki - brauzer keshlari tozalanadi
+    response['Clear-Site-Data'] = '"cache"'
+    return response
 
 # =============== MAIN VIEWS ===============
 @login_required(login_url='/login/')
+@conditional_on_data_version('catalog', 'sales', daily=True, html=True)
 def home(request):
     """Bosh sahifa"""
     try:
-        # Bugungi sotuvlar
-        today = timezone.now().date()
-        sales_today = Sale.objects.filter(sale_date__date=today).aggregate(total=Sum('total'))
-        total_sales_today = sales_today['total'] or 0
+        # Bugungi sotuv va foyda - kecha bilan solishtirib (kunlik yakunlardan)
+        (start, end), previous = DailySalesRollup.period_ranges('day', timezone.localdate())
+        kpi_today = DailySalesRollup.compare(request.user, start, end, previous)
+        total_sales_today = kpi_today['current']['revenue']
         
         # Jami mahsulotlar
-        total_products = Product.objects.count()
+        total_products = Product.objects.filter(user=request.user).count()
         
         # Jami qarz
-        total_debt = Debt.objects.filter(status__in=['pending', 'partially_paid', 'overdue']).aggregate(
+        total_debt = Debt.objects.filter(user=request.user, status__in=Debt.OPEN_STATUSES).aggregate(
             total=Sum(F('amount') - F('paid_amount')))
         total_debt_amount = total_debt['total'] or 0
         
         # Jami foyda (bugungi)
-        profit_today = Sale.objects.filter(sale_date__date=today).aggregate(
-            total_profit=Sum((F('price') - F('product__purchase_price')) * F('quantity'))
-        )
-        total_profit = profit_today['total_profit'] or 0
+        total_profit = kpi_today['current']['profit']
         
-        # Eng ko'p sotiladigan 5 ta mahsulot
-        top_products = Product.objects.annotate(
-            total_sold=Sum('sale__quantity')
-        ).order_by('-total_sold')[:5]
+        # Eng ko'p sotiladigan 5 ta mahsulot (saqlangan statistika; shablon fragmenti keshlanganda so'rov bajarilmaydi)
+        top_products = Product.objects.filter(user=request.user).select_related('category').order_by('-total_sold')[:5]
         
         # Yangi sotuvlar
-        recent_sales = Sale.objects.select_related('customer', 'product').order_by('-sale_date')[:5]
+        recent_sales = Sale.objects.filter(user=request.user).select_related('customer', 'product').order_by('-sale_date')[:5]
         
         # Kam qolgan mahsulotlar
-        low_stock_products = Product.objects.filter(quantity__lte=F('min_quantity'))[:5]
+        low_stock_products = Product.objects.filter(user=request.user, status__in=Product.LOW_STOCK_STATUSES)[:5]
+        
+        # Buyurtma tavsiyalari: talab prognozidan hisoblangan miqdor (update_reorder_points)
+        reorder_suggestions = ReorderPoint.objects.filter(
+            user=request.user, suggested_quantity__gt=0
+        ).select_related('product', 'product__forecast').order_by('days_until_stockout')[:5]
         
         # Kategoriyalar ro'yxati
-        categories = Category.objects.all()[:4]
+        categories = Category.objects.filter(user=request.user)[:4]
         
         # Quick Actions
         quick_actions = [
@@ -161,12 +184,14 @@ def home(request):
         
         context = {
             'total_sales_today': f"{total_sales_today:,.0f}",
+            'sales_today_change': kpi_today['change']['previous']['revenue'],
             'total_products': total_products,
             'total_debt': f"{total_debt_amount:,.0f}",
             'total_profit': f"{total_profit:,.0f}",
             'top_products': top_products,
             'recent_sales': recent_sales,
             'low_stock_products': low_stock_products,
+            'reorder_suggestions': reorder_suggestions,
             'categories': categories,
             'quick_actions': quick_actions,
             'user': request.user,
@@ -184,6 +209,7 @@ def home(request):
             'top_products': [],
             'recent_sales': [],
             'low_stock_products': [],
+            'reorder_suggestions': [],
             'categories': [],
             'quick_actions': [
                 {'name': 'Kirim', 'icon': 'inbox-archive-line', 'color': 'green', 'url': '#'},
@@ -223,7 +249,7 @@ def mahsulotlar(request):
     
     # Statistika
     total_products = products.count()
-    low_stock_count = products.filter(quantity__lte=F('min_quantity')).count()
+    low_stock_count = products.filter(status__in=Product.LOW_STOCK_STATUSES).count()
     total_categories = categories.count()
     
     context = {
@@ -243,8 +269,20 @@ def mahsulotlar(request):
 def mijozlar(request):
     """Mijozlar ro'yxati"""
     search_query = request.GET.get('q', '')
+    segment = request.GET.get('segment', '')
+    if segment not in dict(Customer.SEGMENT_CHOICES):
+        segment = ''
     
-    customers = Customer.objects.all()
+    customers = Customer.objects.filter(user=request.user)
+    
+    # Segment tugmalari: har bir segmentdagi mijozlar soni bitta GROUP BY bilan
+    segment_counts = dict(
+        customers.exclude(segment='').values_list('segment').annotate(count=Count('id')).order_by()
+    )
+    segments = [
+        {'code': code, 'label': label, 'count': segment_counts[code]}
+        for code, label in Customer.SEGMENT_CHOICES if code in segment_counts
+    ]
     
     if search_query:
         customers = customers.filter(
@@ -253,33 +291,27 @@ def mijozlar(request):
             Q(phone__icontains=search_query) |
             Q(email__icontains=search_query)
         )
+    if segment:
+        customers = customers.filter(segment=segment)
     
     # Pagination
     paginator = Paginator(customers, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Har bir mijoz uchun statistikani hisoblash
-    customers_with_stats = []
-    for customer in page_obj:
-        customer_stats = Sale.objects.filter(customer=customer).aggregate(
-            total_purchases=Count('id'),
-            total_spent=Sum('total'),
-            last_purchase=Max('sale_date')
-        )
-        
-        customers_with_stats.append({
-            'customer': customer,
-            'total_purchases': customer_stats['total_purchases'] or 0,
-            'total_spent': customer_stats['total_spent'] or 0,
-            'last_purchase': customer_stats['last_purchase']
-        })
+    # Mijoz statistikasi Sale.save() da yangilanadigan maydonlardan olinadi (mijoz boshiga so'rov yo'q)
+    customers_with_stats = [{
+        'customer': customer,
+        'total_purchases': customer.total_purchases,
+        'total_spent': customer.total_spent,
+        'last_purchase': customer.last_purchase,
+    } for customer in page_obj]
     
     # Umumiy statistika
     total_customers = customers.count()
     
     active_customers = customers.annotate(
-        purchase_count=Count('sale')
+        purchase_count=Count('sales')
     ).filter(purchase_count__gt=0).count()
     
     new_customers_this_month = customers.filter(
@@ -298,6 +330,8 @@ def mijozlar(request):
         'new_customers_this_month': new_customers_this_month,
         'avg_purchase': avg_purchase['avg_total'] or 0,
         'search_query': search_query,
+        'segment': segment,
+        'segments': segments,
         'page_obj': page_obj,
         'user': request.user,
     }
@@ -305,26 +339,26 @@ def mijozlar(request):
     return render(request, 'mijozlar.html', context)
 
 @login_required(login_url='/login/')
+@conditional_on_data_version('catalog', 'sales', daily=True, html=True)
 def analitika(request):
     """Analitika sahifasi"""
     # Vaqt oralig'ini aniqlash
     period = request.GET.get('period', 'day')
     
     if period == 'day':
-        # Kunlik ma'lumotlar (soatlar bo'yicha)
-        start_date = timezone.now().date()
-        labels = [f"{i}:00" for i in range(6, 22, 2)]
+        # Kunlik ma'lumotlar: butun sutka 2 soatlik oraliqlarda, bitta so'rov bilan
+        start_date = timezone.localdate()
+        hours = range(0, 24, 2)
+        labels = [f"{hour}:00" for hour in hours]
         
-        # Soatlar bo'yicha guruhlash
-        sales_data = []
-        for hour in range(6, 22, 2):
+        buckets = []
+        for hour in hours:
             hour_start = timezone.make_aware(datetime(start_date.year, start_date.month, start_date.day, hour))
-            hour_end = hour_start + timedelta(hours=2)
-            hour_sales = Sale.objects.filter(
-                sale_date__gte=hour_start,
-                sale_date__lt=hour_end
-            ).aggregate(total=Sum('total'))
-            sales_data.append(float(hour_sales['total'] or 0))
+            buckets.append((hour_start, hour_start + timedelta(hours=2)))
+        points = Sale.objects.filter(
+            user=request.user, sale_date__gte=buckets[0][0], sale_date__lt=buckets[-1][1]
+        ).aggregate(**_bucket_sums(buckets))
+        sales_data = [float(points[f'bucket_{index}']) for index in range(len(buckets))]
     
     elif period == 'week':
         # Haftalik ma'lumotlar
@@ -336,7 +370,7 @@ def analitika(request):
         sales_data = []
         for i in range(7):
             day = start_date + timedelta(days=i)
-            day_sales = Sale.objects.filter(sale_date__date=day).aggregate(total=Sum('total'))
+            day_sales = Sale.objects.filter(user=request.user, sale_date__date=day).aggregate(total=Sum('total'))
             sales_data.append(float(day_sales['total'] or 0))
     
     elif period == 'month':
@@ -359,6 +393,7 @@ def analitika(request):
         
         for week_start, week_end in weeks:
             week_sales = Sale.objects.filter(
+                user=request.user,
                 sale_date__date__gte=week_start,
                 sale_date__date__lte=week_end
             ).aggregate(total=Sum('total'))
@@ -372,45 +407,68 @@ def analitika(request):
         
         for month in range(1, 13):
             month_sales = Sale.objects.filter(
+                user=request.user,
                 sale_date__year=current_year,
                 sale_date__month=month
             ).aggregate(total=Sum('total'))
             sales_data.append(float(month_sales['total'] or 0))
     
-    # Kategoriyalar bo'yicha sotuvlar
+    # Kategoriyalar bo'yicha sotuvlar (ichki kategoriyalar bilan birga)
+    categories = list(Category.objects.filter(user=request.user).only('id', 'name', 'path', 'parent_id', 'product_count', 'total_value'))
+    values = {
+        category.pk: {'product_count': category.product_count, 'total_value': category.total_value}
+        for category in categories
+    }
+    for row in Sale.objects.filter(user=request.user, product__category__isnull=False).values('product__category').annotate(
+        amount=Sum('total'), quantity=Sum('quantity')
+    ):
+        values[row['product__category']].update(amount=row['amount'], quantity=row['quantity'])
+    totals = Category.rollup(categories, values)
+    
+    # Tanlangan kategoriyaning bolalari (standart: ildiz kategoriyalar)
+    parent_id = request.GET.get('category')
     category_data = []
-    categories = Category.objects.all()
-    
     for category in categories:
-        category_sales = Sale.objects.filter(product__category=category).aggregate(
-            total_amount=Sum('total'),
-            total_quantity=Sum('quantity')
-        )
+        if (str(category.parent_id) if category.parent_id else None) != parent_id:
+            continue
+        total = totals[category.pk]
         category_data.append({
+            'id': str(category.pk),
             'name': category.name,
-            'amount': float(category_sales['total_amount'] or 0),
-            'quantity': float(category_sales['total_quantity'] or 0)
+            'amount': float(total.get('amount', 0)),
+            'quantity': float(total.get('quantity', 0)),
+            'product_count': total.get('product_count', 0),
+            'total_value': float(total.get('total_value', 0)),
         })
     
-    # Eng ko'p sotiladigan mahsulotlar
-    top_products = Product.objects.annotate(
-        total_sold=Sum('sale__quantity'),
-        total_revenue=Sum('sale__total')
-    ).order_by('-total_sold')[:5]
+    # Eng ko'p sotiladigan mahsulotlar (saqlangan statistika bo'yicha)
+    top_products = Product.objects.filter(user=request.user).order_by('-total_sold')[:5]
     
-    # Umumiy statistika
-    total_sales_month = Sale.objects.filter(
-        sale_date__month=timezone.now().month
-    ).aggregate(total=Sum('total'))
+    # ABC/XYZ matritsasi: saqlangan sinflar bo'yicha bitta GROUP BY
+    abc_cells = {
+        (row['abc_class'], row['xyz_class']): row
+        for row in Product.objects.filter(user=request.user).exclude(abc_class='').values(
+            'abc_class', 'xyz_class'
+        ).annotate(count=Count('id'), revenue=Sum('total_revenue'), classified_at=Max('classified_at')).order_by()
+    }
+    abc_matrix = [{
+        'abc_class': abc_class,
+        'cells': [abc_cells.get((abc_class, xyz_class), {'count': 0, 'revenue': 0}) for xyz_class in 'XYZ'],
+    } for abc_class in 'ABC']
+    abc_classified_at = max((cell['classified_at'] for cell in abc_cells.values()), default=None)
+    
+    # Umumiy statistika: oy boshidan bugungacha, o'tgan oyning shu kunlari bilan
+    (start, end), previous = DailySalesRollup.period_ranges('month', timezone.localdate())
+    kpi_month = DailySalesRollup.compare(request.user, start, end, previous)
     
-    total_customers = Customer.objects.count()
+    total_customers = Customer.objects.filter(user=request.user).count()
     
-    active_customers = Customer.objects.annotate(
-        purchase_count=Count('sale')
+    active_customers = Customer.objects.filter(user=request.user).annotate(
+        purchase_count=Count('sales')
     ).filter(purchase_count__gt=0).count()
     
     # O'rtacha xarid
-    avg_purchase = Sale.objects.aggregate(
+    avg_purchase = Sale.objects.filter(user=request.user).aggregate(
         avg_total=Avg('total')
     )
     
@@ -420,7 +478,10 @@ def analitika(request):
         'sales_data': json.dumps(sales_data),
         'category_data': json.dumps(category_data),
         'top_products': top_products,
-        'total_sales_month': total_sales_month['total'] or 0,
+        'abc_matrix': abc_matrix,
+        'abc_classified_at': abc_classified_at,
+        'total_sales_month': kpi_month['current']['revenue'],
+        'sales_month_change': kpi_month['change']['previous']['revenue'],
         'total_customers': total_customers,
         'active_customers': active_customers,
         'avg_purchase': avg_purchase['avg_total'] or 0,
@@ -555,7 +616,10 @@ def add_product(request):
             if 'image' in request.FILES:
                 product.image = request.FILES['image']
             
-            product.save()
+            with transaction.atomic():
+                product.save()
+                if product.quantity:
+                    StockMovement.record(product, 'adjustment', product.quantity, note="Boshlang'ich qoldiq")
             messages.success(request, f"'{name}' mahsuloti muvaffaqiyatli qo'shildi!")
             return redirect('mahsulotlar')
             
@@ -590,7 +654,12 @@ def edit_product(request, product_id):
             if 'image' in request.FILES:
                 product.image = request.FILES['image']
             
-            product.save()
+            with transaction.atomic():
+                previous_quantity = Product.objects.select_for_update().values_list('quantity', flat=True).get(pk=product.pk)
+                product.save()
+                product.refresh_from_db(fields=['quantity'])
+                if product.quantity != previous_quantity:
+                    StockMovement.record(product, 'adjustment', product.quantity - previous_quantity, note="Tahrirlash")
             messages.success(request, "Mahsulot muvaffaqiyatli yangilandi!")
             return redirect('mahsulotlar')
         
@@ -666,29 +735,28 @@ def sell_product(request):
             
             total = quantity * price
             
-            # Mahsulot miqdorini kamaytirish
-            product.quantity -= quantity
-            product.save()
-            
-            sale = Sale.objects.create(
-                product=product,
-                quantity=quantity,
-                price=price,
-                total=total,
-                customer=customer,
-                payment_method=payment_method,
-                created_by=request.user
-            )
-            
-            # Agar nasiya bo'lsa, qarz yaratish
-            if payment_method == 'credit':
-                Debt.objects.create(
+            with transaction.atomic():
+                # Mahsulot miqdori va ombor jurnali Sale.save() ichida yangilanadi
+                sale = Sale.objects.create(
+                    product=product,
+                    quantity=quantity,
+                    price=price,
+                    total=total,
                     customer=customer,
-                    sale=sale,
-                    amount=total,
-                    due_date=timezone.now().date() + timedelta(days=30),
-                    status='pending'
+                    payment_method=payment_method,
+                    user=request.user
                 )
+                
+                # Agar nasiya bo'lsa, qarz yaratish
+                if payment_method == 'credit':
+                    Debt.objects.create(
+                        customer=customer,
+                        sale=sale,
+                        amount=sale.total,
+                        due_date=timezone.now().date() + timedelta(days=30),
+                        status='pending',
+                        user=request.user
+                    )
             
             messages.success(request, f"Sotuv muvaffaqiyatli amalga oshirildi! Jami: {total:,.0f} so'm")
             return redirect('home')
@@ -802,7 +870,7 @@ def customer_detail(request, customer_id):
         recent_sales = sales[:10]
         
         # Nasiya qarzlari
-        debts = Debt.objects.filter(customer=customer, status__in=['pending', 'partially_paid'])
+        debts = Debt.objects.filter(customer=customer, status__in=Debt.OPEN_STATUSES)
         total_debt = debts.aggregate(total=Sum(F('amount') - F('paid_amount')))['total'] or 0
         
         context = {
@@ -828,28 +896,26 @@ def add_purchase(request):
     """Kirim (purchase) qo'shish"""
     if request.method == 'POST':
         product_id = request.POST.get('product')
-        quantity = float(request.POST.get('quantity', 0))
-        price = float(request.POST.get('price', 0))
-        supplier = request.POST.get('supplier')
+        supplier_id = request.POST.get('supplier') or None
         
         try:
+            quantity = Decimal(request.POST.get('quantity', 0))
+            price = Decimal(request.POST.get('price', 0))
             product = get_object_or_404(Product, id=product_id)
-            total = quantity * price
-            
-            # Mahsulot miqdorini oshirish
-            product.quantity += quantity
-            product.save()
+            supplier = Customer.objects.filter(id=supplier_id).first() if supplier_id else None
             
+            # Mahsulot miqdori Purchase.save() ichida bir marta oshiriladi
             purchase = Purchase.objects.create(
                 product=product,
                 quantity=quantity,
                 price=price,
-                total=total,
+                total=quantity * price,
                 supplier=supplier,
-                created_by=request.user
+                invoice_number=request.POST.get('invoice_number') or None,
+                user=request.user
             )
             
-            messages.success(request, f"Kirim muvaffaqiyatli qo'shildi! Jami: {total:,.0f} so'm")
+            messages.success(request, f"Kirim muvaffaqiyatli qo'shildi! Jami: {purchase.total:,.0f} so'm")
             return redirect('mahsulotlar')
             
         except Exception as e:
@@ -861,6 +927,68 @@ def add_purchase(request):
         'user': request.user,
     })
 
+@login_required(login_url='/login/')
+def api_receive_goods(request):
+    """API: Yetkazib beruvchi yukini (ko'p qatorli) bitta so'rovda qabul qilish"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri so\'rov!'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri JSON format!'}, status=400)
+
+    invoice_number = str(data.get('invoice_number') or '').strip()
+    if not invoice_number:
+        return JsonResponse({'success': False, 'message': "Faktura raqami majburiy!"}, status=400)
+
+    lines = []
+    try:
+        for line in data.get('lines') or []:
+            quantity = Decimal(str(line['quantity']))
+            price = Decimal(str(line['price']))
+            if not quantity.is_finite() or not price.is_finite() or quantity <= 0 or price < 0:
+                raise ValueError
+            lines.append({
+                'product_id': uuid.UUID(str(line['product_id'])),
+                'quantity': quantity,
+                'price': price,
+                'expiry_date': parse_date(line['expiry_date']) if line.get('expiry_date') else None,
+            })
+    except (KeyError, TypeError, ValueError, InvalidOperation):
+        return JsonResponse({'success': False, 'message': "Qatorlar noto'g'ri!"}, status=400)
+    if not lines:
+        return JsonResponse({'success': False, 'message': "Kamida bitta qator kerak!"}, status=400)
+
+    supplier = None
+    if data.get('supplier_id'):
+        supplier = Customer.objects.filter(id=data['supplier_id'], user=request.user).first()
+        if supplier is None:
+            return JsonResponse({'success': False, 'message': "Yetkazib beruvchi topilmadi!"}, status=400)
+
+    try:
+        receipt, created = GoodsReceipt.receive(
+            request.user, invoice_number, lines,
+            supplier=supplier,
+            delivery_date=parse_date(data['delivery_date']) if data.get('delivery_date') else None,
+            notes=data.get('notes'),
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    # Qayta yuborilgan faktura: ombor o'zgarmaydi, avvalgi natija qaytariladi
+    return JsonResponse({
+        'success': True,
+        'created': created,
+        'receipt': {
+            'id': receipt.id,
+            'invoice_number': receipt.invoice_number,
+            'total': float(receipt.total),
+            'line_count': receipt.line_count,
+            'received_at': receipt.received_at,
+        },
+    }, status=201 if created else 200)
+
 # =============== DEBT OPERATIONS ===============
 @login_required(login_url='/login/')
 def pay_debt(request, debt_id):
@@ -989,83 +1117,104 @@ def delete_category(request, category_id):
 
 # =============== API VIEWS ===============
 @login_required(login_url='/login/')
-def api_sales_data(request):
+@conditional_on_data_version('sales', daily=True)
+async def api_sales_data(request):
     """API: Sotuv ma'lumotlari"""
+    user = await request.auser()
     period = request.GET.get('period', 'day')
     
     if period == 'day':
         # Kunlik ma'lumotlar
         today = timezone.now().date()
-        sales = Sale.objects.filter(sale_date__date=today)
-        data = list(sales.values('sale_date__hour').annotate(total=Sum('total')).order_by('sale_date__hour'))
+        sales = Sale.objects.filter(user=user, sale_date__date=today)
+        data = [row async for row in sales.values('sale_date__hour').annotate(total=Sum('total')).order_by('sale_date__hour')]
     elif period == 'week':
-        # Haftalik ma'lumotlar
+        # Haftalik ma'lumotlar (bitta GROUP BY so'rovi)
         week_ago = timezone.now().date() - timedelta(days=7)
+        totals = {
+            row['day']: row['total']
+            async for row in Sale.objects.filter(user=user, sale_date__date__gte=week_ago, sale_date__date__lt=week_ago + timedelta(days=7))
+            .annotate(day=TruncDate('sale_date')).values('day').annotate(total=Sum('total')).order_by()
+        }
         data = []
         for i in range(7):
             day = week_ago + timedelta(days=i)
-            day_sales = Sale.objects.filter(sale_date__date=day).aggregate(total=Sum('total'))
             data.append({
                 'date': day.strftime('%Y-%m-%d'),
-                'total': float(day_sales['total'] or 0)
+                'total': float(totals.get(day) or 0)
             })
     else:
         data = []
     
     return JsonResponse({'data': data})
 
+def _bucket_sums(buckets):
+    """Har bir (boshlanish, tugash) oralig'i uchun shartli SUM ifodalari"""
+    return {
+        f'bucket_{index}': Sum('total', filter=Q(sale_date__gte=start, sale_date__lt=end), default=0)
+        for index, (start, end) in enumerate(buckets)
+    }
+
 @login_required(login_url='/login/')
-def api_sales_chart(request):
+@conditional_on_data_version('sales', daily=True)
+async def api_sales_chart(request):
     """API: Sotuv grafigi ma'lumotlari"""
+    user = await request.auser()
     period = request.GET.get('period', 'day')
     
     if period == 'day':
-        # Kunlik ma'lumotlar
-        today = timezone.now().date()
-        hours = range(6, 22, 2)
-        data = []
-        
+        # Kunlik ma'lumotlar (butun sutka, 2 soatlik oraliqlar)
+        today = timezone.localdate()
+        hours = list(range(0, 24, 2))
+        buckets = []
         for hour in hours:
             hour_start = timezone.make_aware(datetime(today.year, today.month, today.day, hour))
-            hour_end = hour_start + timedelta(hours=2)
-            hour_sales = Sale.objects.filter(
-                sale_date__gte=hour_start,
-                sale_date__lt=hour_end
-            ).aggregate(total=Sum('total'))
-            
-            data.append({
-                'hour': f"{hour}:00",
-                'amount': float(hour_sales['total'] or 0)
-            })
-        
-        return JsonResponse({'data': data})
+            buckets.append((hour_start, hour_start + timedelta(hours=2)))
+        labels = [{'hour': f"{hour}:00"} for hour in hours]
     
     elif period == 'week':
         # Haftalik ma'lumotlar
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=6)
-        
-        data = []
+        buckets = []
+        labels = []
         for i in range(7):
             day = start_date + timedelta(days=i)
-            day_sales = Sale.objects.filter(sale_date__date=day).aggregate(total=Sum('total'))
-            
-            data.append({
+            day_start = timezone.make_aware(datetime(day.year, day.month, day.day))
+            buckets.append((day_start, day_start + timedelta(days=1)))
+            labels.append({
                 'date': day.strftime('%Y-%m-%d'),
                 'day': ['Dush', 'Sesh', 'Chor', 'Pay', 'Jum', 'Shan', 'Yak'][i],
-                'amount': float(day_sales['total'] or 0)
             })
-        
-        return JsonResponse({'data': data})
     
-    return JsonResponse({'data': []})
+    else:
+        return JsonResponse({'data': []})
+    
+    # Grafik nuqtalari va davr yakuni bir-biriga bog'liq emas - parallel so'raladi
+    period_sales = Sale.objects.filter(user=user, sale_date__gte=buckets[0][0], sale_date__lt=buckets[-1][1])
+    points, summary = await asyncio.gather(
+        period_sales.aaggregate(**_bucket_sums(buckets)),
+        period_sales.aaggregate(total=Sum('total', default=0), count=Count('id')),
+    )
+    
+    data = [
+        {**label, 'amount': float(points[f'bucket_{index}'])}
+        for index, label in enumerate(labels)
+    ]
+    
+    return JsonResponse({
+        'data': data,
+        'summary': {'total': float(summary['total']), 'count': summary['count']},
+    })
 
 @login_required(login_url='/login/')
-def api_get_products(request):
+@conditional_on_data_version('catalog')
+async def api_get_products(request):
     """API: Mahsulotlar ro'yxati (AJAX)"""
+    user = await request.auser()
     search = request.GET.get('search', '')
     
-    products = Product.objects.filter(quantity__gt=0)
+    products = Product.objects.filter(user=user, quantity__gt=0)
     
     if search:
         products = products.filter(
@@ -1074,24 +1223,26 @@ def api_get_products(request):
         )[:10]
     
     product_list = []
-    for product in products:
+    async for product in products.values('id', 'name', 'sku', 'sale_price', 'quantity', 'unit'):
         product_list.append({
-            'id': product.id,
-            'name': product.name,
-            'sku': product.sku,
-            'price': str(product.sale_price),
-            'quantity': str(product.quantity),
-            'unit': product.unit
+            'id': product['id'],
+            'name': product['name'],
+            'sku': product['sku'],
+            'price': str(product['sale_price']),
+            'quantity': str(product['quantity']),
+            'unit': product['unit']
         })
     
     return JsonResponse({'products': product_list})
 
 @login_required(login_url='/login/')
-def api_get_customers(request):
+@conditional_on_data_version('sales')
+async def api_get_customers(request):
     """API: Mijozlar ro'yxati (AJAX)"""
+    user = await request.auser()
     search = request.GET.get('search', '')
     
-    customers = Customer.objects.all()
+    customers = Customer.objects.filter(user=user)
     
     if search:
         customers = customers.filter(
@@ -1101,15 +1252,343 @@ def api_get_customers(request):
         )[:10]
     
     customer_list = []
-    for customer in customers:
+    async for customer in customers.values('id', 'first_name', 'last_name', 'phone'):
         customer_list.append({
-            'id': customer.id,
-            'name': customer.full_name,
-            'phone': customer.phone
+            'id': customer['id'],
+            'name': f"{customer['first_name']} {customer['last_name']}",
+            'phone': customer['phone']
         })
     
     return JsonResponse({'customers': customer_list})
 
+@login_required(login_url='/login/')
+def api_pay_customer_debts(request, customer_id):
+    """API: Mijozning bir nechta qarzini bitta to'lov bilan yopish (FIFO)"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri so\'rov!'}, status=405)
+
+    customer = get_object_or_404(Customer, id=customer_id, user=request.user)
+
+    if request.content_type == 'application/json':
+        try:
+            amount = json.loads(request.body).get('amount')
+        except json.JSONDecodeError:
+            return JsonResponse({'success': False, 'message': 'Noto\'g\'ri JSON format!'}, status=400)
+    else:
+        amount = request.POST.get('amount')
+
+    try:
+        amount = Decimal(str(amount))
+    except (InvalidOperation, TypeError):
+        amount = Decimal(0)
+    if not amount.is_finite() or amount <= 0:
+        return JsonResponse({'success': False, 'message': "To'lov summasi noto'g'ri!"}, status=400)
+
+    allocations, unapplied = Debt.allocate_payment(customer, amount)
+
+    return JsonResponse({
+        'success': True,
+        'message': f"Qarz to'lovi qabul qilindi: {amount - unapplied:,.0f} so'm",
+        'applied': float(amount - unapplied),
+        'unapplied': float(unapplied),
+        'debts': [{
+            'id': debt.id,
+            'paid': float(applied),
+            'remaining': float(debt.remaining_amount),
+            'status': debt.status,
+        } for debt, applied in allocations],
+    })
+
+@login_required(login_url='/login/')
+def api_debt_aging(request):
+    """API: Qarzlar muddati bo'yicha tahlil (oldindan hisoblangan)"""
+    order = request.GET.get('order', 'total')
+    if order not in DebtAging.BUCKETS + ['total']:
+        order = 'total'
+    try:
+        limit = min(int(request.GET.get('limit', 50)), 500)
+    except ValueError:
+        limit = 50
+
+    fields = DebtAging.BUCKETS + ['total', 'debt_count']
+    rows = DebtAging.objects.filter(user=request.user)
+
+    tenant = rows.filter(customer__isnull=True).values('as_of', *fields).first()
+
+    customers = rows.filter(customer__isnull=False)
+    customer_id = request.GET.get('customer')
+    if customer_id:
+        try:
+            customer_id = uuid.UUID(customer_id)
+        except ValueError:
+            return JsonResponse({'success': False, 'message': "customer noto'g'ri"}, status=400)
+        customers = customers.filter(customer_id=customer_id)
+
+    customer_list = []
+    for row in customers.order_by(f'-{order}').values(
+        'customer_id', 'customer__first_name', 'customer__last_name', 'customer__phone', *fields
+    )[:limit]:
+        customer_list.append({
+            'id': row['customer_id'],
+            'name': f"{row['customer__first_name']} {row['customer__last_name']}",
+            'phone': row['customer__phone'],
+            **{key: float(row[key]) if key != 'debt_count' else row[key] for key in fields},
+        })
+
+    return JsonResponse({
+        'as_of': tenant['as_of'] if tenant else None,
+        'summary': {key: float(tenant[key]) if key != 'debt_count' else tenant[key] for key in fields} if tenant else None,
+        'customers': customer_list,
+    })
+
+@login_required(login_url='/login/')
+def api_low_stock(request):
+    """API: Kam qolgan mahsulotlar va tugash prognozi"""
+    try:
+        limit = min(int(request.GET.get('limit', 50)), 500)
+    except ValueError:
+        limit = 50
+
+    fields = ['id', 'name', 'sku', 'quantity', 'min_quantity', 'unit', 'status',
+              'reorder__avg_daily_sales', 'reorder__days_until_stockout',
+              'reorder__reorder_point', 'reorder__suggested_quantity']
+
+    # Qisman indeks (product_low_stock_idx) orqali
+    low_stock = Product.objects.filter(
+        user=request.user, status__in=Product.LOW_STOCK_STATUSES
+    ).order_by('quantity').values(*fields)[:limit]
+
+    # Hali kam qolmagan, lekin yaqin kunlarda tugaydiganlar
+    try:
+        horizon = int(request.GET.get('days', 7))
+    except ValueError:
+        horizon = 7
+    at_risk = Product.objects.filter(
+        reorder__user=request.user, reorder__days_until_stockout__lte=horizon, status='active'
+    ).order_by('reorder__days_until_stockout').values(*fields)[:limit]
+
+    def serialize(row):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'sku': row['sku'],
+            'quantity': float(row['quantity']),
+            'min_quantity': float(row['min_quantity']),
+            'unit': row['unit'],
+            'status': row['status'],
+            'avg_daily_sales': float(row['reorder__avg_daily_sales'] or 0),
+            'days_until_stockout': float(row['reorder__days_until_stockout']) if row['reorder__days_until_stockout'] is not None else None,
+            'reorder_point': float(row['reorder__reorder_point'] or 0),
+            'suggested_quantity': float(row['reorder__suggested_quantity'] or 0),
+        }
+
+    return JsonResponse({
+        'low_stock': [serialize(row) for row in low_stock],
+        'at_risk': [serialize(row) for row in at_risk],
+    })
+
+# =============== OFFLINE POS ===============
+POS_SYNC_BATCH_LIMIT = 500
+
+
+@login_required(login_url='/login/')
+def pos(request):
+    """Kassa (oflayn rejimda ham ishlaydi)"""
+    return render(request, 'pos.html', {'user': request.user})
+
+
+def service_worker(request):
+    """Service worker ildizdan beriladi - butun sayt uning doirasida bo'ladi"""
+    response = render(request, 'pos/sw.js', content_type='application/javascript')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@login_required(login_url='/login/')
+def api_pos_catalog(request):
+    """
+    API: Kassa katalogi (ustunli JSON, gzip). ?since=<version> - faqat o'zgarganlar
+    va o'chirilganlar; javobdagi `version` keyingi so'rovda since sifatida yuboriladi.
+    """
+    since = request.GET.get('since')
+    if since:
+        try:
+            since = int(since)
+        except ValueError:
+            return JsonResponse({'success': False, 'message': "since noto'g'ri"}, status=400)
+    return JsonResponse(catalog.snapshot(request.user, since or None))
+
+
+@login_required(login_url='/login/')
+def api_pos_sync(request):
+    """API: Oflayn navbatdagi sotuvlarni paketlab qabul qilish (sotuv UUID bo'yicha idempotent)"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri so\'rov!'}, status=405)
+
+    try:
+        items = json.loads(request.body).get('sales') or []
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri JSON format!'}, status=400)
+    if not isinstance(items, list):
+        return JsonResponse({'success': False, 'message': "sales ro'yxat bo'lishi kerak!"}, status=400)
+    if len(items) > POS_SYNC_BATCH_LIMIT:
+        return JsonResponse({
+            'success': False, 'message': f"Bir paketda ko'pi bilan {POS_SYNC_BATCH_LIMIT} ta sotuv!",
+        }, status=413)
+
+    # Qatorlar API (/api/v1/sales/bulk/) bilan bir xil tekshiriladi; yaroqsizi rad etiladi, qolgani yoziladi
+    rows, results = [], []
+    for item in items:
+        serializer = OfflineSaleSerializer(data=item)
+        if serializer.is_valid():
+            rows.append(serializer.validated_data)
+            continue
+        sale_id = item.get('id') if isinstance(item, dict) else None
+        message = "Sotuv id noto'g'ri" if 'id' in serializer.errors else "Sotuv ma'lumotlari noto'g'ri"
+        results.append({'id': sale_id, 'status': 'rejected', 'message': message})
+
+    conflicts = []
+    if rows:
+        ingested, conflicts = Sale.ingest_offline(request.user, rows)
+        results.extend(ingested)
+        created = [result['id'] for result in ingested if result['status'] == 'created']
+        if created:
+            publish_sales_batch(request.user.id, created)
+
+    return JsonResponse({
+        'success': True,
+        'created': sum(result['status'] == 'created' for result in results),
+        'results': results,
+        'conflicts': conflicts,
+    })
+
+HEATMAP_MAX_DAYS = 366
+
+@login_required(login_url='/login/')
+def api_sales_heatmap(request):
+    """
+    API: Hafta kuni x soat bo'yicha sotuvlar (soni va summasi), ?from=&to= (YYYY-MM-DD).
+    Tenant va kun bo'yicha keshlanadi; oraliq bugunni o'z ichiga olsa, kalitga sotuvlar
+    versiyasi ham qo'shiladi - yangi sotuv darhol ko'rinadi.
+    """
+    today = timezone.localdate()
+    try:
+        end = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else today
+        start = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else end - timedelta(days=27)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': "Sana YYYY-MM-DD formatida bo'lishi kerak!"}, status=400)
+    if start > end or (end - start).days >= HEATMAP_MAX_DAYS:
+        return JsonResponse({'success': False, 'message': f"Oraliq 1 dan {HEATMAP_MAX_DAYS} kungacha bo'lishi kerak!"}, status=400)
+    
+    key = f"sales-heatmap:{request.user.id}:{start}:{end}:{today}"
+    if end >= today:
+        key += f":{data_version(request.user.id, 'sales')}"
+    data = cache.get(key)
+    if data is None:
+        data = Sale.heatmap(request.user, start, end)
+        # Ertaga kalit o'zgaradi - yarim tungacha saqlanadi
+        midnight = timezone.make_aware(datetime.combine(today + timedelta(days=1), datetime.min.time()))
+        cache.set(key, data, timeout=max(int((midnight - timezone.now()).total_seconds()), 1))
+    
+    return JsonResponse({
+        'from': start,
+        'to': end,
+        'timezone': settings.TIME_ZONE,
+        'weekdays': ['Dush', 'Sesh', 'Chor', 'Pay', 'Jum', 'Shan', 'Yak'],
+        'hours': list(range(24)),
+        **data,
+    })
+
+KPI_COMPARE_MAX_DAYS = 3660
+
+
+@login_required(login_url='/login/')
+@conditional_on_data_version('sales', daily=True)
+def api_kpi_compare(request):
+    """
+    API: KPI'lar (daromad, foyda, sotuvlar soni, o'rtacha chek, yangi mijozlar) -
+    joriy davr, oldingi davr va o'tgan yilning shu davri.
+    ?period=day|week|month|year (davr boshidan bugungacha) yoki ?from=&to= (YYYY-MM-DD,
+    oldingi davr - shu uzunlikdagi undan oldingi oraliq).
+    Kunlik yakunlardan (DailySalesRollup) o'qiladi - ikki indeksli so'rov.
+    """
+    today = timezone.localdate()
+    if request.GET.get('from') or request.GET.get('to'):
+        try:
+            end = datetime.strptime(request.GET['to'], '%Y-%m-%d').date() if request.GET.get('to') else today
+            start = datetime.strptime(request.GET['from'], '%Y-%m-%d').date() if request.GET.get('from') else end
+        except ValueError:
+            return JsonResponse({'success': False, 'message': "Sana YYYY-MM-DD formatida bo'lishi kerak!"}, status=400)
+        if start > end or (end - start).days >= KPI_COMPARE_MAX_DAYS:
+            return JsonResponse({'success': False, 'message': f"Oraliq 1 dan {KPI_COMPARE_MAX_DAYS} kungacha bo'lishi kerak!"}, status=400)
+        length = end - start + timedelta(days=1)
+        period, previous = 'custom', (start - length, end - length)
+    else:
+        period = request.GET.get('period', 'month')
+        try:
+            (start, end), previous = DailySalesRollup.period_ranges(period, today)
+        except ValueError:
+            return JsonResponse({'success': False, 'message': "Davr: day, week, month yoki year!"}, status=400)
+    
+    return JsonResponse({'period': period, **DailySalesRollup.compare(request.user, start, end, previous)})
+
+@login_required(login_url='/login/')
+def api_stock_at(request):
+    """API: Berilgan sanadagi ombor qoldig'i (snapshot + harakatlar)"""
+    try:
+        day = datetime.strptime(request.GET.get('date', ''), '%Y-%m-%d')
+    except ValueError:
+        return JsonResponse({'success': False, 'message': "Sana YYYY-MM-DD formatida bo'lishi kerak!"}, status=400)
+    # Kun oxiridagi qoldiq
+    when = timezone.make_aware(day + timedelta(days=1)) - timedelta(microseconds=1)
+
+    products = Product.objects.filter(user=request.user)
+    product_id = request.GET.get('product')
+    if product_id:
+        try:
+            product_id = uuid.UUID(product_id)
+        except ValueError:
+            return JsonResponse({'success': False, 'message': "product noto'g'ri"}, status=400)
+        products = products.filter(id=product_id)
+
+    stock = StockMovement.stock_at(when, products)
+    names = dict(products.values_list('id', 'name'))
+
+    return JsonResponse({
+        'date': day.date(),
+        'products': [
+            {'id': pk, 'name': names.get(pk), 'quantity': float(quantity)}
+            for pk, quantity in stock.items()
+        ],
+    })
+
+@login_required(login_url='/login/')
+async def api_live_stream(request):
+    """API: Dashboard KPI o'zgarishlari (Server-Sent Events, ASGI talab qilinadi)"""
+    if not isinstance(request, ASGIRequest):
+        # WSGI'da Django async oqimni javobdan oldin oxirigacha o'qiydi - cheksiz oqim
+        # worker oqimini band qilib qo'yadi. 204 - EventSource qayta ulanmaydi, sahifa so'rovga o'tadi.
+        return HttpResponse(status=204)
+    user = await request.auser()
+
+    async def event_stream():
+        queue = live.broker.subscribe(user.pk)
+        try:
+            snapshot = await sync_to_async(live.broker.snapshot)(user.pk)
+            yield live.format_event('snapshot', snapshot)
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=live.HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+        finally:
+            live.broker.unsubscribe(user.pk, queue)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @login_required(login_url='/login/')
 def save_language(request):
     """API: Til sozlamalarini saqlash"""
@@ -1139,92 +1618,74 @@ def export_report(request):
     report_type = request.GET.get('type', 'sales')
     period = request.GET.get('period', 'month')
     
+    if report_type not in ('sales', 'abc_xyz'):
+        messages.error(request, "Bu turdagi hisobot hali mavjud emas!")
+        return redirect('analitika')
+    if format_type not in ('pdf', 'excel') or (report_type == 'abc_xyz' and format_type != 'excel'):
+        messages.error(request, "Noto'g'ri format tanlandi!")
+        return redirect('analitika')
+    
     try:
-        # Ma'lumotlarni olish
-        if report_type == 'sales':
-            # Sotuv ma'lumotlarini olish
-            if period == 'day':
-                today = timezone.now().date()
-                sales = Sale.objects.filter(sale_date__date=today)
-            elif period == 'week':
-                week_ago = timezone.now().date() - timedelta(days=7)
-                sales = Sale.objects.filter(sale_date__date__gte=week_ago)
-            elif period == 'month':
-                month_start = timezone.now().date().replace(day=1)
-                sales = Sale.objects.filter(sale_date__date__gte=month_start)
-            else:  # year
-                year_start = timezone.now().date().replace(month=1, day=1)
-                sales = Sale.objects.filter(sale_date__date__gte=year_start)
-            
-            # Ma'lumotlar yo'q bo'lsa
-            if not sales.exists():
-                messages.error(request, "Hisobot uchun ma'lumot topilmadi!")
-                return redirect('analitika')
+        # pandas/reportlab faqat shu yerda, birinchi hisobotda yuklanadi (frontend/reports.py)
+        from . import reports
         
-        if format_type == 'pdf':
-            # PDF yaratish
-            response = HttpResponse(content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="report_{period}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-            
-            p = canvas.Canvas(response, pagesize=letter)
-            p.setTitle(f"Sotuv hisoboti - {period}")
-            
-            # Sarlavha
-            p.setFont("Helvetica-Bold", 16)
-            p.drawString(100, 750, f"Sklat.uz - Sotuv hisoboti")
-            p.setFont("Helvetica", 12)
-            p.drawString(100, 730, f"Davr: {period}")
-            p.drawString(100, 710, f"Yaratilgan sana: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-            
-            # Ma'lumotlar
-            total_sales = sales.aggregate(total=Sum('total'))['total'] or 0
-            p.drawString(100, 680, f"Jami sotuv: {total_sales:,.0f} so'm")
-            
-            # Grafik qo'shish mumkin...
-            
-            p.showPage()
-            p.save()
-            
-            return response
+        if report_type == 'abc_xyz':
+            if not Product.objects.filter(user=request.user).exclude(abc_class='').exists():
+                messages.error(request, "Mahsulotlar hali tasniflanmagan!")
+                return redirect('analitika')
+            return reports.classification_excel(request.user)
         
-        elif format_type == 'excel':
-            # Excel yaratish
-            data = []
-            for sale in sales[:100]:  # Faqat 100 ta yozuv
-                data.append({
-                    'ID': sale.id,
-                    'Mahsulot': sale.product.name,
-                    'Miqdor': sale.quantity,
-                    'Narx': sale.price,
-                    'Jami': sale.total,
-                    'Sana': sale.sale_date.strftime('%Y-%m-%d %H:%M'),
-                    'Mijoz': sale.customer.full_name if sale.customer else 'Noma\'lum'
-                })
-            
-            df = pd.DataFrame(data)
-            
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Sotuvlar', index=False)
-            
-            output.seek(0)
-            
-            response = HttpResponse(
-                output,
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            response['Content-Disposition'] = f'attachment; filename="report_{period}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-            
-            return response
+        sales = reports.sales_for_period(request.user, period)
         
-        else:
-            messages.error(request, "Noto'g'ri format tanlandi!")
+        # Ma'lumotlar yo'q bo'lsa
+        if not sales.exists():
+            messages.error(request, "Hisobot uchun ma'lumot topilmadi!")
             return redirect('analitika')
+        
+        if format_type == 'pdf':
+            return reports.sales_pdf(sales, period)
+        return reports.sales_excel(sales, period)
             
     except Exception as e:
         messages.error(request, f"Hisobot yaratishda xatolik: {str(e)}")
         return redirect('analitika')
 
+# =============== PROFILING (STAFF) ===============
+@staff_member_required(login_url='/login/')
+def profiles(request):
+    """Saqlangan so'rov profillari: eng sekinlari; ?name= - bitta profil tafsiloti"""
+    from . import profiling
+    
+    selected = profiling.load(request.GET.get('name', ''))
+    sort_options = ['cumulative', 'tottime', 'ncalls']
+    sort = request.GET.get('sort', 'cumulative')
+    if sort not in sort_options:
+        sort = 'cumulative'
+    
+    context = {
+        'profiles': profiling.slowest(),
+        'selected': selected,
+        'sort': sort,
+        'sort_options': sort_options,
+        'top_functions': profiling.top_functions(selected['name'], sort=sort) if selected else '',
+        'sample_rate': settings.PROFILING_SAMPLE_RATE,
+        'max_files': settings.PROFILING_MAX_FILES,
+        'max_age_days': settings.PROFILING_MAX_AGE_DAYS,
+    }
+    return render(request, 'profiles.html', context)
+
+@staff_member_required(login_url='/login/')
+def profile_download(request, name, extension):
+    """Profil fayli: .prof (cProfile) yoki .json (SQL vaqt chizig'i)"""
+    from . import profiling
+    
+    if not profiling.NAME_RE.match(name) or extension not in ('prof', 'json'):
+        raise Http404
+    path = settings.PROFILING_DIR / f"{name}.{extension}"
+    if not path.exists():
+        raise Http404
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
+
 # =============== URL MAPPING ===============
 # Quyidagi urlpatterns ro'yxatini urls.py fayliga qo'shishingiz kerak:
 
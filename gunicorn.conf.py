@@ -0,0 +1,88 @@
+# gunicorn.conf.py
+"""
+Production runtime profili. Gunicorn uni ishchi papkadan avtomatik o'qiydi:
+
+    gunicorn                                          # beckend.wsgi, gthread
+    GUNICORN_WORKER_CLASS=sync gunicorn
+    gunicorn beckend.asgi:application -k uvicorn_worker.UvicornWorker
+
+Barcha qiymatlarni muhit o'zgaruvchilari yoki buyruq qatori bilan almashtirish mumkin.
+"""
+import gc
+import multiprocessing
+import os
+
+cores = multiprocessing.cpu_count()
+
+wsgi_app = 'beckend.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+
+# =============== WORKERS ===============
+# Ilova master jarayonda bir marta yuklanadi, worker'lar xotirani copy-on-write bilan bo'lishadi
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() not in ('0', 'false', 'no', 'off')
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+# Jarayonlar: yadro boshiga 2 + 1 (ko'pi bilan 12); oqimlar: so'rovlar asosan baza/IO kutadi
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cores * 2 + 1, 12)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# =============== RECYCLING ===============
+# Har bir worker ~1000 so'rovdan keyin qayta tug'iladi (pandas eksportlaridan keyingi xotira o'sishi
+# chegaralanadi); jitter hammasi bir vaqtda qayta ishga tushmasligi uchun
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Worker xotirasi shundan oshsa, joriy so'rovdan keyin muloyim qayta ishga tushiriladi (0 - o'chiq)
+max_worker_memory_mb = int(os.environ.get('GUNICORN_MAX_WORKER_MEMORY_MB', 512))
+
+# =============== TIMEOUTS ===============
+# Hisobotlar (PDF/Excel) bir necha soniya olishi mumkin
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 60))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Heartbeat fayli diskda emas, xotirada (konteynerlarda disk sekin bo'lishi mumkin)
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# =============== LOGGING ===============
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+# =============== HOOKS ===============
+def warm(server):
+    from beckend.warmup import warm_up
+
+    count = warm_up()
+    server.log.info("Keshlar isitildi: %d ta shablon", count)
+
+
+def when_ready(server):
+    if preload_app:
+        warm(server)
+        # Isitilgan obyektlar GC tomonidan tegilmaydi - worker'larda sahifalar nusxalanmaydi
+        gc.collect()
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        warm(server)
+
+
+def worker_rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            return next(int(line.split()[1]) for line in status if line.startswith('VmRSS:')) / 1024
+    except (OSError, StopIteration):
+        return 0
+
+
+def post_request(worker, req, environ, resp):
+    if max_worker_memory_mb and worker.alive and worker_rss_mb() > max_worker_memory_mb:
+        worker.log.warning("Worker %s xotirasi %d MB dan oshdi - qayta ishga tushiriladi",
+                           worker.pid, max_worker_memory_mb)
+        worker.alive = False
@@ -0,0 +1,167 @@
+// pos-queue.js
+// Oflayn sotuvlar navbati (IndexedDB). Sahifa ham, service worker ham shu fayldan foydalanadi.
+// Har bir foydalanuvchining alohida bazasi bor (sklat-pos-<id>) - katalog va navbat boshqa
+// foydalanuvchiga ko'rinmaydi. Avval PosQueue.use(userId) chaqiriladi.
+(function (root) {
+    'use strict';
+
+    var DB_PREFIX = 'sklat-pos-';
+    var LEGACY_DB = 'sklat-pos';
+    var DB_VERSION = 1;
+    var dbName = null;
+    var SYNC_URL = '/api/pos/sync/';
+    var BATCH_SIZE = 100;
+
+    function open() {
+        return new Promise(function (resolve, reject) {
+            if (!dbName) {
+                throw new Error('PosQueue.use(userId) chaqirilmagan');
+            }
+            var request = indexedDB.open(dbName, DB_VERSION);
+            request.onupgradeneeded = function () {
+                var db = request.result;
+                if (!db.objectStoreNames.contains('sales')) {
+                    db.createObjectStore('sales', { keyPath: 'id' });
+                }
+                if (!db.objectStoreNames.contains('meta')) {
+                    db.createObjectStore('meta');
+                }
+            };
+            request.onsuccess = function () { resolve(request.result); };
+            request.onerror = function () { reject(request.error); };
+        });
+    }
+
+    function run(storeName, mode, action) {
+        return open().then(function (db) {
+            return new Promise(function (resolve, reject) {
+                var tx = db.transaction(storeName, mode);
+                var result = action(tx.objectStore(storeName));
+                tx.oncomplete = function () { db.close(); resolve(result && result.result); };
+                tx.onerror = function () { db.close(); reject(tx.error); };
+            });
+        });
+    }
+
+    function drop(name) {
+        return new Promise(function (resolve) {
+            var request = indexedDB.deleteDatabase(name);
+            request.onsuccess = request.onerror = request.onblocked = function () { resolve(); };
+        });
+    }
+
+    // Oldingi umumiy baza: yuborilmagan sotuvlar joriy foydalanuvchi navbatiga ko'chiriladi
+    // (boshqaniki bo'lsa server "Mahsulot topilmadi" deb rad etadi), katalog bilan baza o'chiriladi
+    function migrateLegacy() {
+        return new Promise(function (resolve) {
+            var request = indexedDB.open(LEGACY_DB, 1);
+            // Baza yo'q - yaratmaymiz
+            request.onupgradeneeded = function () { request.transaction.abort(); };
+            request.onerror = function () { resolve(null); };
+            request.onsuccess = function () {
+                var db = request.result;
+                var tx = db.transaction('sales', 'readonly');
+                var all = tx.objectStore('sales').getAll();
+                tx.oncomplete = function () { db.close(); resolve(all.result); };
+                tx.onerror = function () { db.close(); resolve(null); };
+            };
+        }).then(function (sales) {
+            if (sales === null) {
+                return;
+            }
+            return Promise.all(sales.map(PosQueue.add)).then(function () { return drop(LEGACY_DB); });
+        });
+    }
+
+    var PosQueue = {
+        use: function (userId) {
+            dbName = DB_PREFIX + userId;
+            migrateLegacy();
+            return PosQueue;
+        },
+        add: function (sale) {
+            return run('sales', 'readwrite', function (store) { return store.put(sale); });
+        },
+        all: function () {
+            return run('sales', 'readonly', function (store) { return store.getAll(); });
+        },
+        remove: function (ids) {
+            return run('sales', 'readwrite', function (store) {
+                ids.forEach(function (id) { store.delete(id); });
+            });
+        },
+        markRejected: function (results) {
+            return run('sales', 'readwrite', function (store) {
+                results.forEach(function (result) {
+                    var request = store.get(result.id);
+                    request.onsuccess = function () {
+                        if (request.result) {
+                            request.result.rejected = result.message || true;
+                            store.put(request.result);
+                        }
+                    };
+                });
+            });
+        },
+        getMeta: function (key) {
+            return run('meta', 'readonly', function (store) { return store.get(key); });
+        },
+        setMeta: function (key, value) {
+            return run('meta', 'readwrite', function (store) { return store.put(value, key); });
+        },
+
+        // Chiqishda: avval navbat yuboriladi; hammasi ketgan bo'lsa baza o'chiriladi, aks holda
+        // faqat katalog va token o'chadi - yuborilmagan sotuvlar shu foydalanuvchi qayta kirguncha qoladi
+        clear: function () {
+            var finish = function () {
+                return PosQueue.all().then(function (sales) {
+                    if (!sales.length) {
+                        return drop(dbName);
+                    }
+                    return run('meta', 'readwrite', function (store) { store.clear(); });
+                });
+            };
+            return PosQueue.flush().then(finish, finish);
+        },
+
+        // Navbatni paketlab serverga yuborish. Yaratilgan va takroriy sotuvlar o'chiriladi,
+        // rad etilganlari belgilanib qoladi (qayta yuborilmaydi).
+        flush: function () {
+            return Promise.all([PosQueue.all(), PosQueue.getMeta('csrftoken')]).then(function (values) {
+                var pending = values[0].filter(function (sale) { return !sale.rejected; });
+                var summary = { created: 0, duplicate: 0, rejected: 0, conflicts: [] };
+                var chain = Promise.resolve();
+
+                for (var i = 0; i < pending.length; i += BATCH_SIZE) {
+                    (function (batch) {
+                        chain = chain.then(function () {
+                            return fetch(SYNC_URL, {
+                                method: 'POST',
+                                credentials: 'same-origin',
+                                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': values[1] || '' },
+                                body: JSON.stringify({ sales: batch })
+                            }).then(function (response) {
+                                if (!response.ok) {
+                                    throw new Error('Sinxronlash xatosi: ' + response.status);
+                                }
+                                return response.json();
+                            }).then(function (data) {
+                                var done = [], rejected = [];
+                                data.results.forEach(function (result) {
+                                    summary[result.status] += 1;
+                                    (result.status === 'rejected' ? rejected : done).push(result);
+                                });
+                                summary.conflicts = summary.conflicts.concat(data.conflicts);
+                                return PosQueue.remove(done.map(function (result) { return result.id; }))
+                                    .then(function () { return PosQueue.markRejected(rejected); });
+                            });
+                        });
+                    })(pending.slice(i, i + BATCH_SIZE));
+                }
+                return chain.then(function () { return summary; });
+            });
+        }
+    };
+
+    root.PosQueue = PosQueue;
+})(typeof self !== 'undefined' ? self : this);
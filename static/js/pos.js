@@ -0,0 +1,252 @@
+// pos.js
+// Kassa sahifasi: keshlangan katalogdan qidirish, savat va oflayn navbat.
+(function () {
+    'use strict';
+
+    var CATALOG_URL = '/api/pos/catalog/';
+    var catalog = { products: [], customers: [] };
+    var cart = [];
+
+    function $(id) { return document.getElementById(id); }
+
+    function formatMoney(value) {
+        return Math.round(value).toLocaleString('uz-UZ') + " so'm";
+    }
+
+    function escapeHtml(text) {
+        var div = document.createElement('div');
+        div.textContent = text == null ? '' : String(text);
+        return div.innerHTML;
+    }
+
+    function showStatus(message, kind) {
+        var box = $('pos-status');
+        box.textContent = message;
+        box.className = 'text-sm px-3 py-2 rounded ' + (kind === 'error' ? 'bg-red-50 text-red-700' :
+            kind === 'warning' ? 'bg-yellow-50 text-yellow-700' : 'bg-green-50 text-green-700');
+    }
+
+    // =============== KATALOG ===============
+    // Ustunli javobni {id: qator} ko'rinishiga o'tkazish
+    function rowsById(table) {
+        var rows = {};
+        var names = Object.keys(table);
+        (table.id || []).forEach(function (id, index) {
+            var row = {};
+            names.forEach(function (name) { row[name] = table[name][index]; });
+            rows[id] = row;
+        });
+        return rows;
+    }
+
+    function mergeCatalog(local, data) {
+        var products = data.full ? {} : local.products;
+        var customers = data.full ? {} : local.customers;
+        Object.assign(products, rowsById(data.products));
+        Object.assign(customers, rowsById(data.customers));
+        data.deleted.products.forEach(function (id) { delete products[id]; });
+        data.deleted.customers.forEach(function (id) { delete customers[id]; });
+        return { version: data.version, products: products, customers: customers };
+    }
+
+    function applyCatalog(local) {
+        catalog.products = Object.keys(local.products).map(function (id) { return local.products[id]; });
+        catalog.customers = Object.keys(local.customers).map(function (id) { return local.customers[id]; });
+        var select = $('pos-customer');
+        select.innerHTML = '<option value="">Mijozsiz</option>' + catalog.customers.map(function (customer) {
+            return '<option value="' + customer.id + '">' + escapeHtml(customer.name) + '</option>';
+        }).join('');
+        $('pos-catalog-time').textContent = local.version ? new Date(local.version).toLocaleString('uz-UZ') : '-';
+        renderProducts();
+    }
+
+    function loadCatalog() {
+        // Katalog IndexedDB'da saqlanadi, serverdan faqat oxirgi versiyadan keyingi o'zgarishlar olinadi
+        return PosQueue.getMeta('catalog').then(function (local) {
+            local = local || { version: null, products: {}, customers: {} };
+            applyCatalog(local);
+            var url = CATALOG_URL + (local.version ? '?since=' + local.version : '');
+            return fetch(url, { credentials: 'same-origin' })
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    local = mergeCatalog(local, data);
+                    applyCatalog(local);
+                    return PosQueue.setMeta('catalog', local);
+                })
+                .catch(function () {
+                    if (!catalog.products.length) {
+                        showStatus("Katalog yuklanmadi", 'error');
+                    }
+                });
+        });
+    }
+
+    function renderProducts() {
+        var query = $('pos-search').value.trim().toLowerCase();
+        var products = catalog.products.filter(function (product) {
+            return !query || product.name.toLowerCase().indexOf(query) !== -1 ||
+                (product.sku || '').toLowerCase() === query || product.barcode === query;
+        }).slice(0, 50);
+
+        $('pos-products').innerHTML = products.map(function (product) {
+            return '<button type="button" data-id="' + product.id + '" class="pos-product text-left p-3 bg-white rounded-lg shadow-sm hover:bg-blue-50">' +
+                '<div class="font-medium text-gray-900">' + escapeHtml(product.name) + '</div>' +
+                '<div class="text-sm text-gray-500">' + formatMoney(product.price) + ' &middot; ' + product.stock + ' ' + escapeHtml(product.unit) + '</div>' +
+                '</button>';
+        }).join('') || '<p class="text-gray-500">Mahsulot topilmadi</p>';
+    }
+
+    // =============== SAVAT ===============
+    function addToCart(productId) {
+        var product = catalog.products.find(function (item) { return item.id === productId; });
+        var line = cart.find(function (item) { return item.product.id === productId; });
+        if (line) {
+            line.quantity += 1;
+        } else {
+            cart.push({ product: product, quantity: 1 });
+        }
+        renderCart();
+    }
+
+    function renderCart() {
+        var total = 0;
+        $('pos-cart').innerHTML = cart.map(function (line, index) {
+            var sum = line.product.price * line.quantity;
+            total += sum;
+            return '<div class="flex items-center justify-between py-2 border-b">' +
+                '<div><div class="font-medium">' + escapeHtml(line.product.name) + '</div>' +
+                '<div class="text-sm text-gray-500">' + formatMoney(line.product.price) + '</div></div>' +
+                '<div class="flex items-center gap-2">' +
+                '<input type="number" min="0.001" step="any" value="' + line.quantity + '" data-index="' + index + '" class="pos-qty w-20 border rounded px-2 py-1">' +
+                '<span class="w-28 text-right">' + formatMoney(sum) + '</span>' +
+                '<button type="button" data-index="' + index + '" class="pos-remove text-red-500"><i class="ri-delete-bin-line"></i></button>' +
+                '</div></div>';
+        }).join('') || '<p class="text-gray-500">Savat bo\'sh</p>';
+        $('pos-total').textContent = formatMoney(total);
+    }
+
+    function checkout() {
+        if (!cart.length) {
+            return;
+        }
+        var paymentMethod = $('pos-payment').value;
+        var customerId = $('pos-customer').value || null;
+        if (paymentMethod === 'credit' && !customerId) {
+            showStatus("Nasiya uchun mijozni tanlang", 'error');
+            return;
+        }
+
+        var soldAt = new Date().toISOString();
+        var sales = cart.map(function (line) {
+            return {
+                id: crypto.randomUUID(),
+                product_id: line.product.id,
+                quantity: line.quantity,
+                price: line.product.price,
+                payment_method: paymentMethod,
+                customer_id: customerId,
+                sold_at: soldAt
+            };
+        });
+
+        Promise.all(sales.map(PosQueue.add)).then(function () {
+            // Oflayn katalogdagi qoldiqni ham kamaytirib qo'yamiz
+            cart.forEach(function (line) { line.product.stock -= line.quantity; });
+            cart = [];
+            renderCart();
+            renderProducts();
+            showStatus("Sotuv saqlandi", 'success');
+            return requestSync();
+        });
+    }
+
+    // =============== SINXRONLASH ===============
+    function requestSync() {
+        updatePending();
+        if ('serviceWorker' in navigator && 'SyncManager' in window) {
+            return navigator.serviceWorker.ready
+                .then(function (registration) { return registration.sync.register('pos-sync-' + document.body.dataset.userId); })
+                .catch(flush);
+        }
+        return flush();
+    }
+
+    function flush() {
+        if (!navigator.onLine) {
+            return Promise.resolve();
+        }
+        return PosQueue.flush().then(function (summary) {
+            if (summary.conflicts.length) {
+                showStatus("Qoldiq yetmadi: " + summary.conflicts.map(function (conflict) {
+                    return conflict.name + ' (' + conflict.quantity_after + ')';
+                }).join(', '), 'warning');
+            } else if (summary.rejected) {
+                showStatus(summary.rejected + " ta sotuv rad etildi", 'error');
+            } else if (summary.created) {
+                showStatus(summary.created + " ta sotuv serverga yuborildi", 'success');
+            }
+            updatePending();
+        }).catch(function () { updatePending(); });
+    }
+
+    function updatePending() {
+        return PosQueue.all().then(function (sales) {
+            var waiting = sales.filter(function (sale) { return !sale.rejected; }).length;
+            $('pos-pending').textContent = waiting;
+            $('pos-rejected').textContent = sales.length - waiting;
+        });
+    }
+
+    function updateOnline() {
+        var online = navigator.onLine;
+        $('pos-online').textContent = online ? 'Onlayn' : 'Oflayn';
+        $('pos-online').className = 'text-sm font-medium ' + (online ? 'text-green-600' : 'text-red-600');
+    }
+
+    // =============== ISHGA TUSHIRISH ===============
+    document.addEventListener('DOMContentLoaded', function () {
+        PosQueue.use(document.body.dataset.userId);
+        var token = document.querySelector('[name=csrfmiddlewaretoken]').value;
+        PosQueue.setMeta('csrftoken', token);
+
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('/sw.js');
+            navigator.serviceWorker.addEventListener('message', function (event) {
+                if (event.data && event.data.type === 'pos-synced') {
+                    updatePending();
+                }
+            });
+        }
+
+        $('pos-search').addEventListener('input', renderProducts);
+        $('pos-products').addEventListener('click', function (event) {
+            var button = event.target.closest('.pos-product');
+            if (button) {
+                addToCart(button.dataset.id);
+            }
+        });
+        $('pos-cart').addEventListener('change', function (event) {
+            if (event.target.classList.contains('pos-qty')) {
+                var quantity = parseFloat(event.target.value);
+                cart[event.target.dataset.index].quantity = quantity > 0 ? quantity : 1;
+                renderCart();
+            }
+        });
+        $('pos-cart').addEventListener('click', function (event) {
+            var button = event.target.closest('.pos-remove');
+            if (button) {
+                cart.splice(button.dataset.index, 1);
+                renderCart();
+            }
+        });
+        $('pos-checkout').addEventListener('click', checkout);
+        $('pos-sync').addEventListener('click', flush);
+
+        window.addEventListener('online', function () { updateOnline(); flush(); });
+        window.addEventListener('offline', updateOnline);
+
+        updateOnline();
+        renderCart();
+        loadCatalog().then(flush);
+    });
+})();
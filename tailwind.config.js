@@ -0,0 +1,29 @@
+/** Tailwind (standalone CLI) - `python manage.py build_assets` orqali ishlatiladi */
+module.exports = {
+  content: ['./frontend/templates/**/*.html'],
+  // Shablonda o'zgaruvchidan yasaladigan klasslar (skaner ularni ko'rmaydi)
+  safelist: [
+    { pattern: /^bg-(green|red|blue|purple|orange|gray)-50$/ },
+    { pattern: /^bg-(primary|secondary|orange-400|purple-400)$/ },
+  ],
+  theme: {
+    extend: {
+      colors: {
+        primary: '#3B82F6',
+        secondary: '#10B981'
+      },
+      borderRadius: {
+        'none': '0px',
+        'sm': '4px',
+        DEFAULT: '8px',
+        'md': '12px',
+        'lg': '16px',
+        'xl': '20px',
+        '2xl': '24px',
+        '3xl': '32px',
+        'full': '9999px',
+        'button': '8px'
+      }
+    }
+  }
+}